@@ -1,92 +1,107 @@
 import pygame
 import sys
-import random
-from copy import deepcopy
-from src.ui.gui import GUI, get_tile_at_mouse_pos, highlight_valid_moves
-from src.game.board import Board, Piece, is_piece_at_position, is_valid_move, execute_move, get_valid_moves, get_all_valid_moves_for_player, is_in_warp_zone, make_ai_move, BOARD_SIZE
+from src.ui.gui import GUI, get_tile_at_mouse_pos
+from src.game.ai_worker import BackgroundSearch
+from src.game.book import load_book
+from src.game.tablebase import load_tablebase
+from src.game.transposition import TranspositionTable
+from src.game.stats import SearchStats
+from src.game.board import Piece
+from src.game.state import GameState
+from src.game.status import StatusCache
 
 # Updated window size
 WINDOW_WIDTH = 600
 WINDOW_HEIGHT = 650  # Increased height to accommodate the timer
 BOARD_SIZE_PX = 600  # The board still occupies a 600x600 area
+TURN_DURATION = 5000
+AI_TIME_MARGIN_MS = 250  # Leave time to apply and animate the move before the turn timer runs out
+AI_MIN_THINK_MS = 200
+PONDERING = True  # Search the AI's answers to the player's likely moves during the player's turn
+OPENING_BOOK_PATH = "opening_book.bin"  # Built with tools/build_book.py; the AI searches every move without it
+TABLEBASE_PATH = "endgame.tb"  # Built with tools/build_tablebase.py; optional like the book
 
-def handle_mouse_click(board: Board, selected_piece: tuple[int, int] | None, player_color: str) -> tuple[str, tuple[int, int] | None] | tuple[str, Piece, tuple[int, int]]:
+def handle_mouse_click(status: StatusCache, selected_piece: tuple[int, int] | None, player_color: str) -> tuple[str, tuple[int, int] | None] | tuple[str, Piece, tuple[int, int]]:
     mouse_pos = pygame.mouse.get_pos()
     row, col = get_tile_at_mouse_pos(mouse_pos)
     if selected_piece:
-        piece = board.get_piece(selected_piece[0], selected_piece[1])
-        if piece and is_valid_move(board, piece, row, col, player_color):
+        piece = status.board.get_piece(selected_piece[0], selected_piece[1])
+        if piece and piece.color == player_color and (row, col) in status.moves_from(*selected_piece):
             return ("move", piece, (row, col))
         else:
             return ("none", None)
     else:
-        if is_piece_at_position(board, row, col, player_color):
+        piece = status.board.get_piece(row, col)
+        if piece and piece.color == player_color:
             return ("select", (row, col))
         return ("none", None)
 
-def switch_turns(current_turn: str) -> str:
-    return "black" if current_turn == "white" else "white"
+def new_game() -> GameState:
+    """The rules (turns, warp bonus moves, multi-jump rolls) are GameState's, as in tools/simulate.py and the server."""
+    return GameState(human_colors=("white",))
 
-def count_pieces(board: Board, color: str) -> int:
-    count = 0
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            piece = board.get_piece(row, col)
-            if piece != 0 and piece.color == color:
-                count += 1
-    return count
+def ai_time_budget(turn_start_time: int) -> int:
+    """Milliseconds the AI may think, based on what is left of the current turn."""
+    remaining = TURN_DURATION - (pygame.time.get_ticks() - turn_start_time)
+    return max(AI_MIN_THINK_MS, remaining - AI_TIME_MARGIN_MS)
 
-def reset_game() -> tuple[Board, None, str, int, str, int, int, bool, bool, bool, bool]:
-    board = Board()
-    selected_piece = None
-    current_turn = "white"
-    moves_without_capture = 0
-    message = ""
-    message_timer = 0
-    turn_start_time = pygame.time.get_ticks()
-    bonus_move_active = False
-    player_multi_jump_used = False
-    ai_multi_jump_used = False
-    multi_jump_active = False
-    return (board, selected_piece, current_turn, moves_without_capture, message, message_timer,
-            turn_start_time, bonus_move_active, player_multi_jump_used, ai_multi_jump_used, multi_jump_active)
+_timer_font = None
+_timer_surfaces = {}
+
+def timer_seconds(remaining_time: int) -> int:
+    return max(0, remaining_time // 1000)  # Convert milliseconds to seconds
 
-def draw_timer(screen, remaining_time):
-    """Draw the remaining time in the bottom-right corner with yellow text and white background."""
-    font = pygame.font.Font(None, 36)
-    seconds = max(0, remaining_time // 1000)  # Convert milliseconds to seconds
-    timer_text = font.render(f"Time: {seconds}s", True, (255, 255, 0))  # Yellow text
+def draw_timer(screen, remaining_time) -> pygame.Rect:
+    """Draw the remaining time in the bottom-right corner with yellow text and white background.
+
+    The font and the rendered text for each second are kept between calls;
+    returns the rect drawn so the caller can update just that part of the screen.
+    """
+    global _timer_font
+    if _timer_font is None:
+        _timer_font = pygame.font.Font(None, 36)
+    seconds = timer_seconds(remaining_time)
+    timer_text = _timer_surfaces.get(seconds)
+    if timer_text is None:
+        timer_text = _timer_surfaces[seconds] = _timer_font.render(f"Time: {seconds}s", True, (255, 255, 0))  # Yellow text
     text_rect = timer_text.get_rect()
     # Position in bottom-right corner, within the extra 50px height
     text_rect.bottomright = (WINDOW_WIDTH - 10, WINDOW_HEIGHT - 10)
     # Draw a white background rectangle slightly larger than the text
     background_rect = text_rect.inflate(10, 5)  # Add padding around the text
+    # Clear the previous, possibly wider, timer before drawing this one
+    screen.fill((0, 0, 0), (0, BOARD_SIZE_PX, WINDOW_WIDTH, WINDOW_HEIGHT - BOARD_SIZE_PX))
     pygame.draw.rect(screen, (0, 0, 139), background_rect)  # Dark blue background
     screen.blit(timer_text, text_rect)
+    return pygame.Rect(0, BOARD_SIZE_PX, WINDOW_WIDTH, WINDOW_HEIGHT - BOARD_SIZE_PX)
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption('Checkers AI')
 
-    board = Board()
+    state = new_game()
+    board = state.board
     gui = GUI(screen, board)
+    status = StatusCache(board)  # Piece counts, legal moves and result, recomputed only when the board changes
     clock = pygame.time.Clock()
+    transposition_table = TranspositionTable()
+    opening_book = load_book(OPENING_BOOK_PATH)
+    tablebase = load_tablebase(TABLEBASE_PATH)
+    ai_search = BackgroundSearch(opening_book, tablebase)
+    ai_search_future = None
+    ai_search_stats = None
+    last_search_stats = None
+    show_debug_overlay = False  # Toggled with F3
+    drawn_timer_seconds = None  # Timer value on screen; the timer is only redrawn when it changes
 
     selected_piece = None
-    current_turn = "white"
     running = True
-    moves_without_capture = 0
     message = ""
     message_timer = 0
     game_over = False
-    bonus_move_active = False
-    last_moved_piece_pos = None
+    announced_turn = None  # Side whose turn start (and multi-jump roll) has been shown
     turn_start_time = pygame.time.get_ticks()
-    TURN_DURATION = 5000
-    player_multi_jump_used = False
-    ai_multi_jump_used = False
-    multi_jump_active = False
 
     while running:
         clock.tick(60)
@@ -97,284 +112,146 @@ def main():
         if gui.animating_piece:
             if not gui.update_animation(current_time):
                 gui.animating_piece = None
-                screen.fill((0, 0, 0))
-                gui.draw_board()
-                if message:
-                    gui.draw_message(message)
-                draw_timer(screen, remaining_time)
-                pygame.display.update()
 
         if remaining_time <= 0 and not game_over and not gui.animating_piece:
-            message = f"{current_turn.capitalize()} took too long! Turn switched."
+            message = f"{state.current_turn.capitalize()} took too long! Turn switched."
             message_timer = 90
-            current_turn = switch_turns(current_turn)
+            state.timeout()
             turn_start_time = pygame.time.get_ticks()
             selected_piece = None
-            bonus_move_active = False
-            last_moved_piece_pos = None
-            multi_jump_active = False
+            ai_search.cancel()
+            ai_search_future = None
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_debug_overlay = not show_debug_overlay
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                gui.invalidate()
             elif event.type == pygame.MOUSEBUTTONDOWN and not gui.animating_piece:
                 if game_over:
-                    (board, selected_piece, current_turn, moves_without_capture, message, message_timer,
-                     turn_start_time, bonus_move_active, player_multi_jump_used, ai_multi_jump_used, multi_jump_active) = reset_game()
+                    state = new_game()
+                    board = state.board
                     gui.board = board
+                    status.board = board
+                    selected_piece = None
+                    message = ""
+                    message_timer = 0
+                    announced_turn = None
+                    turn_start_time = pygame.time.get_ticks()
+                    ai_search.cancel()
+                    ai_search_future = None
+                    transposition_table.clear()
                     game_over = False
-                    last_moved_piece_pos = None
                     continue
-                if current_turn == "white":
-                    result = handle_mouse_click(board, selected_piece, current_turn)
+                if state.current_turn == "white":
+                    result = handle_mouse_click(status, selected_piece, state.current_turn)
                     if result[0] == "move":
                         _, piece, (new_row, new_col) = result
-                        board_before = deepcopy(board)
-                        gui.start_animation(piece, (piece.row, piece.col), (new_row, new_col))
+                        record = state.apply(piece, new_row, new_col)
+                        gui.start_animation(record.piece, record.from_pos, record.to_pos)
                         gui.animation_start_time = current_time
-                        is_capture, can_jump_again, new_selection, bonus_move_triggered = execute_move(board, piece, new_row, new_col, multi_jump_active)
-                        if is_capture:
-                            captured_row, captured_col = (piece.row + new_row) // 2, (piece.col + new_col) // 2
-                            if is_in_warp_zone(captured_row, captured_col) and board_before.get_piece(captured_row, captured_col) != 0:
-                                message = "Warp Zone: Capture Prevented!"
-                                message_timer = 90
-                                board.grid = board_before.grid
-                                gui.animating_piece = None
-                                continue
-                            moves_without_capture = 0
-                            if can_jump_again and multi_jump_active:
+                        if state.current_turn == "white":
+                            if record.can_jump_again:
                                 message = "Multi-Jump Available!"
-                                message_timer = 90
-                                selected_piece = new_selection
-                                gui.animating_piece = None
-                                continue
-                        else:
-                            moves_without_capture += 1
-                        if bonus_move_triggered:
-                            message = "Warp Zone: Bonus Move!"
+                            else:
+                                message = "Warp Zone: Bonus Move!"
+                                turn_start_time = pygame.time.get_ticks()
                             message_timer = 90
-                            bonus_move_active = True
-                            last_moved_piece_pos = (new_row, new_col)
-                            selected_piece = last_moved_piece_pos
-                            turn_start_time = pygame.time.get_ticks()
+                            selected_piece = record.to_pos
                             gui.animating_piece = None
                             continue
                         selected_piece = None
-                        bonus_move_active = False
-                        last_moved_piece_pos = None
-                        current_turn = switch_turns(current_turn)
                         turn_start_time = pygame.time.get_ticks()
-                        multi_jump_active = False
                     elif result[0] == "select":
-                        if bonus_move_active:
-                            _, pos = result
-                            if pos == last_moved_piece_pos:
-                                selected_piece = pos
-                            else:
-                                continue
-                        else:
-                            _, selected_piece = result
+                        _, pos = result
+                        # A bonus move must be made with the piece that landed on the warp square
+                        if not state.bonus_move_active or pos == state.last_moved_piece_pos:
+                            selected_piece = pos
                     else:
                         selected_piece = None
 
-        if not game_over and not bonus_move_active and elapsed_time < 100 and not gui.animating_piece:
-            if current_turn == "white" and not player_multi_jump_used:
-                if random.random() < 0.1:
-                    multi_jump_active = True
-                    player_multi_jump_used = True
-                    message = "Player Multi-Jump Activated!"
-                    message_timer = 90
-            elif current_turn == "black" and not ai_multi_jump_used:
-                if random.random() < 0.1:
-                    multi_jump_active = True
-                    ai_multi_jump_used = True
-                    message = "AI Multi-Jump Activated!"
-                    message_timer = 90
+        if not game_over and state.current_turn != announced_turn:
+            # GameState rolled the side's one-time multi-jump when its turn started
+            announced_turn = state.current_turn
+            if state.multi_jump_active:
+                message = "Player Multi-Jump Activated!" if state.current_turn == "white" else "AI Multi-Jump Activated!"
+                message_timer = 90
 
-        if current_turn == "black" and not game_over and not gui.animating_piece:
-            board_before = deepcopy(board)
-            move_made, bonus_move_triggered = make_ai_move(board, "black", depth=3, allow_multi_jump=multi_jump_active)
-            if not move_made:
-                # AI has no valid moves, check if it's a draw or player wins
-                white_moves = get_all_valid_moves_for_player(board, "white")
-                if not white_moves:
-                    print("No valid moves for either player. Game is a draw!")
-                    message = "Draw! Play Again?"
-                    message_timer = 0
-                    game_over = True
-                else:
-                    print("AI has no valid moves. Player wins!")
-                    message = "Player Wins! Play Again?"
-                    message_timer = 0
-                    game_over = True
-            else:
-                # Find the piece that moved for animation
-                moved_piece = None
-                start_pos = None
-                end_pos = None
-                for row in range(BOARD_SIZE):
-                    for col in range(BOARD_SIZE):
-                        piece_before = board_before.get_piece(row, col)
-                        piece_after = board.get_piece(row, col)
-                        if piece_before == 0 and piece_after != 0 and piece_after.color == "black":
-                            end_pos = (row, col)
-                            moved_piece = piece_after
-                        elif piece_before != 0 and piece_after == 0 and piece_before.color == "black":
-                            start_pos = (row, col)
-                    if moved_piece:
-                        break
-                if moved_piece and start_pos and end_pos:
-                    gui.start_animation(moved_piece, start_pos, end_pos)
+        if state.current_turn == "black" and not game_over and not gui.animating_piece:
+            if ai_search_future is None:
+                # Search on a background thread so the window keeps drawing and handling events
+                ai_search_stats = SearchStats()
+                ai_search_future = ai_search.start(board, "black", allow_multi_jump=state.search_allows_multi_jump,
+                                                   tt=transposition_table, time_limit_ms=ai_time_budget(turn_start_time), stats=ai_search_stats)
+            elif ai_search_future.done():
+                ai_move = ai_search_future.result()
+                ai_search_future = None
+                last_search_stats = ai_search_stats
+                # None only when the AI has no legal move, which the result check below reports
+                if ai_move is not None:
+                    (from_row, from_col), (new_row, new_col) = ai_move
+                    record = state.apply(board.get_piece(from_row, from_col), new_row, new_col)
+                    gui.start_animation(record.piece, record.from_pos, record.to_pos)
                     gui.animation_start_time = current_time
-
-                captures_occurred = False
-                captured_on_warp_zone = False
-                captured_row, captured_col = None, None
-                for row in range(BOARD_SIZE):
-                    for col in range(BOARD_SIZE):
-                        piece_before = board_before.get_piece(row, col)
-                        piece_after = board.get_piece(row, col)
-                        if piece_before != 0 and piece_after == 0 and piece_before.color == "white":
-                            captures_occurred = True
-                            captured_row, captured_col = row, col
-                            if is_in_warp_zone(row, col):
-                                captured_on_warp_zone = True
-                            break
-                    if captures_occurred:
-                        break
-                if captures_occurred:
-                    if captured_on_warp_zone:
-                        message = "Warp Zone: Capture Prevented!"
-                        message_timer = 90
-                        board.grid = board_before.grid
-                        gui.animating_piece = None
-                        continue
-                    moves_without_capture = 0
-                    can_jump_again = False
-                    for row in range(BOARD_SIZE):
-                        for col in range(BOARD_SIZE):
-                            piece = board.get_piece(row, col)
-                            if piece and piece.color == "black":
-                                if multi_jump_active and get_valid_moves(board, row, col, only_captures=True):
-                                    can_jump_again = True
-                                    break
-                        if can_jump_again:
-                            break
-                    if can_jump_again and multi_jump_active:
-                        message = "AI Multi-Jump Available!"
-                        message_timer = 90
-                        gui.animating_piece = None
-                        continue
-                else:
-                    moves_without_capture += 1
-                if bonus_move_triggered:
-                    message = "Warp Zone: Bonus Move!"
-                    message_timer = 90
-                    for row in range(BOARD_SIZE):
-                        for col in range(BOARD_SIZE):
-                            if board_before.get_piece(row, col) == 0 and board.get_piece(row, col) != 0:
-                                last_moved_piece_pos = (row, col)
-                                break
-                        if last_moved_piece_pos:
-                            break
-                    board_before_bonus = deepcopy(board)
-                    move_made, bonus_move_triggered = make_ai_move(board, "black", depth=3, allow_multi_jump=False)
-                    if move_made:
-                        # Animate bonus move
-                        moved_piece = None
-                        start_pos = None
-                        end_pos = None
-                        for row in range(BOARD_SIZE):
-                            for col in range(BOARD_SIZE):
-                                piece_before = board_before_bonus.get_piece(row, col)
-                                piece_after = board.get_piece(row, col)
-                                if piece_before == 0 and piece_after != 0 and piece_after.color == "black":
-                                    end_pos = (row, col)
-                                    moved_piece = piece_after
-                                elif piece_before != 0 and piece_after == 0 and piece_before.color == "black":
-                                    start_pos = (row, col)
-                            if moved_piece:
-                                break
-                        if moved_piece and start_pos and end_pos:
-                            gui.start_animation(moved_piece, start_pos, end_pos)
-                            gui.animation_start_time = current_time
-
-                        captures_occurred = False
-                        captured_on_warp_zone = False
-                        for row in range(BOARD_SIZE):
-                            for col in range(BOARD_SIZE):
-                                piece_before = board_before_bonus.get_piece(row, col)
-                                piece_after = board.get_piece(row, col)
-                                if piece_before != 0 and piece_after == 0 and piece_before.color == "white":
-                                    captures_occurred = True
-                                    if is_in_warp_zone(row, col):
-                                        captured_on_warp_zone = True
-                                    break
-                            if captures_occurred:
-                                break
-                        if captures_occurred and captured_on_warp_zone:
-                            message = "Warp Zone: Capture Prevented!"
-                            message_timer = 90
-                            board.grid = board_before_bonus.grid
-                            last_moved_piece_pos = None
+                    if state.current_turn == "black":
+                        if state.bonus_move_active:
+                            # The bonus move is searched on a later frame, once this move has been animated
+                            message = "Warp Zone: Bonus Move!"
+                            turn_start_time = pygame.time.get_ticks()
+                        else:
+                            message = "AI Multi-Jump Available!"
                             gui.animating_piece = None
+                        message_timer = 90
                     else:
-                        last_moved_piece_pos = None
-                else:
-                    last_moved_piece_pos = None
-                current_turn = switch_turns(current_turn)
-                turn_start_time = pygame.time.get_ticks()
-                multi_jump_active = False
+                        turn_start_time = pygame.time.get_ticks()
+                        if PONDERING:
+                            ai_search.ponder(board, "black", last_search_stats.pv, transposition_table)
 
         if not game_over and not gui.animating_piece:
-            white_pieces = count_pieces(board, "white")
-            black_pieces = count_pieces(board, "black")
-            if white_pieces == 0:
-                print("No white pieces left. AI wins!")
-                message = "AI Wins! Play Again?"
-                message_timer = 0
-                game_over = True
-            elif black_pieces == 0:
-                print("No black pieces left. Player wins!")
-                message = "Player Wins! Play Again?"
+            outcome = status.result(state.current_turn)
+            if outcome is not None:
+                if status.piece_count("white") == 0:
+                    print("No white pieces left. AI wins!")
+                    message = "AI Wins! Play Again?"
+                elif status.piece_count("black") == 0:
+                    print("No black pieces left. Player wins!")
+                    message = "Player Wins! Play Again?"
+                elif outcome == "draw":
+                    print("No valid moves for either player. Game is a draw!")
+                    message = "Draw! Play Again?"
+                else:
+                    # Current player has no moves, opponent wins
+                    winner = "AI" if state.current_turn == "white" else "Player"
+                    print(f"{state.current_turn.capitalize()} has no valid moves. {winner} wins!")
+                    message = f"{winner} Wins! Play Again?"
                 message_timer = 0
                 game_over = True
 
-            if not game_over:
-                # Check for draw condition: no valid moves for the current player
-                current_player_moves = get_all_valid_moves_for_player(board, current_turn)
-                if not current_player_moves:
-                    # Check if the opponent has moves
-                    opponent_color = "black" if current_turn == "white" else "white"
-                    opponent_moves = get_all_valid_moves_for_player(board, opponent_color)
-                    if not opponent_moves:
-                        print("No valid moves for either player. Game is a draw!")
-                        message = "Draw! Play Again?"
-                        message_timer = 0
-                        game_over = True
-                    else:
-                        # Current player has no moves, opponent wins
-                        winner = "AI" if current_turn == "white" else "Player"
-                        print(f"{current_turn.capitalize()} has no valid moves. {winner} wins!")
-                        message = f"{winner} Wins! Play Again?"
-                        message_timer = 0
-                        game_over = True
-
         if message_timer > 0:
             message_timer -= 1
             if message_timer == 0:
                 message = ""
 
-        # Fill the screen with a background color to clear the extra area
-        screen.fill((0, 0, 0))  # Black background for the extra 50px at the bottom
-        gui.draw_board()
-        if current_turn == "white" and not game_over:
-            highlight_valid_moves(screen, board, selected_piece)
-        if message:
-            gui.draw_message(message)
-        draw_timer(screen, remaining_time)
-        pygame.display.update()
+        # Only the squares, overlays and timer that changed since the last frame are redrawn
+        highlighted = []
+        if state.current_turn == "white" and not game_over and selected_piece:
+            highlighted = status.moves_from(*selected_piece)
+        if gui.full_redraw:
+            drawn_timer_seconds = None
+        dirty = gui.render(highlighted, message, last_search_stats, show_debug_overlay)
+        if timer_seconds(remaining_time) != drawn_timer_seconds:
+            dirty.append(draw_timer(screen, remaining_time))
+            drawn_timer_seconds = timer_seconds(remaining_time)
+        if dirty:
+            pygame.display.update(dirty)
 
+    ai_search.shutdown()
+    if opening_book is not None:
+        opening_book.close()
+    if tablebase is not None:
+        tablebase.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,132 @@
+"""Background AI search, so the game loop keeps rendering while the AI thinks."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import MAX_SEARCH_DEPTH, Board, SearchLimits, SearchTimeout, choose_ai_move, get_all_valid_moves_for_player, make_move, minimax_with_alpha_beta, unmake_move
+from src.game.book import OpeningBook
+from src.game.ordering import MoveOrderer
+from src.game.stats import SearchStats
+from src.game.tablebase import EndgameTablebase
+from src.game.transposition import TranspositionTable, position_key
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+# position_key -> (depth, score, move) of the AI's searches finished while pondering
+PonderResults = Dict[int, Tuple[int, float, Move]]
+
+
+class BackgroundSearch:
+    """Runs choose_ai_move on a worker thread.
+
+    start() searches a private copy of the board and returns a Future whose
+    result is the chosen move as ((from_row, from_col), (to_row, to_col)), or
+    None when there is no move or the search was cancelled. The game loop
+    polls future.done() each frame and plays the move with apply_ai_move.
+    A SearchStats passed to start() is filled in by the time the future is done.
+    Positions in the opening book or endgame tablebase, if given, are answered
+    without a search.
+
+    ponder() uses the opponent's turn: it searches the AI's answer to each of
+    the opponent's replies until cancelled. When the opponent then plays one of
+    them, the next time-limited start() carries on from the depth pondered
+    instead of starting over, and the shared transposition table already holds
+    the subtree. Any start() or cancel() stops the pondering; cancel() also
+    discards what it found.
+    """
+
+    def __init__(self, book: Optional[OpeningBook] = None, tablebase: Optional[EndgameTablebase] = None):
+        self.book = book
+        self.tablebase = tablebase
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+        self._future: Optional[Future] = None
+        self._cancel_event: Optional[threading.Event] = None
+        self._pondering = False
+        self._ponder_results: PonderResults = {}
+
+    @property
+    def thinking(self) -> bool:
+        return self._future is not None and not self._future.done() and not self._pondering
+
+    @property
+    def pondering(self) -> bool:
+        return self._future is not None and not self._future.done() and self._pondering
+
+    def start(self, board: Board, player_color: str, depth: int = 3, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, time_limit_ms: Optional[float] = None, stats: Optional[SearchStats] = None) -> Future:
+        ponder_results = self._ponder_results
+        self.cancel()
+        self._cancel_event = threading.Event()
+        # Runs after any cancelled ponder job has returned, since the executor has one thread
+        self._future = self._executor.submit(self._search, deepcopy(board), player_color, depth, allow_multi_jump, tt, time_limit_ms, self._cancel_event, stats, self.book, self.tablebase, ponder_results)
+        return self._future
+
+    def ponder(self, board: Board, player_color: str, pv: Optional[List[Move]] = None, tt: Optional[TranspositionTable] = None) -> Future:
+        """Search player_color's answers to the opponent's replies on board until cancelled.
+
+        The reply that follows the AI's move in pv (the principal variation of
+        the AI's last search) is searched first and one ply deeper; the others
+        follow in move-ordering order, all of them deepened together. Pass the
+        table the next start() will use.
+        """
+        self.cancel()
+        self._cancel_event = threading.Event()
+        self._future = self._executor.submit(self._ponder, deepcopy(board), player_color, pv or [], tt, self._cancel_event, self._ponder_results, self.tablebase)
+        self._pondering = True
+        return self._future
+
+    @staticmethod
+    def _search(board: Board, player_color: str, depth: int, allow_multi_jump: bool, tt: Optional[TranspositionTable], time_limit_ms: Optional[float], cancel_event: threading.Event, stats: Optional[SearchStats] = None, book: Optional[OpeningBook] = None, tablebase: Optional[EndgameTablebase] = None, ponder_results: Optional[PonderResults] = None) -> Optional[Move]:
+        resume = None
+        if ponder_results and tt is not None:
+            resume = ponder_results.get(position_key(board, player_color, allow_multi_jump))
+        best_move = choose_ai_move(board, player_color, depth, allow_multi_jump, tt, time_limit_ms, cancel_event=cancel_event, stats=stats, book=book, tablebase=tablebase, resume=resume)
+        if best_move is None or cancel_event.is_set():
+            return None
+        piece, move = best_move
+        return (piece.row, piece.col), move
+
+    @staticmethod
+    def _ponder(board: Board, player_color: str, pv: List[Move], tt: Optional[TranspositionTable], cancel_event: threading.Event, results: PonderResults, tablebase: Optional[EndgameTablebase] = None):
+        opponent = "black" if player_color == "white" else "white"
+        orderer = MoveOrderer()
+        replies = orderer.order(board, get_all_valid_moves_for_player(board, opponent), 0)
+        # The first opponent move in the PV; the moves before it are the AI's own hops
+        predicted = next((move for move in pv if board.get_piece(*move[0]) != 0 and board.get_piece(*move[0]).color == opponent), None)
+        replies.sort(key=lambda reply: ((reply[0].row, reply[0].col), reply[1]) != predicted)
+        lead = 1 if replies and ((replies[0][0].row, replies[0][0].col), replies[0][1]) == predicted else 0
+        if tt is None:
+            tt = TranspositionTable()
+        limits = SearchLimits(cancel_event=cancel_event)
+        # The AI's next turn is searched without multi-jumps unless it rolls them, so that is what is pondered
+        for round_depth in range(1, MAX_SEARCH_DEPTH + 1):
+            for index, (piece, (new_row, new_col)) in enumerate(replies):
+                depth = min(round_depth + (lead if index == 0 else 0), MAX_SEARCH_DEPTH)
+                undo = make_move(board, piece, new_row, new_col)
+                try:
+                    key = position_key(board, player_color)
+                    if key in results and results[key][0] >= depth:
+                        continue
+                    score, best_move = minimax_with_alpha_beta(board, depth, True, player_color, -float('inf'), float('inf'), False, tt, 0, limits, orderer, tablebase=tablebase)
+                    if best_move is not None:
+                        results[key] = (depth, score, ((best_move[0].row, best_move[0].col), (best_move[1][0], best_move[1][1])))
+                except SearchTimeout:
+                    return
+                finally:
+                    unmake_move(board, undo)
+            orderer.age_history()
+
+    def cancel(self):
+        """Stop the running search or pondering, if any; its result is discarded."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+        self._future = None
+        self._cancel_event = None
+        self._pondering = False
+        self._ponder_results = {}
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,147 @@
+"""Multi-PV analysis of arbitrary positions.
+
+analyse() finds the best multi_pv moves of a position with their scores and
+principal variations in one search. Each iteration of the deepening loop
+searches every root move, with alpha just below the score of the
+multi_pv-th best move found so far. Moves that cannot enter the list fail
+low cheaply, while the ones that do get exact scores. All root moves and
+iterations share one transposition table and move orderer, and the next
+iteration starts with the moves in the order just found.
+
+Scores are from the point of view of the side to move, as
+minimax_with_alpha_beta returns them for the maximizing player.
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import MAX_SEARCH_DEPTH, Board, CaptureSequence, SearchLimits, SearchTimeout, _search_child, get_search_moves, play_search_move, principal_variation, unmake_move
+from src.game.ordering import MoveOrderer
+from src.game.position import format_position, move_notation, parse_position
+from src.game.transposition import TranspositionTable
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+DEFAULT_DEPTH = 4  # Without a time limit
+
+
+def _hop_notation(move: Move) -> str:
+    (from_row, from_col), (to_row, to_col) = move
+    return move_notation([(from_row, from_col), (to_row, to_col)], abs(to_row - from_row) == 2)
+
+
+def _score_json(score: float):
+    return score if math.isfinite(score) else str(score)
+
+
+class AnalysisLine:
+    """One of the best moves: path is every square the piece visits, pv the line as single hops."""
+
+    def __init__(self, path: List[Tuple[int, int]], capture: bool, score: float, pv: List[Move]):
+        self.path = path
+        self.capture = capture
+        self.score = score
+        self.pv = pv
+
+    @property
+    def move(self) -> Move:
+        """The first hop, as apply_ai_move and the GUI take it."""
+        return self.path[0], self.path[1]
+
+    @property
+    def notation(self) -> str:
+        return move_notation(self.path, self.capture)
+
+    def as_dict(self) -> Dict:
+        return {
+            "move": self.notation,
+            "path": [list(square) for square in self.path],
+            "score": _score_json(self.score),
+            "pv": [_hop_notation(move) for move in self.pv],
+        }
+
+
+class Analysis:
+    def __init__(self, position: str, color_to_move: str):
+        self.position = position
+        self.color_to_move = color_to_move
+        self.depth = 0
+        self.nodes = 0
+        self.elapsed_ms = 0.0
+        self.lines: List[AnalysisLine] = []
+
+    def as_dict(self) -> Dict:
+        return {
+            "position": self.position,
+            "side": self.color_to_move,
+            "depth": self.depth,
+            "nodes": self.nodes,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "lines": [line.as_dict() for line in self.lines],
+        }
+
+
+def analyse(board: Board, player_color: str, multi_pv: int = 3, depth: Optional[int] = None, time_limit_ms: Optional[float] = None, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, cancel_event: Optional[threading.Event] = None, tablebase=None, evaluator=None, quiescence: bool = True) -> Analysis:
+    """The best multi_pv moves of player_color, searched to depth or for time_limit_ms.
+
+    depth defaults to DEFAULT_DEPTH, or to MAX_SEARCH_DEPTH with a time
+    limit, where it only caps the deepening. Like iterative_deepening, the
+    lines come from the last iteration that finished, and depth 1 ignores the
+    time budget so there is always an answer. The board is left unchanged.
+    """
+    if depth is None:
+        depth = DEFAULT_DEPTH if time_limit_ms is None else MAX_SEARCH_DEPTH
+    analysis = Analysis(format_position(board, player_color, allow_multi_jump), player_color)
+    root_moves = get_search_moves(board, player_color, allow_multi_jump)
+    if not root_moves:
+        return analysis
+    if tt is None:
+        tt = TranspositionTable()
+    orderer = MoveOrderer()
+    limits = SearchLimits(time_limit_ms, cancel_event=cancel_event)
+    opponent = "black" if player_color == "white" else "white"
+    ranked = orderer.order(board, root_moves, 0)
+    scores: Dict[int, float] = {}
+    for iteration_depth in range(1, depth + 1):
+        limits.enforce_budget = analysis.depth > 0
+        exact: Dict[int, float] = {}
+        try:
+            for index, (piece, move) in enumerate(ranked):
+                best = sorted(exact.values(), reverse=True)[:multi_pv]
+                # Just below the multi_pv-th best, so a move that ties it still gets an exact score
+                alpha = math.nextafter(best[-1], -math.inf) if len(best) == multi_pv else -math.inf
+                score = _search_child(board, piece, move, iteration_depth, True, player_color, alpha, math.inf, allow_multi_jump, tt, 0, limits, orderer, None, tablebase, evaluator, quiescence)
+                if alpha == -math.inf or score > alpha:
+                    exact[index] = score
+        except SearchTimeout:
+            break
+        analysis.depth = iteration_depth
+        order = sorted(exact, key=lambda index: -exact[index])
+        ranked = [ranked[index] for index in order] + [item for index, item in enumerate(ranked) if index not in exact]
+        scores = {position: exact[index] for position, index in enumerate(order)}
+        if all(math.isinf(score) for position, score in scores.items() if position < multi_pv):
+            break  # Every line is a forced result
+        if limits.remaining_ms() < limits.elapsed_ms():
+            break
+        orderer.age_history()
+
+    for position in range(min(multi_pv, len(scores))):
+        piece, move = ranked[position]
+        path = [(piece.row, piece.col)] + (list(move.path) if isinstance(move, CaptureSequence) else [(move[0], move[1])])
+        undo_stack = play_search_move(board, piece, move)
+        try:
+            reply_pv = principal_variation(board, opponent, tt, allow_multi_jump, max(analysis.depth - 1, 0))
+        finally:
+            for undo in reversed(undo_stack):
+                unmake_move(board, undo)
+        pv = [(path[hop], path[hop + 1]) for hop in range(len(path) - 1)] + reply_pv
+        analysis.lines.append(AnalysisLine(path, abs(path[1][0] - path[0][0]) == 2, scores[position], pv))
+    analysis.nodes = limits.nodes
+    analysis.elapsed_ms = limits.elapsed_ms()
+    return analysis
+
+
+def analyse_position(text: str, multi_pv: int = 3, depth: Optional[int] = None, time_limit_ms: Optional[float] = None, **options) -> Analysis:
+    """analyse() for a position in the text format of src.game.position."""
+    board, color_to_move, allow_multi_jump = parse_position(text)
+    return analyse(board, color_to_move, multi_pv, depth, time_limit_ms, allow_multi_jump, **options)
@@ -0,0 +1,362 @@
+"""Bitboard backend for the 10x10 board.
+
+The 50 playable dark squares are packed into Python integers using a
+ghost-square layout: every pair of rows takes 11 bits (5 + 5 squares and one
+unused ghost bit), so a diagonal step is always a shift by 5 or 6 bits and
+steps off the edge of the board land on a ghost bit or outside the mask.
+
+Speed: through the Board API (Piece objects, make_move/unmake_move), which
+the search uses, BitBoard is only about 1.5x the list Board in tools.bench
+search and 1.8x in perft. The module-level functions on (white, black, kings)
+triples (generate_position_moves, count_position_moves, play) reach about
+15x in perft, but the search does not run on them.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import Board, Piece
+from src.game.tables import BOARD_SIZE, PROMOTION_ROW, WARP_SQUARES
+from src.game.transposition import compute_zobrist, piece_key
+
+NUM_BITS = 55
+
+
+def square_to_bit(row: int, col: int) -> int:
+    """Bit index of a dark square, or -1 for a light square."""
+    if (row + col) % 2 == 0:
+        return -1
+    return row * 5 + col // 2 + row // 2
+
+
+SQUARE_BIT = [[square_to_bit(row, col) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE)]
+BIT_SQUARE: Dict[int, Tuple[int, int]] = {
+    SQUARE_BIT[row][col]: (row, col)
+    for row in range(BOARD_SIZE)
+    for col in range(BOARD_SIZE)
+    if SQUARE_BIT[row][col] >= 0
+}
+
+PLAYABLE_MASK = sum(1 << bit for bit in BIT_SQUARE)
+WARP_MASK = sum(1 << bit for bit, square in BIT_SQUARE.items() if square in WARP_SQUARES)
+PROMOTION_MASK = {
+    color: sum(1 << bit for bit, (row, _) in BIT_SQUARE.items() if row == promotion_row)
+    for color, promotion_row in PROMOTION_ROW.items()
+}
+
+# Bit offsets for (drow, dcol); sorted, they follow the direction order used by Board.
+DIRECTION_SHIFTS = {(-1, -1): -6, (-1, 1): -5, (1, -1): 5, (1, 1): 6}
+MAN_SHIFTS = {"white": (-6, -5), "black": (5, 6)}
+KING_SHIFTS = (-6, -5, 5, 6)
+# (left, right) shift amounts per man direction, indexed by black_to_move: bits << left >> right steps one square
+FORWARD_STEPS = {
+    black_to_move: tuple((max(offset, 0), max(-offset, 0)) for offset in MAN_SHIFTS["black" if black_to_move else "white"])
+    for black_to_move in (False, True)
+}
+
+
+def shift(bits: int, offset: int) -> int:
+    """Move every set bit by offset squares along a diagonal, dropping bits that leave the board."""
+    if offset > 0:
+        return (bits << offset) & PLAYABLE_MASK
+    return (bits >> -offset) & PLAYABLE_MASK
+
+
+def iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitBoard(Board):
+    """Drop-in replacement for Board that keeps the position in three bitboards.
+
+    Piece objects are created lazily and cached per square so that callers
+    holding on to a piece (the GUI, execute_move) keep working as with Board.
+    """
+
+    def __init__(self):
+        self.white = 0
+        self.black = 0
+        self.kings = 0
+        for bit, (row, _) in BIT_SQUARE.items():
+            if row < 4:
+                self.black |= 1 << bit
+            elif row >= 6:
+                self.white |= 1 << bit
+        self._pieces: Dict[int, Piece] = {}
+        self.zobrist = compute_zobrist(self)
+
+    def __deepcopy__(self, memo):
+        board = BitBoard.__new__(BitBoard)
+        board.white = self.white
+        board.black = self.black
+        board.kings = self.kings
+        board.zobrist = self.zobrist
+        board._pieces = {}
+        memo[id(self)] = board
+        return board
+
+    @property
+    def grid(self) -> List[List]:
+        return [[self.get_piece(row, col) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE)]
+
+    @grid.setter
+    def grid(self, grid: List[List]):
+        self.version += 1
+        self.white = self.black = self.kings = 0
+        self._pieces = {}
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = grid[row][col]
+                if piece != 0:
+                    bit = SQUARE_BIT[row][col]
+                    mask = 1 << bit
+                    if piece.color == "white":
+                        self.white |= mask
+                    else:
+                        self.black |= mask
+                    if piece.king:
+                        self.kings |= mask
+                    self._pieces[bit] = piece
+        self.zobrist = compute_zobrist(self)
+
+    def recount(self):
+        """Rehash; material is read straight from the bitboards."""
+        self.version += 1
+        self.zobrist = compute_zobrist(self)
+
+    def material(self, player_color: str) -> Tuple[int, int, int]:
+        """(pieces, kings, pieces on warp squares); the bitboards are the running totals."""
+        own = self.white if player_color == "white" else self.black
+        return own.bit_count(), (own & self.kings).bit_count(), (own & WARP_MASK).bit_count()
+
+    def get_piece(self, row: int, col: int) -> Optional[Piece]:
+        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+            return 0
+        bit = SQUARE_BIT[row][col]
+        if bit < 0:
+            return 0
+        piece = self._pieces.get(bit)
+        if piece is not None:
+            return piece
+        mask = 1 << bit
+        if self.white & mask:
+            color = "white"
+        elif self.black & mask:
+            color = "black"
+        else:
+            return 0
+        piece = Piece(row, col, color, bool(self.kings & mask))
+        self._pieces[bit] = piece
+        return piece
+
+    def move_piece(self, piece: Piece, new_row: int, new_col: int):
+        from_bit = SQUARE_BIT[piece.row][piece.col]
+        to_bit = SQUARE_BIT[new_row][new_col]
+        from_mask, to_mask = 1 << from_bit, 1 << to_bit
+        self.version += 1
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+        if piece.color == "white":
+            self.white = (self.white & ~from_mask) | to_mask
+        else:
+            self.black = (self.black & ~from_mask) | to_mask
+        self._pieces.pop(from_bit, None)
+        piece.row, piece.col = new_row, new_col
+        if to_mask & PROMOTION_MASK[piece.color]:
+            piece.king = True
+        self.kings &= ~from_mask
+        if piece.king:
+            self.kings |= to_mask
+        self._pieces[to_bit] = piece
+        self.zobrist ^= piece_key(new_row, new_col, piece.color, piece.king)
+
+    def remove_piece(self, row: int, col: int):
+        bit = SQUARE_BIT[row][col]
+        if bit < 0:
+            return
+        self.version += 1
+        mask = 1 << bit
+        if (self.white | self.black) & mask:
+            color = "white" if self.white & mask else "black"
+            self.zobrist ^= piece_key(row, col, color, bool(self.kings & mask))
+        mask = ~mask
+        self.white &= mask
+        self.black &= mask
+        self.kings &= mask
+        self._pieces.pop(bit, None)
+
+    def place_piece(self, piece: Piece):
+        self.version += 1
+        bit = SQUARE_BIT[piece.row][piece.col]
+        mask = 1 << bit
+        if piece.color == "white":
+            self.white |= mask
+        else:
+            self.black |= mask
+        if piece.king:
+            self.kings |= mask
+        self._pieces[bit] = piece
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+
+    def set_king(self, piece: Piece, king: bool):
+        if piece.king == king:
+            return
+        self.version += 1
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+        piece.king = king
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+        mask = 1 << SQUARE_BIT[piece.row][piece.col]
+        if king:
+            self.kings |= mask
+        else:
+            self.kings &= ~mask
+
+    def valid_moves_from(self, row: int, col: int, only_captures: bool = False) -> List[Tuple[int, int]]:
+        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+            return []
+        bit = SQUARE_BIT[row][col]
+        if bit < 0:
+            return []
+        mask = 1 << bit
+        if self.white & mask:
+            own, opponent = self.white, self.black
+            color = "white"
+        elif self.black & mask:
+            own, opponent = self.black, self.white
+            color = "black"
+        else:
+            return []
+        offsets = KING_SHIFTS if self.kings & mask else MAN_SHIFTS[color]
+        empty = PLAYABLE_MASK & ~(own | opponent)
+        capturable = opponent & ~WARP_MASK
+        moves = []
+        capture_moves = []
+        for offset in offsets:
+            over = shift(mask, offset)
+            if over & capturable:
+                landing = shift(over, offset)
+                if landing & empty:
+                    capture_moves.append(BIT_SQUARE[bit + 2 * offset])
+            elif not only_captures and over & empty:
+                moves.append(BIT_SQUARE[bit + offset])
+        return capture_moves if capture_moves else moves
+
+    def generate_moves(self, player_color: str) -> List[Tuple[int, int]]:
+        """All (from_bit, to_bit) moves for a side; see generate_position_moves."""
+        return generate_position_moves((self.white, self.black, self.kings), player_color == "black")
+
+    def has_captures(self, player_color: str) -> bool:
+        return has_capture((self.white, self.black, self.kings), player_color == "black")
+
+    def all_valid_moves(self, player_color: str) -> List[Tuple[Piece, Tuple[int, int]]]:
+        return [
+            (self.get_piece(*BIT_SQUARE[from_bit]), BIT_SQUARE[to_bit])
+            for from_bit, to_bit in self.generate_moves(player_color)
+        ]
+
+
+def encode_position(board: Board) -> Tuple[int, int, int]:
+    """Compact (white, black, kings) bitboard triple for any board backend; cheap to pickle."""
+    if isinstance(board, BitBoard):
+        return board.white, board.black, board.kings
+    white = black = kings = 0
+    for bit, (row, col) in BIT_SQUARE.items():
+        piece = board.get_piece(row, col)
+        if piece != 0:
+            if piece.color == "white":
+                white |= 1 << bit
+            else:
+                black |= 1 << bit
+            if piece.king:
+                kings |= 1 << bit
+    return white, black, kings
+
+
+def _directions(position: Tuple[int, int, int], black_to_move: bool):
+    """(left, right, pieces) per direction for the side to move, its empty squares and the opponent's capturable pieces.
+
+    bits << left >> right moves pieces one step that way, without the branch
+    in shift(); the result is only meaningful once masked with the empty or
+    capturable squares. Men step forward only, so backward directions are
+    left out when the side has no king.
+    """
+    white, black, kings = position
+    own, opponent = (black, white) if black_to_move else (white, black)
+    directions = [(left, right, own) for left, right in FORWARD_STEPS[black_to_move]]
+    own_kings = own & kings
+    if own_kings:
+        directions += [(left, right, own_kings) for left, right in FORWARD_STEPS[not black_to_move]]
+    return directions, PLAYABLE_MASK & ~(white | black), opponent & ~WARP_MASK
+
+
+def generate_position_moves(position: Tuple[int, int, int], black_to_move: bool) -> List[Tuple[int, int]]:
+    """All (from_bit, to_bit) moves in a (white, black, kings) triple, generated direction by direction for every piece at once.
+
+    A piece that can capture may only capture; the others make simple moves,
+    matching Board.valid_moves_from, and the moves come sorted in its order.
+    Works on the integers alone, without Piece objects; play() applies them.
+    """
+    directions, empty, capturable = _directions(position, black_to_move)
+    moves = []
+    capturers = 0
+    for left, right, pieces in directions:
+        landings = ((((pieces << left) >> right) & capturable) << left >> right) & empty
+        if landings:
+            capturers |= (landings << 2 * right) >> 2 * left
+            jump = 2 * (left - right)
+            moves.extend((to_bit - jump, to_bit) for to_bit in iter_bits(landings))
+    for left, right, pieces in directions:
+        step = left - right
+        moves.extend((to_bit - step, to_bit) for to_bit in iter_bits(((pieces & ~capturers) << left >> right) & empty))
+    moves.sort()
+    return moves
+
+
+def count_position_moves(position: Tuple[int, int, int], black_to_move: bool) -> int:
+    """len(generate_position_moves(...)), counted with popcounts instead of listing the moves."""
+    directions, empty, capturable = _directions(position, black_to_move)
+    count = 0
+    capturers = 0
+    for left, right, pieces in directions:
+        landings = ((((pieces << left) >> right) & capturable) << left >> right) & empty
+        if landings:
+            count += landings.bit_count()
+            capturers |= (landings << 2 * right) >> 2 * left
+    for left, right, pieces in directions:
+        count += (((pieces & ~capturers) << left) >> right & empty).bit_count()
+    return count
+
+
+def play(position: Tuple[int, int, int], black_to_move: bool, from_bit: int, to_bit: int) -> Tuple[int, int, int]:
+    """The (white, black, kings) triple after a legal (from_bit, to_bit) move, capture and promotion included."""
+    white, black, kings = position
+    from_mask, to_mask = 1 << from_bit, 1 << to_bit
+    if abs(to_bit - from_bit) > 6:
+        captured = ~(1 << ((from_bit + to_bit) // 2))
+        white &= captured
+        black &= captured
+        kings &= captured
+    if black_to_move:
+        black = (black & ~from_mask) | to_mask
+    else:
+        white = (white & ~from_mask) | to_mask
+    if kings & from_mask or to_mask & PROMOTION_MASK["black" if black_to_move else "white"]:
+        kings = (kings & ~from_mask) | to_mask
+    return white, black, kings
+
+
+def has_capture(position: Tuple[int, int, int], black_to_move: bool) -> bool:
+    """Whether the side to move has any capture in a (white, black, kings) triple."""
+    directions, empty, capturable = _directions(position, black_to_move)
+    for left, right, pieces in directions:
+        if ((((pieces << left) >> right) & capturable) << left >> right) & empty:
+            return True
+    return False
+
+
+def decode_position(position: Tuple[int, int, int]) -> BitBoard:
+    board = BitBoard.__new__(BitBoard)
+    board.white, board.black, board.kings = position
+    board._pieces = {}
+    board.zobrist = compute_zobrist(board)
+    return board
@@ -1,8 +1,22 @@
+import math
 import random
-from typing import List, Tuple, Optional
-from copy import deepcopy
+import threading
+import time
+from typing import TYPE_CHECKING, List, Tuple, Optional
+from src.game.ordering import MoveOrderer
+from src.game.stats import SearchStats
+from src.game.tables import ADVANCEMENT, BACK_ROW, BOARD_SIZE, CENTRE, MOVE_TABLE, PROMOTION_ROW, WARP_SQUARES
+from src.game.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable, compute_zobrist, piece_key, position_key
 
-BOARD_SIZE = 10
+if TYPE_CHECKING:
+    from src.game.batch_eval import BatchEvaluator
+    from src.game.book import OpeningBook
+    from src.game.tablebase import EndgameTablebase
+
+MAX_SEARCH_DEPTH = 32
+QUIESCENCE_MAX_PLY = 8  # Captures searched beyond the nominal depth before a node is scored as it stands
+DELTA_MARGIN = 1.0  # Slack over the material won, for positional swings, before a capture is delta-pruned
+ASPIRATION_WINDOW = 0.5  # Half-width of the root window around the previous iteration's score, doubled on each failure
 
 class Piece:
     def __init__(self, row: int, col: int, color: str, king: bool = False):
@@ -12,6 +26,9 @@ class Piece:
         self.king = king
 
 class Board:
+    # Bumped by every change to the pieces, so cached queries (status.StatusCache) know when to recompute
+    version = 0
+
     def __init__(self):
         self.grid = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
         for row in range(4):
@@ -22,6 +39,42 @@ class Board:
             for col in range(BOARD_SIZE):
                 if (row + col) % 2 != 0:
                     self.grid[row][col] = Piece(row, col, "white")
+        self.recount()
+
+    @classmethod
+    def from_pieces(cls, pieces: List[Piece]) -> "Board":
+        """A board holding only the given pieces, e.g. a test or benchmark position."""
+        board = cls()
+        grid = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for piece in pieces:
+            grid[piece.row][piece.col] = piece
+        board.grid = grid
+        board.recount()
+        return board
+
+    def recount(self):
+        """Rebuild the hash and the running material totals from the grid."""
+        self.version += 1
+        self.zobrist = compute_zobrist(self)
+        self.piece_counts = {"white": 0, "black": 0}
+        self.king_counts = {"white": 0, "black": 0}
+        self.warp_counts = {"white": 0, "black": 0}
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.grid[row][col]
+                if piece != 0:
+                    self._count(piece, 1)
+
+    def _count(self, piece: Piece, delta: int):
+        self.piece_counts[piece.color] += delta
+        if piece.king:
+            self.king_counts[piece.color] += delta
+        if (piece.row, piece.col) in WARP_SQUARES:
+            self.warp_counts[piece.color] += delta
+
+    def material(self, color: str) -> Tuple[int, int, int]:
+        """(pieces, kings, pieces on warp squares) for one colour."""
+        return self.piece_counts[color], self.king_counts[color], self.warp_counts[color]
 
     def get_piece(self, row: int, col: int) -> Optional[Piece]:
         if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
@@ -29,47 +82,85 @@ class Board:
         return 0
 
     def move_piece(self, piece: Piece, new_row: int, new_col: int):
+        self.version += 1
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+        self._count(piece, -1)
         self.grid[piece.row][piece.col] = 0
         piece.row, piece.col = new_row, new_col
         self.grid[new_row][new_col] = piece
-        if piece.color == "white" and new_row == 0:
-            piece.king = True
-        elif piece.color == "black" and new_row == BOARD_SIZE - 1:
+        if new_row == PROMOTION_ROW[piece.color]:
             piece.king = True
+        self.zobrist ^= piece_key(new_row, new_col, piece.color, piece.king)
+        self._count(piece, 1)
 
     def remove_piece(self, row: int, col: int):
+        self.version += 1
+        piece = self.grid[row][col]
+        if piece != 0:
+            self.zobrist ^= piece_key(row, col, piece.color, piece.king)
+            self._count(piece, -1)
         self.grid[row][col] = 0
 
-def get_valid_moves(board: Board, row: int, col: int, only_captures: bool = False) -> List[Tuple[int, int]]:
-    moves = []
-    capture_moves = []
-    piece = board.get_piece(row, col)
-    if not piece or piece == 0:
+    def place_piece(self, piece: Piece):
+        self.version += 1
+        self.grid[piece.row][piece.col] = piece
+        self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+        self._count(piece, 1)
+
+    def set_king(self, piece: Piece, king: bool):
+        if piece.king != king:
+            self.version += 1
+            self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+            self.king_counts[piece.color] += 1 if king else -1
+            piece.king = king
+            self.zobrist ^= piece_key(piece.row, piece.col, piece.color, piece.king)
+
+    def valid_moves_from(self, row: int, col: int, only_captures: bool = False) -> List[Tuple[int, int]]:
+        moves = []
+        capture_moves = []
+        piece = self.get_piece(row, col)
+        if not piece or piece == 0:
+            return moves
+        grid = self.grid
+        entries = MOVE_TABLE[piece.color][piece.king][row * BOARD_SIZE + col]
+        if not only_captures:
+            for step, _ in entries:
+                if step is not None and grid[step[0]][step[1]] == 0:
+                    moves.append(step)
+        for _, jump in entries:
+            if jump is not None:
+                (over_row, over_col), landing = jump
+                intermediate_piece = grid[over_row][over_col]
+                if (
+                    intermediate_piece != 0
+                    and intermediate_piece.color != piece.color
+                    and grid[landing[0]][landing[1]] == 0
+                    and (over_row, over_col) not in WARP_SQUARES
+                ):
+                    capture_moves.append(landing)
+        return capture_moves if capture_moves else moves
+
+    def has_captures(self, player_color: str) -> bool:
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.grid[row][col]
+                if piece != 0 and piece.color == player_color and self.valid_moves_from(row, col, only_captures=True):
+                    return True
+        return False
+
+    def all_valid_moves(self, player_color: str) -> List[Tuple[Piece, Tuple[int, int]]]:
+        moves = []
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.get_piece(row, col)
+                if piece != 0 and piece.color == player_color:
+                    valid_moves = self.valid_moves_from(row, col)
+                    for move in valid_moves:
+                        moves.append((piece, move))
         return moves
-    directions = [(-1, -1), (-1, 1)] if piece.color == "white" else [(1, -1), (1, 1)]
-    if piece.king:
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-    if not only_captures:
-        for drow, dcol in directions:
-            new_row, new_col = row + drow, col + dcol
-            if is_valid_square(new_row, new_col) and board.get_piece(new_row, new_col) == 0:
-                moves.append((new_row, new_col))
-    for drow, dcol in directions:
-        new_row, new_col = row + 2 * drow, col + 2 * dcol
-        intermediate_row, intermediate_col = row + drow, col + dcol
-        if (
-            is_valid_square(new_row, new_col)
-            and is_valid_square(intermediate_row, intermediate_col)
-        ):
-            intermediate_piece = board.get_piece(intermediate_row, intermediate_col)
-            if (
-                intermediate_piece != 0
-                and is_opponent(intermediate_piece, piece)
-                and board.get_piece(new_row, new_col) == 0
-                and not is_in_warp_zone(intermediate_row, intermediate_col)
-            ):
-                capture_moves.append((new_row, new_col))
-    return capture_moves if capture_moves else moves
+
+def get_valid_moves(board: Board, row: int, col: int, only_captures: bool = False) -> List[Tuple[int, int]]:
+    return board.valid_moves_from(row, col, only_captures)
 
 def is_valid_square(row: int, col: int) -> bool:
     return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
@@ -83,138 +174,698 @@ def is_valid_move(board: Board, piece: Piece, new_row: int, new_col: int, player
     valid_moves = get_valid_moves(board, piece.row, piece.col)
     return (new_row, new_col) in valid_moves
 
-def execute_move(board: Board, piece: Piece, new_row: int, new_col: int, allow_multi_jump: bool = False) -> Tuple[bool, bool, Optional[Tuple[int, int]], bool]:
+class MoveRecord:
+    """What a move played in the game did, for the game loop to animate and report.
+
+    captured lists the squares of the pieces taken. warp_blocked is set when
+    the move was a jump over an opponent on a warp square; such a capture is
+    refused and the board is left unchanged. can_jump_again is only set with
+    multi-jump active and no promotion, and then bonus_move is not. undo is the
+    UndoRecord of a move that was played, so unmake_move can take it back.
+    """
+    __slots__ = ("piece", "from_pos", "to_pos", "captured", "promoted", "bonus_move", "can_jump_again", "warp_blocked", "undo")
+
+    def __init__(self, piece: Piece, from_pos: Tuple[int, int], to_pos: Tuple[int, int], captured: Tuple[Tuple[int, int], ...] = (), promoted: bool = False, bonus_move: bool = False, can_jump_again: bool = False, warp_blocked: bool = False, undo: Optional["UndoRecord"] = None):
+        self.piece = piece
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        self.captured = captured
+        self.promoted = promoted
+        self.bonus_move = bonus_move
+        self.can_jump_again = can_jump_again
+        self.warp_blocked = warp_blocked
+        self.undo = undo
+
+    @property
+    def is_capture(self) -> bool:
+        return bool(self.captured)
+
+def _jumps_warp_piece(board: Board, piece: Piece, new_row: int, new_col: int) -> bool:
+    if abs(new_row - piece.row) != 2 or abs(new_col - piece.col) != 2:
+        return False
+    over_row, over_col = (piece.row + new_row) // 2, (piece.col + new_col) // 2
+    victim = board.get_piece(over_row, over_col)
+    return victim != 0 and victim.color != piece.color and (over_row, over_col) in WARP_SQUARES
+
+def execute_move(board: Board, piece: Piece, new_row: int, new_col: int, allow_multi_jump: bool = False) -> Optional[MoveRecord]:
+    """Play a move in the game. Returns its MoveRecord, or None if the move is not legal.
+
+    A jump over a piece on a warp square is refused with a warp_blocked record.
+    """
+    from_pos = (piece.row, piece.col)
     valid_moves = get_valid_moves(board, piece.row, piece.col)
     if (new_row, new_col) not in valid_moves:
-        return False, False, None, False
-    is_capture = False
-    dr, dc = new_row - piece.row, new_col - piece.col
-    if abs(dr) == 2 and abs(dc) == 2:
+        if _jumps_warp_piece(board, piece, new_row, new_col):
+            return MoveRecord(piece, from_pos, (new_row, new_col), warp_blocked=True)
+        return None
+    undo = make_move(board, piece, new_row, new_col)
+    captured = ((undo.captured.row, undo.captured.col),) if undo.captured else ()
+    # Only check for multi-jumps if allowed; a piece that can jump again gets no bonus move yet, and a promotion ends the chain
+    if allow_multi_jump and not undo.promoted and get_valid_moves(board, new_row, new_col, only_captures=True):
+        return MoveRecord(piece, from_pos, (new_row, new_col), captured, undo.promoted, can_jump_again=True, undo=undo)
+    # Warp zone logic: Grant bonus move if landing on a warp zone square
+    return MoveRecord(piece, from_pos, (new_row, new_col), captured, undo.promoted, undo.bonus_move, undo=undo)
+
+class UndoRecord:
+    """What make_move changed, so unmake_move can put the board back exactly."""
+    __slots__ = ("piece", "from_pos", "to_pos", "captured", "promoted", "bonus_move")
+
+    def __init__(self, piece: Piece, from_pos: Tuple[int, int], to_pos: Tuple[int, int], captured: Optional[Piece], promoted: bool, bonus_move: bool):
+        self.piece = piece
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        self.captured = captured
+        self.promoted = promoted
+        self.bonus_move = bonus_move
+
+def make_move(board: Board, piece: Piece, new_row: int, new_col: int) -> UndoRecord:
+    """Play an already validated move in place and return the record needed to take it back."""
+    from_pos = (piece.row, piece.col)
+    captured = None
+    if abs(new_row - piece.row) == 2:
         captured_row, captured_col = (piece.row + new_row) // 2, (piece.col + new_col) // 2
+        captured = board.get_piece(captured_row, captured_col)
         board.remove_piece(captured_row, captured_col)
-        is_capture = True
+    was_king = piece.king
     board.move_piece(piece, new_row, new_col)
-    can_jump_again = False
-    bonus_move_triggered = False
-    if allow_multi_jump:  # Only check for multi-jumps if allowed
-        more_captures = get_valid_moves(board, new_row, new_col, only_captures=True)
-        if more_captures:
-            can_jump_again = True
-            return is_capture, can_jump_again, (new_row, new_col), False
-    # Warp zone logic: Grant bonus move if landing on a warp zone square
-    if is_in_warp_zone(new_row, new_col):
-        bonus_move_triggered = True
-    return is_capture, can_jump_again, None, bonus_move_triggered
+    return UndoRecord(piece, from_pos, (new_row, new_col), captured, piece.king and not was_king, is_in_warp_zone(new_row, new_col))
+
+def unmake_move(board: Board, undo: UndoRecord):
+    piece = undo.piece
+    if undo.promoted:
+        board.set_king(piece, False)
+    board.move_piece(piece, undo.from_pos[0], undo.from_pos[1])
+    if undo.captured:
+        board.place_piece(undo.captured)
+
+class CaptureSequence(tuple):
+    """A complete multi-jump, searched as a single move.
+
+    It unpacks and compares as its first landing square (row, col), so it fits
+    wherever a move is (piece, (row, col)) and the game can still play it one
+    hop at a time. path holds every landing square in order and captured the
+    squares of the pieces jumped.
+    """
+
+    def __new__(cls, path: Tuple[Tuple[int, int], ...], captured: Tuple[Tuple[int, int], ...]):
+        sequence = super().__new__(cls, path[0])
+        sequence.path = tuple(path)
+        sequence.captured = tuple(captured)
+        return sequence
+
+    def __getnewargs__(self):
+        return self.path, self.captured
+
+def capture_sequences(board: Board, piece: Piece) -> List[CaptureSequence]:
+    """Every complete capture chain the piece can make, each resulting position once.
+
+    A chain ends when the piece has no further capture or a man is promoted,
+    as in execute_move. Chains that end on the same square having taken the
+    same pieces are duplicates and only the first is kept. Pieces on warp
+    squares cannot be jumped, as in valid_moves_from.
+    """
+    sequences = []
+    seen = set()
+    path: List[Tuple[int, int]] = []
+    captured: List[Tuple[int, int]] = []
+
+    def extend(promoted: bool):
+        hops = [] if promoted else get_valid_moves(board, piece.row, piece.col, only_captures=True)
+        if not hops:
+            if path:
+                key = (path[-1], frozenset(captured))
+                if key not in seen:
+                    seen.add(key)
+                    sequences.append(CaptureSequence(tuple(path), tuple(captured)))
+            return
+        for hop_row, hop_col in hops:
+            undo = make_move(board, piece, hop_row, hop_col)
+            path.append((hop_row, hop_col))
+            captured.append((undo.captured.row, undo.captured.col))
+            try:
+                extend(undo.promoted)
+            finally:
+                path.pop()
+                captured.pop()
+                unmake_move(board, undo)
+
+    extend(False)
+    return sequences
+
+def get_search_moves(board: Board, player_color: str, allow_multi_jump: bool = False) -> List[Tuple[Piece, Tuple[int, int]]]:
+    """The moves the search plays: single moves, or with multi-jump every capture as a complete CaptureSequence."""
+    moves = get_all_valid_moves_for_player(board, player_color)
+    if not allow_multi_jump:
+        return moves
+    search_moves = []
+    expanded = set()
+    for piece, move in moves:
+        if abs(move[0] - piece.row) != 2:
+            search_moves.append((piece, move))
+        elif (piece.row, piece.col) not in expanded:
+            expanded.add((piece.row, piece.col))
+            search_moves.extend((piece, sequence) for sequence in capture_sequences(board, piece))
+    return search_moves
+
+def get_search_captures(board: Board, player_color: str, allow_multi_jump: bool = False) -> List[Tuple[Piece, Tuple[int, int]]]:
+    """The captures among get_search_moves, for the quiescence search."""
+    return [(piece, move) for piece, move in get_search_moves(board, player_color, allow_multi_jump) if abs(move[0] - piece.row) == 2]
+
+def play_search_move(board: Board, piece: Piece, move: Tuple[int, int]) -> List[UndoRecord]:
+    """make_move for a search move, every hop of a CaptureSequence included; undo in reverse order."""
+    if isinstance(move, CaptureSequence):
+        return [make_move(board, piece, row, col) for row, col in move.path]
+    return [make_move(board, piece, move[0], move[1])]
 
 def is_piece_at_position(board: Board, row: int, col: int, player_color: str) -> bool:
     piece = board.get_piece(row, col)
     return piece != 0 and piece.color == player_color
 
 def get_all_valid_moves_for_player(board: Board, player_color: str) -> List[Tuple[Piece, Tuple[int, int]]]:
-    moves = []
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            piece = board.get_piece(row, col)
-            if piece != 0 and piece.color == player_color:
-                valid_moves = get_valid_moves(board, row, col)
-                for move in valid_moves:
-                    moves.append((piece, move))
-    return moves
-def evaluate_board(board: Board, player_color: str) -> float:
-    """Evaluate the board state from the AI's perspective."""
-    score = 0
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            piece = board.get_piece(row, col)
-            if piece != 0:
-                if piece.color == player_color:
-                    score += 1  # +1 for each AI piece
-                    if piece.king:
-                        score += 2  # +2 for each AI king (total +3)
-                    if is_in_warp_zone(piece.row, piece.col):
-                        score += 1  # Add 1 for AI piece in warp zone
-                else:
-                    # -1 for each opponent piece
-                    score -= 1  # -1 for each opponent piece
-                    if piece.king:
-                        score -= 2  # -2 for each opponent king (total -3)
-                    if is_in_warp_zone(piece.row, piece.col):
-                        score -= 1  # Subtract 1 for opponent piece in warp zone
-    return score
+    return board.all_valid_moves(player_color)
 
+class EvalWeights:
+    """Weights of the evaluation terms; the defaults are the original material-only evaluation."""
 
-def minimax_with_alpha_beta(board: Board, depth: int, maximizing_player: bool, player_color: str, alpha: float, beta: float, allow_multi_jump: bool = False) -> Tuple[float, Optional[Tuple[Piece, Tuple[int, int]]]]:
-    """Minimax algorithm with alpha-beta pruning to find the best move."""
+    def __init__(self, piece: float = 1, king: float = 2, warp: float = 1, advancement: float = 0, centre: float = 0, back_row: float = 0):
+        self.piece = piece
+        self.king = king
+        self.warp = warp
+        self.advancement = advancement
+        self.centre = centre
+        self.back_row = back_row
+
+    @property
+    def positional(self) -> bool:
+        return bool(self.advancement or self.centre or self.back_row)
+
+
+MATERIAL_WEIGHTS = EvalWeights()
+POSITIONAL_WEIGHTS = EvalWeights(advancement=0.05, centre=0.1, back_row=0.2)
+
+def evaluate_board(board: Board, player_color: str, weights: Optional[EvalWeights] = None) -> float:
+    """Evaluate the board state from the AI's perspective.
+
+    +1 per piece, +2 more per king and +1 per piece on a warp square, minus the
+    same for the opponent. Reads the board's running totals, so it costs the
+    same however many pieces are left. With weights, each term is scaled and
+    the positional terms (men's advancement, pieces in the centre, men
+    guarding the back row) are added; batch_eval computes the same score for
+    many positions at once.
+    """
+    opponent_color = "white" if player_color == "black" else "black"
+    pieces, kings, warp = board.material(player_color)
+    opponent_pieces, opponent_kings, opponent_warp = board.material(opponent_color)
+    if weights is None:
+        return (pieces - opponent_pieces) + 2 * (kings - opponent_kings) + (warp - opponent_warp)
+    advancement = centre = back_row = 0
+    if weights.positional:
+        for row in range(BOARD_SIZE):
+            for col in range(1 - row % 2, BOARD_SIZE, 2):
+                piece = board.get_piece(row, col)
+                if piece == 0:
+                    continue
+                sign = 1 if piece.color == player_color else -1
+                square = row * BOARD_SIZE + col
+                centre += sign * CENTRE[square]
+                if not piece.king:
+                    advancement += sign * ADVANCEMENT[piece.color][square]
+                    back_row += sign * BACK_ROW[piece.color][square]
+    return (weights.piece * (pieces - opponent_pieces) + weights.king * (kings - opponent_kings) + weights.warp * (warp - opponent_warp)
+            + weights.advancement * advancement + weights.centre * centre + weights.back_row * back_row)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its time or node budget has run out."""
+
+
+class SearchLimits:
+    """Wall-clock and node budget shared by every node of one search.
+
+    Setting cancel_event stops the search at the next clock check whether or
+    not the budget is being enforced.
+    """
+
+    CLOCK_CHECK_INTERVAL = 64
+
+    def __init__(self, time_limit_ms: Optional[float] = None, node_limit: Optional[int] = None, cancel_event: Optional[threading.Event] = None):
+        self.start_time = time.perf_counter()
+        self.deadline = None if time_limit_ms is None else self.start_time + time_limit_ms / 1000
+        self.node_limit = node_limit
+        self.cancel_event = cancel_event
+        self.enforce_budget = True
+        self.nodes = 0
+
+    def check(self):
+        self.nodes += 1
+        if self.enforce_budget and self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.nodes % self.CLOCK_CHECK_INTERVAL == 0:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise SearchTimeout()
+            if self.enforce_budget and self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+    def remaining_ms(self) -> float:
+        if self.deadline is None:
+            return float('inf')
+        return (self.deadline - time.perf_counter()) * 1000
+
+
+def _search_child(board: Board, piece: Piece, move: Tuple[int, int], depth: int, maximizing_player: bool, player_color: str, alpha: float, beta: float, allow_multi_jump: bool, tt: Optional[TranspositionTable] = None, ply: int = 0, limits: Optional[SearchLimits] = None, orderer: Optional[MoveOrderer] = None, stats: Optional[SearchStats] = None, tablebase: Optional["EndgameTablebase"] = None, evaluator: Optional["BatchEvaluator"] = None, quiescence: bool = True) -> float:
+    """Play one move (a whole CaptureSequence included) in place, score the resulting position for player_color and take the move back."""
+    if maximizing_player:
+        return _negamax_child(board, piece, move, depth, player_color, alpha, beta, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+    opponent = "white" if player_color == "black" else "black"
+    return -_negamax_child(board, piece, move, depth, opponent, -beta, -alpha, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+
+
+def _negamax_child(board: Board, piece: Piece, move: Tuple[int, int], depth: int, color_to_move: str, alpha: float, beta: float, allow_multi_jump: bool, tt: Optional[TranspositionTable], ply: int, limits: Optional[SearchLimits], orderer: Optional[MoveOrderer], stats: Optional[SearchStats], tablebase: Optional["EndgameTablebase"], evaluator: Optional["BatchEvaluator"], quiescence: bool) -> float:
+    """_search_child in negamax form: color_to_move plays the move and the score is color_to_move's."""
+    undo_stack = play_search_move(board, piece, move)
+    if stats is not None:
+        stats.multi_jump_extensions += len(undo_stack) - 1
+    try:
+        opponent = "white" if color_to_move == "black" else "black"
+        eval_score, _ = _negamax(board, depth - 1, opponent, -beta, -alpha, allow_multi_jump, tt, ply + 1, limits, orderer, stats, tablebase, evaluator, quiescence)
+        return -eval_score
+    finally:
+        for undo in reversed(undo_stack):
+            unmake_move(board, undo)
+
+
+def _capture_gain(board: Board, piece: Piece, move: Tuple[int, int], weights: EvalWeights) -> float:
+    """Most a capture can raise the mover's evaluation: the pieces taken, a promotion and a warp square."""
+    if isinstance(move, CaptureSequence):
+        captured = move.captured
+    else:
+        captured = [((piece.row + move[0]) // 2, (piece.col + move[1]) // 2)]
+    gain = 0.0
+    for row, col in captured:
+        victim = board.get_piece(row, col)
+        gain += weights.piece + (weights.king if victim != 0 and victim.king else 0)
+    return gain + weights.king + weights.warp + DELTA_MARGIN
+
+
+def quiescence_search(board: Board, maximizing_player: bool, player_color: str, alpha: float, beta: float, allow_multi_jump: bool = False, ply: int = 0, limits: Optional[SearchLimits] = None, stats: Optional[SearchStats] = None, evaluator: Optional["BatchEvaluator"] = None, quiescence_ply: int = 0) -> float:
+    """Score a node past the nominal depth by playing out captures until the position is quiet.
+
+    The side to move may stand pat on the static evaluation: captures are only
+    compulsory for the piece that can make them, so it can usually make a
+    quiet move elsewhere instead. Only captures are searched, each one skipped
+    when even the most it could win (see _capture_gain) cannot bring the score
+    past the bound (delta pruning). After QUIESCENCE_MAX_PLY capture plies the
+    evaluation is returned as it stands. The main search calls it at
+    depth 0 and has already counted that node against limits and stats.
+    """
+    if quiescence_ply > 0:
+        if limits is not None:
+            limits.check()
+        if stats is not None:
+            stats.visit(ply)
+            stats.quiescence_nodes += 1
+    if stats is not None:
+        stats.leaf_evals += 1
+    if evaluator is not None:
+        stand_pat = evaluator.evaluate(board, player_color)
+    else:
+        stand_pat = evaluate_board(board, player_color)
+    if quiescence_ply >= QUIESCENCE_MAX_PLY:
+        return stand_pat
+    color_to_move = player_color if maximizing_player else ("white" if player_color == "black" else "black")
+    if not board.has_captures(color_to_move):
+        return stand_pat
+    weights = evaluator.weights if evaluator is not None else MATERIAL_WEIGHTS
+
+    best_eval = stand_pat
+    if maximizing_player:
+        if best_eval >= beta:
+            return best_eval
+        alpha = max(alpha, best_eval)
+    else:
+        if best_eval <= alpha:
+            return best_eval
+        beta = min(beta, best_eval)
+    for piece, move in get_search_captures(board, color_to_move, allow_multi_jump):
+        gain = _capture_gain(board, piece, move, weights)
+        if (stand_pat + gain <= alpha) if maximizing_player else (stand_pat - gain >= beta):
+            if stats is not None:
+                stats.delta_prunes += 1
+            # Counted at the most it could score, so a fail-soft result stays a bound on the skipped capture
+            best_eval = max(best_eval, stand_pat + gain) if maximizing_player else min(best_eval, stand_pat - gain)
+            continue
+        undo_stack = play_search_move(board, piece, move)
+        try:
+            eval_score = quiescence_search(board, not maximizing_player, player_color, alpha, beta, allow_multi_jump, ply + 1, limits, stats, evaluator, quiescence_ply + 1)
+        finally:
+            for undo in reversed(undo_stack):
+                unmake_move(board, undo)
+        if maximizing_player:
+            best_eval = max(best_eval, eval_score)
+            alpha = max(alpha, best_eval)
+        else:
+            best_eval = min(best_eval, eval_score)
+            beta = min(beta, best_eval)
+        if beta <= alpha:
+            break
+    return best_eval
+
+
+def minimax_with_alpha_beta(board: Board, depth: int, maximizing_player: bool, player_color: str, alpha: float, beta: float, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, ply: int = 0, limits: Optional[SearchLimits] = None, orderer: Optional[MoveOrderer] = None, stats: Optional[SearchStats] = None, tablebase: Optional["EndgameTablebase"] = None, evaluator: Optional["BatchEvaluator"] = None, quiescence: bool = True) -> Tuple[float, Optional[Tuple[Piece, Tuple[int, int]]]]:
+    """Minimax algorithm with alpha-beta pruning to find the best move.
+
+    The score is from player_color's point of view, and the best move is
+    returned when maximizing_player (player_color is to move). The search
+    itself is _negamax: principal variation search, where the first move of a
+    node gets the full window and the others a null window that only tells
+    whether they beat the best so far, searched again in full when they do.
+
+    Moves are played and taken back in place with make_move/unmake_move, so the
+    board is left exactly as it was passed in. With a transposition table,
+    stored bounds can end the search of a node early (never at the root, ply 0)
+    and the stored best move is searched first. Scores and bounds are kept in
+    the table from the point of view of the side to move, which is part of the
+    key, so one table can serve either side. With limits, the search raises
+    SearchTimeout once the budget is spent. With a MoveOrderer, moves are
+    sorted (hash move, captures, killers, history) and quiet moves that cause
+    cutoffs are fed back to it. A SearchStats passed as stats is updated as
+    nodes are visited. With an EndgameTablebase, positions it covers below the
+    root become leaves scored from the table (not while multi-jumps are
+    active, which the table does not model). A BatchEvaluator
+    replaces evaluate_board at the leaves and, with batch_leaves, scores all
+    children of a depth-1 node in one vectorised call. With allow_multi_jump,
+    each complete capture chain is one move (see get_search_moves). With
+    quiescence, depth-0 nodes are scored by quiescence_search rather than
+    evaluated in the middle of a capture exchange.
+    """
+    if maximizing_player:
+        return _negamax(board, depth, player_color, alpha, beta, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+    opponent = "white" if player_color == "black" else "black"
+    eval_score, _ = _negamax(board, depth, opponent, -beta, -alpha, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+    return -eval_score, None
+
+
+def _negamax(board: Board, depth: int, color_to_move: str, alpha: float, beta: float, allow_multi_jump: bool, tt: Optional[TranspositionTable], ply: int, limits: Optional[SearchLimits], orderer: Optional[MoveOrderer], stats: Optional[SearchStats], tablebase: Optional["EndgameTablebase"], evaluator: Optional["BatchEvaluator"], quiescence: bool) -> Tuple[float, Optional[Tuple[Piece, Tuple[int, int]]]]:
+    """minimax_with_alpha_beta in negamax form: scores are color_to_move's, and a child's score is negated."""
+    if limits is not None:
+        limits.check()
+    if stats is not None:
+        stats.visit(ply)
+    if tablebase is not None and ply > 0 and not allow_multi_jump:
+        table_score = tablebase.score(board, color_to_move)
+        if table_score is not None:
+            if stats is not None:
+                stats.tablebase_hits += 1
+            return table_score, None
     if depth == 0:
-        return evaluate_board(board, player_color), None
+        if quiescence:
+            return quiescence_search(board, True, color_to_move, alpha, beta, allow_multi_jump, ply, limits, stats, evaluator), None
+        if stats is not None:
+            stats.leaf_evals += 1
+        if evaluator is not None:
+            return evaluator.evaluate(board, color_to_move), None
+        return evaluate_board(board, color_to_move), None
+    alpha_orig, beta_orig = alpha, beta
+    key = None
+    tt_move = None
+    if tt is not None:
+        key = position_key(board, color_to_move, allow_multi_jump)
+        entry = tt.probe(key)
+        if entry is not None:
+            if stats is not None:
+                stats.tt_hits += 1
+            _, entry_depth, bound, entry_score, tt_move = entry
+            if entry_depth >= depth and ply > 0:
+                if bound == EXACT:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return entry_score, None
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return entry_score, None
 
-    valid_moves = get_all_valid_moves_for_player(board, player_color if maximizing_player else ("white" if player_color == "black" else "black"))
+    valid_moves = get_search_moves(board, color_to_move, allow_multi_jump)
     if not valid_moves:
-        return (-float('inf') if maximizing_player else float('inf')), None
+        return -float('inf'), None
+    if orderer is not None:
+        valid_moves = orderer.order(board, valid_moves, ply, tt_move)
+    elif tt_move is not None:
+        for index, (piece, move) in enumerate(valid_moves):
+            if (piece.row, piece.col) == tt_move[0] and move == tt_move[1]:
+                valid_moves.insert(0, valid_moves.pop(index))
+                break
 
+    child_scores = None
+    if depth == 1 and evaluator is not None and evaluator.batch_leaves and not allow_multi_jump and tablebase is None:
+        children = evaluator.child_positions(board, valid_moves, color_to_move)
+        child_scores = evaluator.evaluate_positions(children, color_to_move).tolist()
+        if quiescence:
+            # Children where the opponent can capture are not quiet; they are searched one by one below
+            for index, pending in enumerate(evaluator.captures_pending(children, color_to_move)):
+                if pending:
+                    child_scores[index] = None
+        quiet = len(child_scores) - child_scores.count(None)
+        for _ in range(quiet):
+            if limits is not None:
+                limits.check()
+            if stats is not None:
+                stats.visit(ply + 1)
+        if stats is not None:
+            stats.leaf_evals += quiet
+
+    best_eval = -float('inf')
     best_move = None
-    if maximizing_player:  # AI's turn (maximizing)
-        max_eval = -float('inf')
-        for piece, (new_row, new_col) in valid_moves:
-            board_copy = deepcopy(board)
-            piece_copy = board_copy.get_piece(piece.row, piece.col)
-            is_capture, can_jump_again, new_selection, _ = execute_move(board_copy, piece_copy, new_row, new_col, allow_multi_jump)
-            if is_capture and can_jump_again and allow_multi_jump:  # Handle multi-jumps
-                sub_eval = max_eval
-                while can_jump_again:
-                    piece_copy = board_copy.get_piece(new_selection[0], new_selection[1])
-                    sub_moves = get_valid_moves(board_copy, new_selection[0], new_selection[1], only_captures=True)
-                    if not sub_moves:
-                        break
-                    new_row, new_col = sub_moves[0]  # Take the first capture for simplicity
-                    is_capture, can_jump_again, new_selection, _ = execute_move(board_copy, piece_copy, new_row, new_col, allow_multi_jump)
-                    eval_score, _ = minimax_with_alpha_beta(board_copy, depth - 1, maximizing_player, player_color, alpha, beta, allow_multi_jump)
-                    sub_eval = max(sub_eval, eval_score)
-                eval_score = sub_eval
-            else:
-                eval_score, _ = minimax_with_alpha_beta(board_copy, depth - 1, False, player_color, alpha, beta, allow_multi_jump)
-            if eval_score > max_eval:
-                max_eval = eval_score
-                best_move = (piece, (new_row, new_col))
-            alpha = max(alpha, max_eval)
-            if beta <= alpha:
-                break  # Alpha-beta pruning
-        return max_eval, best_move
-    else:  # Player's turn (minimizing)
-        min_eval = float('inf')
-        for piece, (new_row, new_col) in valid_moves:
-            board_copy = deepcopy(board)
-            piece_copy = board_copy.get_piece(piece.row, piece.col)
-            is_capture, can_jump_again, new_selection, _ = execute_move(board_copy, piece_copy, new_row, new_col, allow_multi_jump)
-            if is_capture and can_jump_again and allow_multi_jump:
-                sub_eval = min_eval
-                while can_jump_again:
-                    piece_copy = board_copy.get_piece(new_selection[0], new_selection[1])
-                    sub_moves = get_valid_moves(board_copy, new_selection[0], new_selection[1], only_captures=True)
-                    if not sub_moves:
-                        break
-                    new_row, new_col = sub_moves[0]
-                    is_capture, can_jump_again, new_selection, _ = execute_move(board_copy, piece_copy, new_row, new_col, allow_multi_jump)
-                    eval_score, _ = minimax_with_alpha_beta(board_copy, depth - 1, maximizing_player, player_color, alpha, beta, allow_multi_jump)
-                    sub_eval = min(sub_eval, eval_score)
-                eval_score = sub_eval
-            else:
-                eval_score, _ = minimax_with_alpha_beta(board_copy, depth - 1, True, player_color, alpha, beta, allow_multi_jump)
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, min_eval)
-            if beta <= alpha:
-                break  # Alpha-beta pruning
-        return min_eval, best_move
-
-def make_ai_move(board: Board, player_color: str, depth: int = 3, allow_multi_jump: bool = False) -> Tuple[bool, bool]:
-    """Make the AI's move using minimax with alpha-beta pruning. Returns (move_made, bonus_move_triggered)."""
-    _, best_move = minimax_with_alpha_beta(board, depth, True, player_color, -float('inf'), float('inf'), allow_multi_jump)
+    for index, (piece, move) in enumerate(valid_moves):
+        if child_scores is not None and child_scores[index] is not None:
+            eval_score = child_scores[index]
+        elif index == 0:
+            eval_score = _negamax_child(board, piece, move, depth, color_to_move, alpha, beta, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+        else:
+            # Null window: only whether the move beats alpha, which is cheaper to prove or refute than its score
+            eval_score = _negamax_child(board, piece, move, depth, color_to_move, alpha, math.nextafter(alpha, math.inf), allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence)
+            if alpha < eval_score < beta:
+                if stats is not None:
+                    stats.pvs_researches += 1
+                # The probe's score is a lower bound: a search that fails low against it leaves the score at that bound
+                eval_score = max(eval_score, _negamax_child(board, piece, move, depth, color_to_move, eval_score, beta, allow_multi_jump, tt, ply, limits, orderer, stats, tablebase, evaluator, quiescence))
+        if eval_score > best_eval:
+            best_eval = eval_score
+            best_move = (piece, move)
+        alpha = max(alpha, best_eval)
+        if beta <= alpha:
+            if orderer is not None:
+                orderer.record_cutoff(piece, move, ply, depth)
+            if stats is not None:
+                stats.cutoffs += 1
+                stats.first_move_cutoffs += index == 0
+            break  # Alpha-beta pruning
+
+    if tt is not None:
+        if best_eval <= alpha_orig:
+            bound = UPPER_BOUND
+        elif best_eval >= beta_orig:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        stored_move = None
+        if best_move is not None:
+            stored_move = ((best_move[0].row, best_move[0].col), best_move[1])
+        tt.store(key, depth, bound, best_eval, stored_move)
+    return best_eval, best_move
+
+def principal_variation(board: Board, player_color: str, tt: TranspositionTable, allow_multi_jump: bool = False, max_length: int = MAX_SEARCH_DEPTH) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Follow the best moves stored in tt from this position, as ((from_row, from_col), (to_row, to_col)).
+
+    Stops at the first missing or illegal entry or repeated position. Every hop
+    of a multi-jump CaptureSequence is a separate PV entry. The board is left unchanged.
+    """
+    pv = []
+    undo_stack = []
+    seen = set()
+    color = player_color
+    try:
+        while len(pv) < max_length:
+            key = position_key(board, color, allow_multi_jump)
+            entry = tt.probe(key)
+            if key in seen or entry is None or entry[4] is None:
+                break
+            seen.add(key)
+            (from_row, from_col), move = entry[4]
+            piece = board.get_piece(from_row, from_col)
+            if piece == 0 or piece.color != color or (move[0], move[1]) not in get_valid_moves(board, from_row, from_col):
+                break
+            for new_row, new_col in move.path if isinstance(move, CaptureSequence) else (move,):
+                pv.append(((piece.row, piece.col), (new_row, new_col)))
+                undo_stack.append(make_move(board, piece, new_row, new_col))
+            color = "white" if color == "black" else "black"
+    finally:
+        for undo in reversed(undo_stack):
+            unmake_move(board, undo)
+    return pv
+
+def iterative_deepening(board: Board, player_color: str, max_depth: int = MAX_SEARCH_DEPTH, time_limit_ms: Optional[float] = None, node_limit: Optional[int] = None, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, cancel_event: Optional[threading.Event] = None, limits: Optional[SearchLimits] = None, stats: Optional[SearchStats] = None, tablebase: Optional["EndgameTablebase"] = None, evaluator: Optional["BatchEvaluator"] = None, resume: Optional[Tuple[int, float, Tuple[Tuple[int, int], Tuple[int, int]]]] = None, quiescence: bool = True) -> Tuple[float, Optional[Tuple[Piece, Tuple[int, int]]], int]:
+    """Search depth 1, 2, 3... until the budget runs out. Returns (score, best_move, depth_completed).
+
+    The best move always comes from the last iteration that finished. Depth 1
+    ignores the budget (but not cancel_event) so there is always a move to
+    play, and the previous iteration's principal variation is searched first
+    through the transposition table. A SearchLimits passed in replaces the
+    budget arguments and can be read afterwards for node counts; a SearchStats
+    gets the counters of every iteration and the last completed depth and score.
+    resume is (depth, score, ((from_row, from_col), (to_row, to_col))) from an
+    earlier search of this position with the same table, such as pondering:
+    deepening continues after that depth, with its move as the fallback.
+    After the first iteration, each one searches the root with an aspiration
+    window of ASPIRATION_WINDOW either side of the previous score, widening the
+    side that fails until the score lands inside it.
+    """
+    valid_moves = get_all_valid_moves_for_player(board, player_color)
+    if not valid_moves:
+        return -float('inf'), None, 0
+    if tt is None:
+        tt = TranspositionTable()
+    orderer = MoveOrderer()
+    if limits is None:
+        limits = SearchLimits(time_limit_ms, node_limit, cancel_event)
+    best_score, best_move, completed_depth = -float('inf'), valid_moves[0], 0
+    if resume is not None:
+        resume_depth, resume_score, ((from_row, from_col), move) = resume
+        piece = board.get_piece(from_row, from_col)
+        if piece != 0 and piece.color == player_color and tuple(move) in get_valid_moves(board, from_row, from_col):
+            best_score, best_move, completed_depth = resume_score, (piece, tuple(move)), min(resume_depth, max_depth)
+            if stats is not None:
+                stats.depth, stats.score, stats.resumed_depth = completed_depth, best_score, completed_depth
+            if best_score in (float('inf'), -float('inf')):
+                return best_score, best_move, completed_depth
+    for depth in range(completed_depth + 1, max_depth + 1):
+        limits.enforce_budget = completed_depth > 0
+        delta = ASPIRATION_WINDOW
+        alpha, beta = (best_score - delta, best_score + delta) if completed_depth > 0 else (-math.inf, math.inf)
+        try:
+            while True:
+                score, move = minimax_with_alpha_beta(board, depth, True, player_color, alpha, beta, allow_multi_jump, tt, 0, limits, orderer, stats, tablebase, evaluator, quiescence)
+                # Outside the window the score is only a bound (and on a fail low the move means nothing): widen and search again
+                if alpha > -math.inf and score <= alpha:
+                    delta *= 2
+                    alpha = score - delta
+                elif beta < math.inf and score >= beta:
+                    delta *= 2
+                    beta = score + delta
+                else:
+                    break
+                if stats is not None:
+                    stats.aspiration_researches += 1
+        except SearchTimeout:
+            break
+        completed_depth = depth
+        if stats is not None:
+            stats.depth, stats.score = depth, score
+        best_score = score
+        if move is not None:
+            best_move = move
+        if score in (float('inf'), -float('inf')):
+            break  # Forced result, deeper search cannot change it
+        # The next iteration costs several times this one; don't start what cannot finish.
+        if limits.remaining_ms() < limits.elapsed_ms():
+            break
+        orderer.age_history()
+    return best_score, best_move, completed_depth
+
+def choose_ai_move(board: Board, player_color: str, depth: int = 3, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, time_limit_ms: Optional[float] = None, workers: Optional[int] = None, cancel_event: Optional[threading.Event] = None, limits: Optional[SearchLimits] = None, stats: Optional[SearchStats] = None, book: Optional["OpeningBook"] = None, tablebase: Optional["EndgameTablebase"] = None, evaluator: Optional["BatchEvaluator"] = None, resume: Optional[Tuple[int, float, Tuple[Tuple[int, int], Tuple[int, int]]]] = None, quiescence: bool = True) -> Optional[Tuple[Piece, Tuple[int, int]]]:
+    """Search for the AI's move without playing it. Returns (piece, (row, col)), or None when there is no legal move.
+
+    Pass the same TranspositionTable on every turn to carry search results over.
+    With time_limit_ms the search deepens iteratively until the time is used
+    up and depth is ignored. With workers > 1 (and no time limit) the root
+    moves are searched in parallel worker processes instead; the workers use
+    no transposition table, so they choose as the serial search does with
+    tt=None, which with a tt can differ. A fixed-depth
+    search stopped through cancel_event also returns None. In a lost position
+    (every move scores -inf) a legal move is still returned. Pass a SearchLimits to
+    count the nodes searched; in the iterative path its budget is the one
+    enforced. Pass a SearchStats to have it filled in with the search's
+    counters, depth, score, principal variation and time (the parallel search
+    reports only depth, score, time and the root move). With an OpeningBook,
+    positions found in the book are answered from it without searching. With
+    an EndgameTablebase, positions it covers are played from the table and
+    the search scores covered positions below the root from it too. An
+    evaluator (BatchEvaluator) changes how leaves are scored; the parallel
+    search does not use it. With allow_multi_jump a capture is returned as a
+    CaptureSequence, which unpacks to its first hop. resume is passed on to
+    iterative_deepening, so only time-limited searches use it. quiescence=False
+    evaluates the horizon statically (not in the parallel search).
+    """
+    if stats is not None:
+        stats.start()
+    known_move = None
+    if book is not None:
+        known_move = book.choose(board, player_color, allow_multi_jump)
+    if known_move is None and tablebase is not None and not allow_multi_jump:
+        known_move = tablebase.best_move(board, player_color)
+    if known_move is not None:
+        if stats is not None:
+            stats.stop()
+            stats.pv = [((known_move[0].row, known_move[0].col), known_move[1])]
+        return known_move
+    if workers is not None and workers > 1 and time_limit_ms is None:
+        from src.game.parallel import get_parallel_searcher
+        score, best_move = get_parallel_searcher(workers).search(board, player_color, depth, allow_multi_jump)
+    elif time_limit_ms is None:
+        if limits is None and cancel_event is not None:
+            limits = SearchLimits(cancel_event=cancel_event)
+        try:
+            score, best_move = minimax_with_alpha_beta(board, depth, True, player_color, -float('inf'), float('inf'), allow_multi_jump, tt, 0, limits, MoveOrderer(), stats, tablebase, evaluator, quiescence)
+        except SearchTimeout:
+            if stats is not None:
+                stats.stop()
+            return None
+    else:
+        score, best_move, depth = iterative_deepening(board, player_color, time_limit_ms=time_limit_ms, allow_multi_jump=allow_multi_jump, tt=tt, cancel_event=cancel_event, limits=limits, stats=stats, tablebase=tablebase, evaluator=evaluator, resume=resume, quiescence=quiescence)
+    if best_move is None:
+        # Every move loses (score -inf): play one anyway, as iterative_deepening does, rather than pass the turn
+        search_moves = get_search_moves(board, player_color, allow_multi_jump)
+        if search_moves:
+            best_move = search_moves[0]
+    if stats is not None:
+        stats.stop()
+        stats.depth, stats.score = depth, score
+        stats.pv = []
+        if best_move is not None:
+            root_move = ((best_move[0].row, best_move[0].col), (best_move[1][0], best_move[1][1]))
+            if tt is not None:
+                stats.pv = principal_variation(board, player_color, tt, allow_multi_jump, depth)
+            if not stats.pv or stats.pv[0] != root_move:
+                stats.pv = [root_move]
+    return best_move
+
+def apply_ai_move(board: Board, move: Optional[Tuple[Tuple[int, int], Tuple[int, int]]], allow_multi_jump: bool = False) -> Optional[MoveRecord]:
+    """Play a move given as ((from_row, from_col), (to_row, to_col)). Returns its MoveRecord, or None for no move."""
+    if move is None:
+        return None
+    (from_row, from_col), (new_row, new_col) = move
+    piece = board.get_piece(from_row, from_col)
+    return execute_move(board, piece, new_row, new_col, allow_multi_jump)
+
+def make_ai_move(board: Board, player_color: str, depth: int = 3, allow_multi_jump: bool = False, tt: Optional[TranspositionTable] = None, time_limit_ms: Optional[float] = None, workers: Optional[int] = None, stats: Optional[SearchStats] = None, book: Optional["OpeningBook"] = None, tablebase: Optional["EndgameTablebase"] = None, evaluator: Optional["BatchEvaluator"] = None) -> Optional[MoveRecord]:
+    """Make the AI's move using minimax with alpha-beta pruning. Returns its MoveRecord, or None when there is no move.
+
+    See choose_ai_move for the search options; a SearchStats passed as stats
+    describes the search afterwards, and book and tablebase moves are played
+    without a search.
+    """
+    best_move = choose_ai_move(board, player_color, depth, allow_multi_jump, tt, time_limit_ms, workers, stats=stats, book=book, tablebase=tablebase, evaluator=evaluator)
     if best_move:
         piece, (new_row, new_col) = best_move
-        is_capture, can_jump_again, _, bonus_move_triggered = execute_move(board, piece, new_row, new_col, allow_multi_jump)
-        return True, bonus_move_triggered
-    return False, False
+        return apply_ai_move(board, ((piece.row, piece.col), (new_row, new_col)), allow_multi_jump)
+    return None
 
 def is_in_warp_zone(row: int, col: int) -> bool:
-    warp_zone_coords = [(4, 4), (4, 5), (5, 4), (5, 5)]
-    return (row, col) in warp_zone_coords
+    return (row, col) in WARP_SQUARES
@@ -0,0 +1,131 @@
+"""Opening book stored as a sorted file of fixed-size records, read through mmap.
+
+File layout (little-endian):
+
+    header  8-byte magic, uint32 version, uint32 record count
+    record  uint64 position key, uint8 from square, uint8 to square, uint16 weight
+
+Squares are row * 10 + col. Records are sorted by key (then by descending
+weight), so all moves for a position are adjacent and found by binary search
+without reading the rest of the file. Keys are position_key() values: the
+piece hash with the side to move and the multi-jump flag mixed in.
+"""
+import mmap
+import os
+import random
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.game.board import Board, Piece, get_valid_moves
+from src.game.transposition import position_key
+
+BOOK_MAGIC = b"CKRBOOK\0"
+BOOK_VERSION = 1
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<QBBH")
+MAX_WEIGHT = 0xFFFF
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def write_book(path: str, positions: Dict[int, Dict[Move, int]]):
+    """Write {position key: {move: weight}} as a book file, replacing path."""
+    records = sorted(
+        (key, -min(weight, MAX_WEIGHT), from_row * 10 + from_col, to_row * 10 + to_col)
+        for key, moves in positions.items()
+        for ((from_row, from_col), (to_row, to_col)), weight in moves.items()
+        if weight > 0
+    )
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(records)))
+        for key, negative_weight, from_square, to_square in records:
+            f.write(RECORD.pack(key, from_square, to_square, -negative_weight))
+    os.replace(temp_path, path)
+
+
+class OpeningBook:
+    """Read-only view of a book file; lookups touch only the pages they search."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+        if HEADER.size + self.count * RECORD.size > len(self._map):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _key_at(self, index: int) -> int:
+        return struct.unpack_from("<Q", self._map, HEADER.size + index * RECORD.size)[0]
+
+    def probe(self, key: int) -> List[Tuple[Move, int]]:
+        """All (move, weight) pairs stored for a position key, heaviest first."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        for index in range(low, self.count):
+            record_key, from_square, to_square, weight = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+            if record_key != key:
+                break
+            entries.append(((divmod(from_square, 10), divmod(to_square, 10)), weight))
+        return entries
+
+    def records(self) -> Iterable[Tuple[int, Move, int]]:
+        """Every (key, move, weight) in file order."""
+        for index in range(self.count):
+            key, from_square, to_square, weight = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+            yield key, (divmod(from_square, 10), divmod(to_square, 10)), weight
+
+    def choose(self, board: Board, player_color: str, allow_multi_jump: bool = False, rng: Optional[random.Random] = None) -> Optional[Tuple[Piece, Tuple[int, int]]]:
+        """The book move for this position as (piece, (row, col)), or None when out of book.
+
+        Without rng the heaviest move is played; with rng a move is drawn in
+        proportion to its weight. Moves that are not legal on board (a hash
+        collision) are ignored.
+        """
+        entries = [
+            (board.get_piece(*from_pos), to_pos, weight)
+            for (from_pos, to_pos), weight in self.probe(position_key(board, player_color, allow_multi_jump))
+        ]
+        entries = [
+            (piece, to_pos, weight) for piece, to_pos, weight in entries
+            if piece != 0 and piece.color == player_color and to_pos in get_valid_moves(board, piece.row, piece.col)
+        ]
+        if not entries:
+            return None
+        if rng is None:
+            piece, to_pos, _ = entries[0]
+        else:
+            piece, to_pos, _ = rng.choices(entries, weights=[weight for _, _, weight in entries])[0]
+        return piece, to_pos
+
+
+def load_book(path: str) -> Optional[OpeningBook]:
+    """Open the book at path, or return None if there is no book file."""
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
@@ -0,0 +1,72 @@
+"""Move ordering for the alpha-beta search.
+
+Moves are tried in this order: the transposition/PV move, captures (most
+valuable victim first, kings ahead of men), the killer moves of the current
+ply, then quiet moves by history score.
+"""
+from typing import Dict, List, Optional, Tuple
+
+MAX_PLY = 64
+KING_VALUE = 3
+MAN_VALUE = 1
+
+HASH_MOVE_SCORE = 1_000_000
+CAPTURE_SCORE = 100_000
+KILLER_SCORES = (50_000, 49_000)
+
+MoveKey = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def move_key(piece, move: Tuple[int, int]) -> MoveKey:
+    return (piece.row, piece.col), move
+
+
+class MoveOrderer:
+    """Killer and history tables shared by every node of a search."""
+
+    def __init__(self, max_ply: int = MAX_PLY):
+        self.max_ply = max_ply
+        self.clear()
+
+    def clear(self):
+        self.killers: List[List[Optional[MoveKey]]] = [[None, None] for _ in range(self.max_ply)]
+        self.history: Dict[Tuple[str, MoveKey], int] = {}
+
+    def age_history(self):
+        """Halve history scores so older searches weigh less than the current one."""
+        for key in self.history:
+            self.history[key] //= 2
+
+    def score(self, board, piece, move: Tuple[int, int], ply: int, hash_move: Optional[MoveKey]) -> int:
+        key = move_key(piece, move)
+        if key == hash_move:
+            return HASH_MOVE_SCORE
+        new_row, new_col = move
+        if abs(new_row - piece.row) == 2:
+            victim = board.get_piece((piece.row + new_row) // 2, (piece.col + new_col) // 2)
+            victim_value = KING_VALUE if victim and victim.king else MAN_VALUE
+            attacker_value = KING_VALUE if piece.king else MAN_VALUE
+            return CAPTURE_SCORE + victim_value * 10 - attacker_value
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if key == killers[0]:
+                return KILLER_SCORES[0]
+            if key == killers[1]:
+                return KILLER_SCORES[1]
+        return min(self.history.get((piece.color, key), 0), KILLER_SCORES[1] - 1)
+
+    def order(self, board, moves: list, ply: int, hash_move: Optional[MoveKey] = None) -> list:
+        return sorted(moves, key=lambda item: self.score(board, item[0], item[1], ply, hash_move), reverse=True)
+
+    def record_cutoff(self, piece, move: Tuple[int, int], ply: int, depth: int):
+        """Remember a quiet move that caused a beta cutoff."""
+        if abs(move[0] - piece.row) == 2:
+            return
+        key = move_key(piece, move)
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if killers[0] != key:
+                killers[1] = killers[0]
+                killers[0] = key
+        history_key = (piece.color, key)
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
@@ -0,0 +1,134 @@
+"""Parallel root search over a pool of persistent worker processes.
+
+Each root move is searched in its own job. Jobs carry the compact bitboard
+encoding of the position rather than pickled Board/Piece objects, and the
+best score found so far is shared through a multiprocessing.Value. A job
+plays its root move and searches the opponent's replies one by one,
+re-reading the shared value before each reply, so a better score found by
+another worker cuts short the jobs still running. A job that finds a new
+best score publishes it straight away.
+
+The move chosen is the same as the serial search at the same depth
+without a transposition table: minimax_with_alpha_beta with a fresh
+MoveOrderer and tt=None. Workers search without a table, since entries
+from deeper searches would change some scores; so a serial choose_ai_move
+given a tt can choose differently from the parallel one.
+"""
+import atexit
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional, Tuple
+
+from src.game.bitboard import decode_position, encode_position
+from src.game.board import Board, Piece, _negamax, _negamax_child, get_search_moves, minimax_with_alpha_beta, play_search_move, unmake_move
+from src.game.ordering import MoveOrderer
+
+_shared_alpha = None
+
+
+def _init_worker(shared_alpha):
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def _shared_bound() -> float:
+    # Just below the shared best: a move that only ties it still gets an exact
+    # score, so ties are broken by move order exactly as in the serial search.
+    return math.nextafter(_shared_alpha.value, -math.inf)
+
+
+def _search_root_move(position: Tuple[int, int, int], player_color: str, index: int, from_pos: Tuple[int, int], move: Tuple[int, int], depth: int, allow_multi_jump: bool) -> Tuple[int, float, float]:
+    """(index, score, alpha) for one root move; the score is exact when above alpha, the last shared bound it was searched against."""
+    board = decode_position(position)
+    piece = board.get_piece(*from_pos)
+    opponent = "white" if player_color == "black" else "black"
+    orderer = MoveOrderer()
+    alpha = _shared_bound()
+    undo_stack = play_search_move(board, piece, move)
+    try:
+        replies = get_search_moves(board, opponent, allow_multi_jump) if depth > 1 else []
+        if not replies:
+            # Nothing to split: the reply is a leaf, or there is none
+            reply_score, _ = _negamax(board, depth - 1, opponent, -math.inf, -alpha, allow_multi_jump, None, 1, None, orderer, None, None, None, True)
+            score = -reply_score
+        else:
+            best_reply = -math.inf
+            for reply_piece, reply in orderer.order(board, replies, 1):
+                alpha = max(alpha, _shared_bound())
+                if best_reply >= -alpha:
+                    break  # Refuted: this move cannot beat the shared best
+                best_reply = max(best_reply, _negamax_child(board, reply_piece, reply, depth - 1, opponent, best_reply, -alpha, allow_multi_jump, None, 1, None, orderer, None, None, None, True))
+            score = -best_reply
+    finally:
+        for undo in reversed(undo_stack):
+            unmake_move(board, undo)
+    if score > alpha:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    return index, score, alpha
+
+
+class ParallelSearcher:
+    """Persistent process pool that searches root moves in parallel."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._shared_alpha = multiprocessing.Value("d", -math.inf)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self._shared_alpha,))
+
+    def search(self, board: Board, player_color: str, depth: int, allow_multi_jump: bool = False) -> Tuple[float, Optional[Tuple[Piece, Tuple[int, int]]]]:
+        """Same result as the serial fixed-depth search; the move refers to pieces on board."""
+        valid_moves = get_search_moves(board, player_color, allow_multi_jump)
+        if not valid_moves:
+            return -math.inf, None
+        valid_moves = MoveOrderer().order(board, valid_moves, 0)
+        if len(valid_moves) == 1 or depth <= 0:
+            # Nothing to split between workers: search here, for the same score the serial search gives
+            score, move = minimax_with_alpha_beta(board, max(depth, 0), True, player_color, -math.inf, math.inf, allow_multi_jump, orderer=MoveOrderer())
+            return score, move or valid_moves[0]
+
+        position = encode_position(board)
+        with self._shared_alpha.get_lock():
+            self._shared_alpha.value = -math.inf
+        pending = {
+            self._executor.submit(_search_root_move, position, player_color, index, (piece.row, piece.col), move, depth, allow_multi_jump)
+            for index, (piece, move) in enumerate(valid_moves)
+        }
+        exact_scores = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, score, alpha = future.result()
+                if score > alpha:
+                    exact_scores[index] = score
+
+        best_index = None
+        for index in sorted(exact_scores):
+            if best_index is None or exact_scores[index] > exact_scores[best_index]:
+                best_index = index
+        if best_index is None or exact_scores[best_index] == -math.inf:
+            return -math.inf, None
+        return exact_scores[best_index], valid_moves[best_index]
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+_searchers = {}
+
+
+def get_parallel_searcher(workers: Optional[int] = None) -> ParallelSearcher:
+    """Shared searcher per worker count, so the pool is started only once."""
+    workers = workers or os.cpu_count() or 1
+    if workers not in _searchers:
+        _searchers[workers] = ParallelSearcher(workers)
+    return _searchers[workers]
+
+
+@atexit.register
+def _shutdown_searchers():
+    for searcher in _searchers.values():
+        searcher.shutdown()
@@ -0,0 +1,83 @@
+"""Compact text format for a position, in the style of draughts FEN.
+
+    W:W31,32,K45:B1,2,K10
+    B:W31,32:B19,K23:M
+
+The first field is the side to move, W or B. Then come the white and the
+black pieces as comma-separated square numbers, a K in front of a king. An
+optional last field M means multi-jumps are active for the side to move.
+Fields may come in any order after the side to move, and spaces are ignored.
+A man on its own promotion row (white on row 0, black on row 9) would
+already have been crowned, so it is rejected; give it as a king.
+
+Squares are the 50 dark squares numbered 1 to 50 row by row from the top,
+Black's side: square 1 is (0, 1), square 5 is (0, 9), square 6 is (1, 0),
+square 50 is (9, 8).
+"""
+from typing import List, Tuple
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, Piece
+from src.game.tables import BOARD_SIZE, PROMOTION_ROW
+
+SQUARES: List[Tuple[int, int]] = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE) if (row + col) % 2 != 0]
+SQUARE_NUMBER = {square: number for number, square in enumerate(SQUARES, start=1)}
+COLOR_CODES = {"W": "white", "B": "black"}
+
+
+def square_number(row: int, col: int) -> int:
+    return SQUARE_NUMBER[(row, col)]
+
+
+def square_at(number: int) -> Tuple[int, int]:
+    if not 1 <= number <= len(SQUARES):
+        raise ValueError(f"Square {number} is not between 1 and {len(SQUARES)}")
+    return SQUARES[number - 1]
+
+
+def move_notation(path: List[Tuple[int, int]], capture: bool) -> str:
+    """Square numbers joined with x for a capture and - for a simple move, e.g. "32-28" or "28x19x10"."""
+    return ("x" if capture else "-").join(str(square_number(row, col)) for row, col in path)
+
+
+def format_position(board: Board, color_to_move: str, allow_multi_jump: bool = False) -> str:
+    fields = ["W" if color_to_move == "white" else "B"]
+    for code, color in COLOR_CODES.items():
+        pieces = [board.get_piece(row, col) for row, col in SQUARES]
+        fields.append(code + ",".join(
+            ("K" if piece.king else "") + str(square_number(piece.row, piece.col))
+            for piece in pieces if piece != 0 and piece.color == color))
+    if allow_multi_jump:
+        fields.append("M")
+    return ":".join(fields)
+
+
+def parse_position(text: str, board_class=BitBoard) -> Tuple[Board, str, bool]:
+    """(board, color_to_move, allow_multi_jump) from the text format. Raises ValueError on bad input."""
+    fields = text.replace(" ", "").strip().split(":")
+    if fields[0].upper() not in COLOR_CODES:
+        raise ValueError(f"Position must start with the side to move, W or B: {text!r}")
+    color_to_move = COLOR_CODES[fields[0].upper()]
+    allow_multi_jump = False
+    pieces = []
+    occupied = set()
+    for field in fields[1:]:
+        code = field[:1].upper()
+        if field.upper() == "M":
+            allow_multi_jump = True
+            continue
+        if code not in COLOR_CODES:
+            raise ValueError(f"Unknown field {field!r} in {text!r}")
+        for item in filter(None, field[1:].split(",")):
+            king = item[:1].upper() == "K"
+            number = item[1:] if king else item
+            if not number.isdigit():
+                raise ValueError(f"Bad square {item!r} in {text!r}")
+            row, col = square_at(int(number))
+            if (row, col) in occupied:
+                raise ValueError(f"Square {number} is given twice in {text!r}")
+            if not king and row == PROMOTION_ROW[COLOR_CODES[code]]:
+                raise ValueError(f"A {COLOR_CODES[code]} man cannot stand on its promotion row, square {number}, in {text!r}")
+            occupied.add((row, col))
+            pieces.append(Piece(row, col, COLOR_CODES[code], king))
+    return board_class.from_pieces(pieces), color_to_move, allow_multi_jump
@@ -0,0 +1,440 @@
+"""Asyncio game server hosting many concurrent games against the AI.
+
+Clients talk to the server over localhost TCP or a Unix socket, one JSON
+object per line each way. Requests on one connection are answered in order;
+open one connection per concurrent client. Every request may carry an "id",
+which is echoed in the reply.
+
+    {"op": "new", "human": "white", "depth": 3, "time_ms": null, "budget_ms": null, "seed": null, "max_plies": 300}
+    {"op": "move", "session": "1", "from": [6, 1], "to": [5, 0]}
+    {"op": "ai", "session": "1"}
+    {"op": "state", "session": "1"}
+    {"op": "close", "session": "1"}
+    {"op": "stats", "reset": false}
+
+Replies are {"ok": true, ...} or {"ok": false, "error": "..."}. Each session
+is a GameState with the human playing one colour. "close" waits for a
+request in progress on the session; requests queued behind it then find
+the session gone. "move" plays the human
+move and then the AI's turn, and replies with both moves and the new state;
+"new" does the same when the AI has the first move. "ai" plays the AI turn
+of a session that is waiting on it.
+
+AI searches run in a shared pool of worker processes, fed the compact
+bitboard encoding of the position. Each worker's transposition table holds
+one session's entries at a time: it is cleared when the worker takes a
+search for a different session, so no game's moves depend on another's
+searches. The number of searches running or queued
+is bounded: when workers + max_queue searches are already pending, a request
+that would start one is refused with the error "busy" before the human move
+is played, so the client can retry it unchanged.
+
+A session searches to a fixed depth, or for time_ms per move (capped by the
+server's max_time_ms). With budget_ms the session also has a clock for the
+whole game: each search is limited to the time left on it, and once it has
+run out the AI's turns pass as when the game clock expires.
+"""
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.game.bitboard import decode_position, encode_position
+from src.game.board import MoveRecord, SearchLimits, choose_ai_move, is_valid_move
+from src.game.book import OpeningBook, load_book
+from src.game.state import GameState
+from src.game.tablebase import EndgameTablebase, load_tablebase
+from src.game.tables import BOARD_SIZE
+from src.game.transposition import TranspositionTable
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_PLIES = 300
+MAX_DEPTH = 6
+METRICS_WINDOW = 10000  # Latest samples kept for the percentiles in "stats"
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+_worker_tt: Optional[TranspositionTable] = None
+_worker_tt_session: Optional[str] = None  # The session whose entries _worker_tt holds
+_worker_book: Optional[OpeningBook] = None
+_worker_tablebase: Optional[EndgameTablebase] = None
+
+
+def _init_worker(tt_mb: float, book_path: Optional[str], tablebase_path: Optional[str]):
+    global _worker_tt, _worker_book, _worker_tablebase
+    _worker_tt = TranspositionTable(tt_mb)
+    _worker_book = load_book(book_path) if book_path else None
+    _worker_tablebase = load_tablebase(tablebase_path) if tablebase_path else None
+
+
+def _search_job(session_id: str, position: Tuple[int, int, int], player_color: str, depth: int, allow_multi_jump: bool, time_limit_ms: Optional[float]) -> Tuple[Optional[Move], int, float]:
+    """(move, nodes, search ms) for one AI turn of a session, run in a worker process."""
+    global _worker_tt_session
+    if session_id != _worker_tt_session:
+        _worker_tt.clear()
+        _worker_tt_session = session_id
+    board = decode_position(position)
+    limits = SearchLimits(time_limit_ms)
+    best_move = choose_ai_move(board, player_color, depth, allow_multi_jump, _worker_tt, time_limit_ms, limits=limits, book=_worker_book, tablebase=_worker_tablebase)
+    move = None if best_move is None else ((best_move[0].row, best_move[0].col), (best_move[1][0], best_move[1][1]))
+    return move, limits.nodes, limits.elapsed_ms()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile, 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _summary(values: Deque[float]) -> Dict[str, float]:
+    values = list(values)
+    return {f"p{pct}": round(percentile(values, pct), 3) for pct in (50, 95, 99)}
+
+
+class RequestError(Exception):
+    """A request that cannot be served; the message is sent back as the error."""
+
+
+class ServerBusy(RequestError):
+    def __init__(self):
+        super().__init__("busy")
+
+
+class Session:
+    def __init__(self, session_id: str, state: GameState, depth: int, time_ms: Optional[float], budget_ms: Optional[float]):
+        self.id = session_id
+        self.state = state
+        self.depth = depth
+        self.time_ms = time_ms
+        self.budget_ms = budget_ms  # Time left on the game clock, or None without one
+        self.lock = asyncio.Lock()
+        self.closed = False
+        self.last_used = time.monotonic()
+
+    @property
+    def ai_to_move(self) -> bool:
+        return self.state.result() is None and self.state.current_turn not in self.state.human_colors
+
+    def search_limit_ms(self) -> Optional[float]:
+        if self.budget_ms is None:
+            return self.time_ms
+        return self.budget_ms if self.time_ms is None else min(self.time_ms, self.budget_ms)
+
+
+class ServerMetrics:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.searches = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.nodes = 0
+        self.max_queued = 0
+        self.queue_wait_ms: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.search_ms: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def as_dict(self) -> Dict:
+        return {
+            "searches": self.searches,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "nodes": self.nodes,
+            "max_queued": self.max_queued,
+            "queue_wait_ms": _summary(self.queue_wait_ms),
+            "search_ms": _summary(self.search_ms),
+        }
+
+
+def _is_int(value) -> bool:
+    """JSON integers only: true and false decode to bools, which are ints in Python."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _square(value) -> Tuple[int, int]:
+    if not (isinstance(value, list) and len(value) == 2 and all(_is_int(v) for v in value)):
+        raise RequestError(f"Expected a square as [row, col], got {value!r}")
+    return value[0], value[1]
+
+
+def record_to_json(record: MoveRecord) -> Dict:
+    return {
+        "from": list(record.from_pos),
+        "to": list(record.to_pos),
+        "captured": [list(square) for square in record.captured],
+        "promoted": record.promoted,
+        "bonus_move": record.bonus_move,
+    }
+
+
+def board_to_rows(state: GameState) -> List[str]:
+    """The board as ten strings: w/b for men, W/B for kings, . for empty squares."""
+    rows = []
+    for row in range(BOARD_SIZE):
+        cells = []
+        for col in range(BOARD_SIZE):
+            piece = state.board.get_piece(row, col)
+            cells.append("." if piece == 0 else (piece.color[0].upper() if piece.king else piece.color[0]))
+        rows.append("".join(cells))
+    return rows
+
+
+class GameServer:
+    """Sessions, the AI worker pool and the JSON-lines protocol handler.
+
+    handle_request() serves one decoded request and can be called directly;
+    start() listens on TCP or, with unix_path, on a Unix socket.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None, max_sessions: int = 10000, max_time_ms: float = 1000, idle_timeout: float = 600, tt_mb: float = 4, book_path: Optional[str] = None, tablebase_path: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self.max_sessions = max_sessions
+        self.max_time_ms = max_time_ms
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[str, Session] = {}
+        self.metrics = ServerMetrics()
+        self.pending = 0  # Searches submitted and not yet finished, running or queued
+        self._ids = itertools.count(1)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(tt_mb, book_path, tablebase_path))
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._reaper = asyncio.create_task(self._expire_idle_sessions())
+        return self._server
+
+    async def close(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(cancel_futures=True)
+
+    async def _expire_idle_sessions(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id in [s.id for s in self.sessions.values() if s.last_used < cutoff and not s.lock.locked()]:
+                self.sessions.pop(session_id).closed = True
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    reply = {"ok": False, "error": "Expected one JSON object per line"}
+                else:
+                    reply = await self.handle_request(request)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                # Waits while the client is not reading its replies
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # CancelledError: the server is shutting down with the client still connected
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request: Dict) -> Dict:
+        op = request.get("op")
+        handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+        try:
+            if handler is None:
+                raise RequestError(f"Unknown op {op!r}")
+            reply = await handler(request)
+        except RequestError as e:
+            if isinstance(e, ServerBusy):
+                self.metrics.rejected += 1
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # A bug in one request must not drop the connection and the client's other requests with it
+            self.metrics.errors += 1
+            reply = {"ok": False, "error": f"Internal error: {type(e).__name__}: {e}"}
+        else:
+            reply = {"ok": True, **reply}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    def _session(self, request: Dict) -> Session:
+        session = self.sessions.get(str(request.get("session")))
+        if session is None:
+            raise RequestError(f"No session {request.get('session')!r}")
+        session.last_used = time.monotonic()
+        return session
+
+    @staticmethod
+    def _check_open(session: Session):
+        """For a request that waited on the session lock while the session was closed."""
+        if session.closed:
+            raise RequestError(f"No session {session.id!r}")
+
+    def _admit(self):
+        """Refuse work that would start a search once the pool and its queue are full."""
+        if self.pending >= self.workers + self.max_queue:
+            raise ServerBusy()
+
+    def state_json(self, session: Session) -> Dict:
+        state = session.state
+        return {
+            "turn": state.current_turn,
+            "result": state.result(),
+            "plies": state.plies,
+            "board": board_to_rows(state),
+            "legal_moves": [[[piece.row, piece.col], list(move)] for piece, move in state.legal_moves()],
+            "multi_jump": state.multi_jump_active,
+            "bonus_move": state.bonus_move_active,
+            "budget_ms": None if session.budget_ms is None else round(session.budget_ms, 3),
+        }
+
+    async def _search(self, session: Session) -> Optional[Move]:
+        state = session.state
+        self.pending += 1
+        self.metrics.max_queued = max(self.metrics.max_queued, self.pending - self.workers)
+        submitted = time.perf_counter()
+        try:
+            move, nodes, search_ms = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _search_job, session.id, encode_position(state.board), state.current_turn,
+                session.depth, state.search_allows_multi_jump, session.search_limit_ms())
+        finally:
+            self.pending -= 1
+        self.metrics.searches += 1
+        self.metrics.nodes += nodes
+        self.metrics.search_ms.append(search_ms)
+        self.metrics.queue_wait_ms.append(max(0.0, (time.perf_counter() - submitted) * 1000 - search_ms))
+        if session.budget_ms is not None:
+            session.budget_ms = max(0.0, session.budget_ms - search_ms)
+        return move
+
+    async def _play_ai_turns(self, session: Session) -> List[Dict]:
+        """Play until it is the human's turn or the game is over."""
+        state = session.state
+        moves = []
+        while session.ai_to_move:
+            if session.budget_ms is not None and session.budget_ms <= 0:
+                self.metrics.timeouts += 1
+                state.timeout()
+                moves.append({"timeout": True})
+                continue
+            move = await self._search(session)
+            if move is None:
+                state.timeout()
+                moves.append({"timeout": True})
+                continue
+            (from_row, from_col), (new_row, new_col) = move
+            record = state.apply(state.board.get_piece(from_row, from_col), new_row, new_col)
+            moves.append(record_to_json(record))
+        return moves
+
+    async def _op_new(self, request: Dict) -> Dict:
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError("Too many sessions")
+        human = request.get("human", "white")
+        if human not in ("white", "black"):
+            raise RequestError("human must be 'white' or 'black'")
+        depth = request.get("depth", 3)
+        if not _is_int(depth) or not 1 <= depth <= MAX_DEPTH:
+            raise RequestError(f"depth must be an integer from 1 to {MAX_DEPTH}")
+        time_ms = request.get("time_ms")
+        budget_ms = request.get("budget_ms")
+        for name, value in (("time_ms", time_ms), ("budget_ms", budget_ms)):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0):
+                raise RequestError(f"{name} must be a positive number")
+        if time_ms is not None:
+            time_ms = min(time_ms, self.max_time_ms)
+        seed = request.get("seed")
+        if seed is not None and not isinstance(seed, (int, str)):
+            raise RequestError("seed must be an integer or a string")
+        max_plies = request.get("max_plies", DEFAULT_MAX_PLIES)
+        if not _is_int(max_plies) or max_plies < 1:
+            raise RequestError("max_plies must be a positive integer")
+        if human == "black":
+            # White, the AI, moves first
+            self._admit()
+        state = GameState(rng=random.Random(seed), human_colors=(human,), max_plies=max_plies)
+        session = Session(str(next(self._ids)), state, depth, time_ms, budget_ms)
+        self.sessions[session.id] = session
+        async with session.lock:
+            ai_moves = await self._play_ai_turns(session)
+            return {"session": session.id, "ai_moves": ai_moves, "state": self.state_json(session)}
+
+    async def _op_move(self, request: Dict) -> Dict:
+        session = self._session(request)
+        from_row, from_col = _square(request.get("from"))
+        new_row, new_col = _square(request.get("to"))
+        async with session.lock:
+            self._check_open(session)
+            state = session.state
+            if state.result() is not None:
+                raise RequestError("The game is over")
+            if state.current_turn not in state.human_colors:
+                raise RequestError("It is the AI's turn")
+            piece = state.board.get_piece(from_row, from_col)
+            if piece == 0:
+                raise RequestError(f"No piece on ({from_row}, {from_col})")
+            if not is_valid_move(state.board, piece, new_row, new_col, state.current_turn):
+                raise RequestError(f"Illegal move ({from_row}, {from_col}) -> ({new_row}, {new_col})")
+            # Decided before the move is played, so a refused request leaves the game unchanged
+            self._admit()
+            try:
+                record = state.apply(piece, new_row, new_col)
+            except ValueError as e:
+                raise RequestError(str(e))
+            ai_moves = await self._play_ai_turns(session)
+            return {"move": record_to_json(record), "ai_moves": ai_moves, "state": self.state_json(session)}
+
+    async def _op_ai(self, request: Dict) -> Dict:
+        session = self._session(request)
+        async with session.lock:
+            self._check_open(session)
+            if session.ai_to_move:
+                self._admit()
+            ai_moves = await self._play_ai_turns(session)
+            return {"ai_moves": ai_moves, "state": self.state_json(session)}
+
+    async def _op_state(self, request: Dict) -> Dict:
+        session = self._session(request)
+        return {"state": self.state_json(session)}
+
+    async def _op_close(self, request: Dict) -> Dict:
+        session = self._session(request)
+        # A search in progress finishes its turn first rather than playing on a dropped session
+        async with session.lock:
+            self._check_open(session)
+            session.closed = True
+            del self.sessions[session.id]
+        return {}
+
+    async def _op_stats(self, request: Dict) -> Dict:
+        stats = {
+            "sessions": len(self.sessions),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            **self.metrics.as_dict(),
+        }
+        if request.get("reset"):
+            self.metrics.reset()
+        return {"stats": stats}
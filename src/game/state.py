@@ -0,0 +1,126 @@
+"""Pygame-free game rules, shared by the window and the headless tools.
+
+main() plays its games through GameState, as do tools/simulate.py,
+tools/arena.py and the server, so all of them follow the same rules:
+- a one-time multi-jump per side, rolled at the start of each turn;
+- warp-square bonus moves;
+- continuing after a capture while multi-jump is active;
+- the win/draw checks.
+
+Colours listed in human_colors are played as the GUI's human (White), the
+others as its AI (Black):
+
+- Human: a bonus move must be made with the piece that landed on the warp
+  square, and it may trigger a further bonus. The human keeps moving after a
+  capture if the capturing piece can capture again.
+- AI: the single bonus move may use any piece, without multi-jump. The AI
+  keeps moving after a capture if any of its pieces can capture.
+
+Timers are not modelled; call timeout() when the turn clock expires, as
+the GUI does.
+"""
+import random
+from typing import List, Optional, Tuple
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, MoveRecord, Piece, execute_move, get_all_valid_moves_for_player, get_valid_moves
+
+MULTI_JUMP_CHANCE = 0.1
+
+
+def opponent_of(color: str) -> str:
+    return "black" if color == "white" else "white"
+
+
+class GameState:
+    def __init__(self, board: Optional[Board] = None, rng: Optional[random.Random] = None, human_colors: Tuple[str, ...] = (), max_plies: Optional[int] = None):
+        self.board = board if board is not None else BitBoard()
+        self.rng = rng if rng is not None else random.Random()
+        self.human_colors = frozenset(human_colors)
+        self.max_plies = max_plies
+        self.current_turn = "white"
+        self.plies = 0
+        self.moves_without_capture = 0
+        self.bonus_move_active = False
+        self.last_moved_piece_pos: Optional[Tuple[int, int]] = None
+        self.multi_jump_used = {"white": False, "black": False}
+        self.multi_jump_active = False
+        self._start_turn()
+
+    def _start_turn(self):
+        if not self.multi_jump_used[self.current_turn] and self.rng.random() < MULTI_JUMP_CHANCE:
+            self.multi_jump_active = True
+            self.multi_jump_used[self.current_turn] = True
+
+    def _end_turn(self):
+        self.current_turn = opponent_of(self.current_turn)
+        self.bonus_move_active = False
+        self.last_moved_piece_pos = None
+        self.multi_jump_active = False
+        self._start_turn()
+
+    @property
+    def search_allows_multi_jump(self) -> bool:
+        """The allow_multi_jump flag the next move is played (and searched) with."""
+        if self.bonus_move_active and self.current_turn not in self.human_colors:
+            return False
+        return self.multi_jump_active
+
+    def legal_moves(self) -> List[Tuple[Piece, Tuple[int, int]]]:
+        moves = get_all_valid_moves_for_player(self.board, self.current_turn)
+        if self.bonus_move_active and self.current_turn in self.human_colors:
+            moves = [(piece, move) for piece, move in moves if (piece.row, piece.col) == self.last_moved_piece_pos]
+        return moves
+
+    def apply(self, piece: Piece, new_row: int, new_col: int) -> MoveRecord:
+        """Play a move for the side to move. Returns execute_move's MoveRecord."""
+        if piece == 0 or piece.color != self.current_turn:
+            raise ValueError(f"It is {self.current_turn}'s turn")
+        if self.bonus_move_active and piece.color in self.human_colors and (piece.row, piece.col) != self.last_moved_piece_pos:
+            raise ValueError("The bonus move must be made with the piece on the warp square")
+        if (new_row, new_col) not in get_valid_moves(self.board, piece.row, piece.col):
+            raise ValueError(f"Illegal move ({piece.row}, {piece.col}) -> ({new_row}, {new_col})")
+
+        human = piece.color in self.human_colors
+        ai_bonus_move = self.bonus_move_active and not human
+        record = execute_move(self.board, piece, new_row, new_col, self.search_allows_multi_jump)
+        self.plies += 1
+        if ai_bonus_move:
+            self._end_turn()
+            return record
+        if record.is_capture:
+            self.moves_without_capture = 0
+            if self.multi_jump_active:
+                if human:
+                    jump_again = record.can_jump_again
+                else:
+                    jump_again = self.board.has_captures(piece.color)
+                if jump_again:
+                    return record
+        else:
+            self.moves_without_capture += 1
+        if record.bonus_move:
+            self.bonus_move_active = True
+            self.last_moved_piece_pos = record.to_pos
+            return record
+        self._end_turn()
+        return record
+
+    def timeout(self):
+        """The side to move ran out of time: the turn passes to the opponent."""
+        self._end_turn()
+
+    def result(self) -> Optional[str]:
+        """"white" or "black" for a win, "draw", or None while the game goes on."""
+        if self.board.material("white")[0] == 0:
+            return "black"
+        if self.board.material("black")[0] == 0:
+            return "white"
+        if not get_all_valid_moves_for_player(self.board, self.current_turn):
+            opponent = opponent_of(self.current_turn)
+            if not get_all_valid_moves_for_player(self.board, opponent):
+                return "draw"
+            return opponent
+        if self.max_plies is not None and self.plies >= self.max_plies:
+            return "draw"
+        return None
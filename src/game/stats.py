@@ -0,0 +1,103 @@
+"""Counters describing one AI search, for debugging bad or slow moves."""
+import time
+from typing import Dict, List, Optional, Tuple
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+class SearchStats:
+    """Filled in by the search when passed as stats=; all counters cover one search.
+
+    nodes_by_ply[p] counts the nodes visited p plies below the root. depth is
+    the last fully searched depth, seldepth the deepest ply reached.
+    multi_jump_extensions counts the hops after the first in the capture
+    sequences searched as single moves. quiescence_nodes counts the capture
+    nodes searched past the nominal depth and delta_prunes the captures the
+    quiescence search skipped as unable to change the result. pvs_researches
+    counts the moves searched again with the full window after beating the
+    null-window probe of principal variation search, and
+    aspiration_researches the root searches repeated after the score fell
+    outside the aspiration window. resumed_depth
+    is the depth taken over from pondering rather than searched again (0
+    without a ponder hit). pv is the principal variation as
+    ((from_row, from_col), (to_row, to_col)) moves, read back from the
+    transposition table after the search, so without a table it holds only
+    the root move.
+    """
+
+    def __init__(self):
+        self.nodes_by_ply: List[int] = []
+        self.leaf_evals = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.multi_jump_extensions = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.tablebase_hits = 0
+        self.quiescence_nodes = 0
+        self.delta_prunes = 0
+        self.pvs_researches = 0
+        self.aspiration_researches = 0
+        self.seldepth = 0
+        self.depth = 0
+        self.resumed_depth = 0
+        self.score: Optional[float] = None
+        self.pv: List[Move] = []
+        self.elapsed_ms = 0.0
+        self._start_time: Optional[float] = None
+
+    def start(self):
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        if self._start_time is not None:
+            self.elapsed_ms = (time.perf_counter() - self._start_time) * 1000
+
+    def visit(self, ply: int):
+        if ply >= len(self.nodes_by_ply):
+            self.nodes_by_ply.extend([0] * (ply + 1 - len(self.nodes_by_ply)))
+            self.seldepth = ply
+        self.nodes_by_ply[ply] += 1
+
+    @property
+    def nodes(self) -> int:
+        return sum(self.nodes_by_ply)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / (self.elapsed_ms / 1000) if self.elapsed_ms > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Share of cutoffs caused by the first move searched; a measure of move ordering."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "depth": self.depth,
+            "resumed_depth": self.resumed_depth,
+            "seldepth": self.seldepth,
+            "score": self.score,
+            "nodes": self.nodes,
+            "nodes_by_ply": list(self.nodes_by_ply),
+            "leaf_evals": self.leaf_evals,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate, 3),
+            "multi_jump_extensions": self.multi_jump_extensions,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "tablebase_hits": self.tablebase_hits,
+            "quiescence_nodes": self.quiescence_nodes,
+            "delta_prunes": self.delta_prunes,
+            "pvs_researches": self.pvs_researches,
+            "aspiration_researches": self.aspiration_researches,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "nodes_per_second": round(self.nodes_per_second),
+            "pv": [list(map(list, move)) for move in self.pv],
+        }
+
+    def __str__(self) -> str:
+        pv = " ".join(f"{fr}{fc}-{tr}{tc}" for (fr, fc), (tr, tc) in self.pv)
+        return (f"depth {self.depth}/{self.seldepth} score {self.score} nodes {self.nodes} "
+                f"({self.nodes_per_second:.0f}/s, {self.elapsed_ms:.0f} ms) cutoffs {self.cutoffs} "
+                f"({self.first_move_cutoff_rate:.0%} first) tt hits {self.tt_hits} pv {pv}")
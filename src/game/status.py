@@ -0,0 +1,78 @@
+"""Game-status queries cached per position, for the frame loop.
+
+The game loop asks the same questions every frame (how many pieces each
+side has, which moves are legal, whether the game is over) while the board
+changes only a few times per turn. StatusCache answers them from the board
+the first time and keeps the answers until board.version changes, so idle
+frames do no move generation or board scans.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import Board, Piece, get_all_valid_moves_for_player, get_valid_moves
+
+
+class StatusCache:
+    """Cached piece counts, legal moves and result for one board.
+
+    Assigning a different board (e.g. after a reset) clears the cache like a
+    change of version does.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._key: Optional[Tuple[int, int]] = None
+        self._piece_counts: Dict[str, int] = {}
+        self._legal_moves: Dict[str, List[Tuple[Piece, Tuple[int, int]]]] = {}
+        self._moves_from: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self._results: Dict[str, Optional[str]] = {}
+
+    def _fresh(self):
+        key = (id(self.board), self.board.version)
+        if key != self._key:
+            self._key = key
+            self._piece_counts.clear()
+            self._legal_moves.clear()
+            self._moves_from.clear()
+            self._results.clear()
+
+    def piece_count(self, color: str) -> int:
+        self._fresh()
+        if color not in self._piece_counts:
+            self._piece_counts[color] = self.board.material(color)[0]
+        return self._piece_counts[color]
+
+    def legal_moves(self, color: str) -> List[Tuple[Piece, Tuple[int, int]]]:
+        """get_all_valid_moves_for_player for the current position; do not modify the list."""
+        self._fresh()
+        if color not in self._legal_moves:
+            self._legal_moves[color] = get_all_valid_moves_for_player(self.board, color)
+        return self._legal_moves[color]
+
+    def moves_from(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """get_valid_moves for the piece on (row, col) in the current position."""
+        self._fresh()
+        if (row, col) not in self._moves_from:
+            self._moves_from[(row, col)] = get_valid_moves(self.board, row, col)
+        return self._moves_from[(row, col)]
+
+    def result(self, color_to_move: str) -> Optional[str]:
+        """"white" or "black" for a win, "draw", or None while the game goes on.
+
+        A side with no pieces loses; a side to move with no moves loses unless
+        its opponent has none either, which is a draw.
+        """
+        self._fresh()
+        if color_to_move not in self._results:
+            opponent = "black" if color_to_move == "white" else "white"
+            if self.piece_count("white") == 0:
+                result = "black"
+            elif self.piece_count("black") == 0:
+                result = "white"
+            elif self.legal_moves(color_to_move):
+                result = None
+            elif self.legal_moves(opponent):
+                result = opponent
+            else:
+                result = "draw"
+            self._results[color_to_move] = result
+        return self._results[color_to_move]
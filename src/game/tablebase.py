@@ -0,0 +1,308 @@
+"""Endgame tablebase: solved win/loss/draw values for positions with few pieces.
+
+Every position with at most max_pieces pieces (at least one per side) is
+solved by retrograde analysis under the rules the search plays by: men move
+forward, kings both ways, captures are compulsory for the capturing piece,
+pieces on warp squares cannot be captured and men promote on the far row.
+Sides alternate every move (no multi-jump chains or warp bonus moves). A side
+with no moves loses, unless its opponent has no moves either, which is a draw.
+
+Each material signature (white men, white kings, black men, black kings) has
+its own table of 2 * 50**n one-byte values, indexed by the side to move and
+the dark squares (0-49) of the pieces in signature order, ascending within
+each group. A value of 0 is a draw (or an impossible placement), 1-127 a win
+in that many plies for the side to move, and 128 + n a loss in n plies.
+
+File layout (little-endian): header (magic, version, max_pieces, table
+count), one (wm, wk, bm, bk, offset) entry per table, then the tables. The
+file is opened with mmap, so a probe reads a single byte.
+"""
+import heapq
+import itertools
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.game.bitboard import BIT_SQUARE, PROMOTION_MASK, BitBoard, encode_position, iter_bits, play
+from src.game.board import Board, Piece
+
+TABLEBASE_MAGIC = b"CKRTBASE"
+TABLEBASE_VERSION = 1
+HEADER = struct.Struct("<8sIII")
+DIRECTORY_ENTRY = struct.Struct("<4BQ")
+
+DRAW = 0
+LOSS = 128
+MAX_DISTANCE = 127
+
+# Scores returned to the search; far above any evaluation, shorter wins score higher.
+TABLEBASE_WIN_SCORE = 1000
+
+SQUARES = 50
+DARK_BITS = sorted(BIT_SQUARE)
+SQUARE_INDEX = {bit: index for index, bit in enumerate(DARK_BITS)}
+
+Signature = Tuple[int, int, int, int]
+Position = Tuple[int, int, int]
+
+
+def signature_of(position: Position) -> Signature:
+    white, black, kings = position
+    return (
+        (white & ~kings).bit_count(), (white & kings).bit_count(),
+        (black & ~kings).bit_count(), (black & kings).bit_count(),
+    )
+
+
+def table_size(signature: Signature) -> int:
+    return 2 * SQUARES ** sum(signature)
+
+
+def position_index(position: Position, black_to_move: bool) -> int:
+    white, black, kings = position
+    index = int(black_to_move)
+    for group in (white & ~kings, white & kings, black & ~kings, black & kings):
+        for bit in iter_bits(group):
+            index = index * SQUARES + SQUARE_INDEX[bit]
+    return index
+
+
+def is_win(value: int) -> bool:
+    return 0 < value < LOSS
+
+
+def is_loss(value: int) -> bool:
+    return value >= LOSS
+
+
+def distance(value: int) -> int:
+    return value - LOSS if value >= LOSS else value
+
+
+def value_score(value: int) -> float:
+    """Search score of a stored value, from the side to move's point of view."""
+    if is_win(value):
+        return TABLEBASE_WIN_SCORE - value
+    if is_loss(value):
+        return -(TABLEBASE_WIN_SCORE - (value - LOSS))
+    return 0.0
+
+
+def _scratch_board(position: Position) -> BitBoard:
+    board = BitBoard.__new__(BitBoard)
+    board.white, board.black, board.kings = position
+    board._pieces = {}
+    return board
+
+
+def successors(position: Position, black_to_move: bool) -> List[Position]:
+    """The position after each legal move of the side to move."""
+    moves = _scratch_board(position).generate_moves("black" if black_to_move else "white")
+    return [play(position, black_to_move, from_bit, to_bit) for from_bit, to_bit in moves]
+
+
+def _placements(signature: Signature) -> Iterator[Position]:
+    """Every legal placement of a signature's pieces (men never stand on their promotion row)."""
+    wm, wk, bm, bk = signature
+    men_squares = {
+        "white": [bit for bit in DARK_BITS if not (1 << bit) & PROMOTION_MASK["white"]],
+        "black": [bit for bit in DARK_BITS if not (1 << bit) & PROMOTION_MASK["black"]],
+    }
+    groups = ((men_squares["white"], wm), (DARK_BITS, wk), (men_squares["black"], bm), (DARK_BITS, bk))
+
+    def place(group_index: int, used: int, chosen: List[int]):
+        if group_index == len(groups):
+            yield chosen
+            return
+        squares, count = groups[group_index]
+        for combination in itertools.combinations([bit for bit in squares if not (1 << bit) & used], count):
+            mask = sum(1 << bit for bit in combination)
+            yield from place(group_index + 1, used | mask, chosen + [mask])
+
+    for white_men, white_kings, black_men, black_kings in place(0, 0, []):
+        yield white_men | white_kings, black_men | black_kings, white_kings | black_kings
+
+
+def signatures(max_pieces: int) -> List[Signature]:
+    """All signatures up to max_pieces, in an order where every table only depends on earlier ones.
+
+    Captures lead to fewer pieces and promotions to fewer men, so tables are
+    sorted by piece count, then by number of men.
+    """
+    result = []
+    for wm, wk, bm, bk in itertools.product(range(max_pieces + 1), repeat=4):
+        if 2 <= wm + wk + bm + bk <= max_pieces and wm + wk > 0 and bm + bk > 0:
+            result.append((wm, wk, bm, bk))
+    result.sort(key=lambda signature: (sum(signature), signature[0] + signature[2], signature))
+    return result
+
+
+def solve_table(signature: Signature, solved: Dict[Signature, bytearray]) -> bytearray:
+    """Solve one signature, given the tables of every signature it can reach."""
+    table = bytearray(table_size(signature))
+    parents: Dict[int, List[int]] = {}
+    unresolved_children: Dict[int, int] = {}
+    longest_loss: Dict[int, int] = {}
+    has_draw = set()
+    can_win = set()
+    heap: List[Tuple[int, int, int]] = []
+
+    for position in _placements(signature):
+        for black_to_move in (False, True):
+            index = position_index(position, black_to_move)
+            children = successors(position, black_to_move)
+            if not children:
+                if successors(position, not black_to_move):
+                    heapq.heappush(heap, (0, index, LOSS))
+                continue
+            internal = 0
+            longest = 0
+            for child in children:
+                white, black, _ = child
+                if not (black if not black_to_move else white):
+                    heapq.heappush(heap, (1, index, 1))  # the opponent's last piece was captured
+                    can_win.add(index)
+                    continue
+                child_signature = signature_of(child)
+                child_index = position_index(child, not black_to_move)
+                if child_signature == signature:
+                    parents.setdefault(child_index, []).append(index)
+                    internal += 1
+                    continue
+                value = solved[child_signature][child_index]
+                if is_loss(value):
+                    heapq.heappush(heap, (distance(value) + 1, index, distance(value) + 1))
+                    can_win.add(index)
+                elif is_win(value):
+                    longest = max(longest, value + 1)
+                else:
+                    has_draw.add(index)
+            unresolved_children[index] = internal
+            longest_loss[index] = longest
+            if internal == 0 and index not in has_draw and index not in can_win:
+                heapq.heappush(heap, (longest, index, LOSS + longest))
+
+    done = set()
+    while heap:
+        dist, index, value = heapq.heappop(heap)
+        if index in done:
+            continue
+        done.add(index)
+        if dist > MAX_DISTANCE:
+            raise ValueError(f"distance {dist} in {signature} does not fit the value encoding")
+        table[index] = value
+        for parent in parents.get(index, ()):
+            if parent in done:
+                continue
+            if is_loss(value):
+                heapq.heappush(heap, (dist + 1, parent, dist + 1))
+                can_win.add(parent)
+            else:
+                unresolved_children[parent] -= 1
+                longest_loss[parent] = max(longest_loss[parent], dist + 1)
+                if unresolved_children[parent] == 0 and parent not in has_draw and parent not in can_win:
+                    heapq.heappush(heap, (longest_loss[parent], parent, LOSS + longest_loss[parent]))
+    return table
+
+
+def generate_tablebase(max_pieces: int, log=None) -> Dict[Signature, bytearray]:
+    solved: Dict[Signature, bytearray] = {}
+    for signature in signatures(max_pieces):
+        solved[signature] = solve_table(signature, solved)
+        if log is not None:
+            log(signature, solved[signature])
+    return solved
+
+
+def write_tablebase(path: str, max_pieces: int, tables: Dict[Signature, bytearray]):
+    order = signatures(max_pieces)
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(order)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(TABLEBASE_MAGIC, TABLEBASE_VERSION, max_pieces, len(order)))
+        for signature in order:
+            f.write(DIRECTORY_ENTRY.pack(*signature, offset))
+            offset += len(tables[signature])
+        for signature in order:
+            f.write(tables[signature])
+    os.replace(temp_path, path)
+
+
+class EndgameTablebase:
+    """Read-only, memory-mapped tablebase file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, count = HEADER.unpack_from(self._map, 0)
+        if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {TABLEBASE_VERSION} tablebase")
+        self._offsets: Dict[Signature, int] = {}
+        for entry in range(count):
+            wm, wk, bm, bk, offset = DIRECTORY_ENTRY.unpack_from(self._map, HEADER.size + entry * DIRECTORY_ENTRY.size)
+            self._offsets[(wm, wk, bm, bk)] = offset
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def covers(self, board: Board) -> bool:
+        """Cheap test, from the material counts, whether board can be in the tablebase."""
+        white = board.material("white")[0]
+        black = board.material("black")[0]
+        return white > 0 and black > 0 and white + black <= self.max_pieces
+
+    def probe_position(self, position: Position, black_to_move: bool) -> Optional[int]:
+        offset = self._offsets.get(signature_of(position))
+        if offset is None:
+            return None
+        return self._map[offset + position_index(position, black_to_move)]
+
+    def probe(self, board: Board, color_to_move: str) -> Optional[int]:
+        """Stored value for the side to move, or None when the position is not covered."""
+        if not self.covers(board):
+            return None
+        return self.probe_position(encode_position(board), color_to_move == "black")
+
+    def score(self, board: Board, color_to_move: str) -> Optional[float]:
+        """Search score for the side to move, or None when the position is not covered."""
+        value = self.probe(board, color_to_move)
+        return None if value is None else value_score(value)
+
+    def best_move(self, board: Board, color_to_move: str) -> Optional[Tuple[Piece, Tuple[int, int]]]:
+        """The move that wins fastest, draws, or loses slowest, or None when not covered."""
+        if not self.covers(board):
+            return None
+        position = encode_position(board)
+        black_to_move = color_to_move == "black"
+        best, best_score = None, None
+        for from_bit, to_bit in _scratch_board(position).generate_moves(color_to_move):
+            child = play(position, black_to_move, from_bit, to_bit)
+            opponent_pieces = child[0] if black_to_move else child[1]
+            if not opponent_pieces:
+                score = TABLEBASE_WIN_SCORE
+            else:
+                score = -value_score(self.probe_position(child, not black_to_move))
+            if best_score is None or score > best_score:
+                best, best_score = (from_bit, to_bit), score
+        if best is None:
+            return None
+        return board.get_piece(*BIT_SQUARE[best[0]]), BIT_SQUARE[best[1]]
+
+
+def load_tablebase(path: str) -> Optional[EndgameTablebase]:
+    """Open the tablebase at path, or return None if there is no file."""
+    if not os.path.exists(path):
+        return None
+    return EndgameTablebase(path)
@@ -0,0 +1,67 @@
+"""Lookup tables for move generation and evaluation, built once at import.
+
+Squares are indexed as row * BOARD_SIZE + col. Off-board neighbours and jumps
+are None, so callers never need a bounds check.
+"""
+from typing import Dict, List, Optional, Tuple
+
+BOARD_SIZE = 10
+
+Square = Tuple[int, int]
+Jump = Tuple[Square, Square]  # (square jumped over, landing square)
+
+ALL_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# Direction order matters: it is the order moves are generated in.
+DIRECTIONS: Dict[str, Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]] = {
+    # indexed by piece.king: (man directions, king directions)
+    "white": (((-1, -1), (-1, 1)), ALL_DIRECTIONS),
+    "black": (((1, -1), (1, 1)), ALL_DIRECTIONS),
+}
+
+WARP_SQUARES = frozenset([(4, 4), (4, 5), (5, 4), (5, 5)])
+
+PROMOTION_ROW = {"white": 0, "black": BOARD_SIZE - 1}
+
+
+# Positional evaluation terms per square (row * BOARD_SIZE + col), used with
+# non-zero EvalWeights. Advancement and back-row guard count for men only.
+ADVANCEMENT = {
+    "white": [BOARD_SIZE - 1 - square // BOARD_SIZE for square in range(BOARD_SIZE * BOARD_SIZE)],
+    "black": [square // BOARD_SIZE for square in range(BOARD_SIZE * BOARD_SIZE)],
+}
+CENTRE = [int(3 <= square // BOARD_SIZE <= 6 and 2 <= square % BOARD_SIZE <= 7) for square in range(BOARD_SIZE * BOARD_SIZE)]
+BACK_ROW = {
+    color: [int(square // BOARD_SIZE == PROMOTION_ROW["black" if color == "white" else "white"]) for square in range(BOARD_SIZE * BOARD_SIZE)]
+    for color in PROMOTION_ROW
+}
+
+
+def _on_board(row: int, col: int) -> bool:
+    return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
+
+
+def _neighbour(row: int, col: int, drow: int, dcol: int) -> Optional[Square]:
+    return (row + drow, col + dcol) if _on_board(row + drow, col + dcol) else None
+
+
+def _jump(row: int, col: int, drow: int, dcol: int) -> Optional[Jump]:
+    if not _on_board(row + 2 * drow, col + 2 * dcol):
+        return None
+    return (row + drow, col + dcol), (row + 2 * drow, col + 2 * dcol)
+
+
+def _build_move_table(directions) -> List[Tuple[Tuple[Optional[Square], Optional[Jump]], ...]]:
+    return [
+        tuple((_neighbour(row, col, drow, dcol), _jump(row, col, drow, dcol)) for drow, dcol in directions)
+        for row in range(BOARD_SIZE)
+        for col in range(BOARD_SIZE)
+    ]
+
+
+# MOVE_TABLE[color][king][square] -> ((step, jump), ...) in direction order; the
+# one table that decides whether a piece moves like a man or a king.
+MOVE_TABLE = {
+    color: tuple(_build_move_table(directions) for directions in by_king)
+    for color, by_king in DIRECTIONS.items()
+}
@@ -0,0 +1,113 @@
+"""Zobrist hashing and a fixed-size transposition table for the AI search."""
+import random
+from typing import Dict, Optional, Tuple
+
+BOARD_SQUARES = 100
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Approximate CPython footprint of one stored entry (tuple, key int and move tuples),
+# used to turn a memory cap into a bucket count.
+ENTRY_BYTES = 256
+
+# Fixed seed: keys must be identical across runs and processes so hashes can be
+# shared with worker processes and written to disk.
+_rng = random.Random(0x5EED_C4EC)
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(4)] for _ in range(BOARD_SQUARES)]
+BLACK_TO_MOVE_KEY = _rng.getrandbits(64)
+MULTI_JUMP_KEY = _rng.getrandbits(64)
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+Entry = Tuple[int, int, int, float, Optional[Move]]
+
+
+def piece_key(row: int, col: int, color: str, king: bool) -> int:
+    kind = (2 if color == "black" else 0) + (1 if king else 0)
+    return PIECE_KEYS[row * 10 + col][kind]
+
+
+def compute_zobrist(board) -> int:
+    """Hash of the pieces on a board, computed from scratch."""
+    key = 0
+    for row in range(10):
+        for col in range(10):
+            piece = board.get_piece(row, col)
+            if piece != 0:
+                key ^= piece_key(row, col, piece.color, piece.king)
+    return key
+
+
+def position_key(board, color_to_move: str, allow_multi_jump: bool = False) -> int:
+    """Hash of a search node: pieces, side to move and whether multi-jumps are active."""
+    key = board.zobrist
+    if color_to_move == "black":
+        key ^= BLACK_TO_MOVE_KEY
+    if allow_multi_jump:
+        key ^= MULTI_JUMP_KEY
+    return key
+
+
+class TranspositionTable:
+    """Two-slot bucket table: a depth-preferred slot and an always-replace slot.
+
+    Entries are (key, depth, bound, score, move) tuples where move is
+    ((from_row, from_col), (to_row, to_col)).
+    """
+
+    def __init__(self, size_mb: float = 16):
+        self.size_mb = size_mb
+        self.num_buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        self.clear()
+
+    def clear(self):
+        self.depth_slots = [None] * self.num_buckets
+        self.recent_slots = [None] * self.num_buckets
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        self.probes += 1
+        index = key % self.num_buckets
+        entry = self.depth_slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent_slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: float, move: Optional[Move]):
+        self.stores += 1
+        index = key % self.num_buckets
+        entry = (key, depth, bound, score, move)
+        current = self.depth_slots[index]
+        if current is None or current[0] == key or depth >= current[1]:
+            if current is not None and current[0] != key:
+                self.collisions += 1
+                self.recent_slots[index] = current
+            self.depth_slots[index] = entry
+        else:
+            current = self.recent_slots[index]
+            if current is not None and current[0] != key:
+                self.collisions += 1
+            self.recent_slots[index] = entry
+
+    def stats(self) -> Dict[str, float]:
+        used = sum(1 for entry in self.depth_slots if entry is not None)
+        used += sum(1 for entry in self.recent_slots if entry is not None)
+        return {
+            "size_mb": self.size_mb,
+            "entries": 2 * self.num_buckets,
+            "used": used,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "stores": self.stores,
+            "collisions": self.collisions,
+        }
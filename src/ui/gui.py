@@ -1,7 +1,8 @@
 import pygame
 from pygame.locals import *
-from typing import Tuple, Optional
-from src.game.board import Board, Piece, get_valid_moves, is_in_warp_zone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from src.game.board import Board, Piece, is_in_warp_zone
+from src.game.stats import SearchStats
 
 WINDOW_SIZE = 600
 SQUARE_SIZE = WINDOW_SIZE // 10
@@ -10,74 +11,109 @@ LIGHT_SQUARE = (255, 255, 255)
 DARK_SQUARE = (0, 0, 0)
 WARP_ZONE_COLOR = (0, 0, 255)  # Blue for warp zone
 WARP_ZONE_BORDER = (0, 0, 0)  # Black border for warp zone
+DEBUG_OVERLAY_BACKGROUND = (0, 0, 0, 180)
+DEBUG_OVERLAY_TEXT = (0, 255, 0)
+DEBUG_PV_MOVES = 8
+
+TEXT_CACHE_SIZE = 64
+MESSAGE_BACKGROUND = (255, 255, 0)
+HIGHLIGHT_COLOR = (0, 255, 0)
+
+def render_board_surface() -> pygame.Surface:
+    """The empty board, warp tiles included; drawn once and blitted every frame."""
+    surface = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
+    surface.fill(LIGHT_SQUARE)
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            if (row + col) % 2 != 0:
+                if is_in_warp_zone(row, col):
+                    # Draw warp zone tile (blue with black border)
+                    pygame.draw.rect(
+                        surface,
+                        WARP_ZONE_COLOR,
+                        (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
+                    )
+                    pygame.draw.rect(
+                        surface,
+                        WARP_ZONE_BORDER,
+                        (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
+                        2,  # Border thickness
+                    )
+                else:
+                    pygame.draw.rect(
+                        surface,
+                        DARK_SQUARE,
+                        (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
+                    )
+    return surface
+
+def render_piece_sprite(color: str, king: bool) -> pygame.Surface:
+    """One square-sized, transparent sprite per piece kind."""
+    sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    radius = SQUARE_SIZE // 2 - 10
+    center = (SQUARE_SIZE // 2, SQUARE_SIZE // 2)
+    pygame.draw.circle(sprite, (255, 255, 255) if color == "white" else (255, 0, 0), center, radius)
+    if king:
+        pygame.draw.circle(sprite, (255, 215, 0), center, radius // 2)
+    return sprite
+
+def square_rect(row: int, col: int) -> pygame.Rect:
+    return pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+
+def squares_under(rect: pygame.Rect) -> Set[Tuple[int, int]]:
+    """Board squares overlapped by a screen rect."""
+    rect = rect.clip(pygame.Rect(0, 0, WINDOW_SIZE, WINDOW_SIZE))
+    if rect.width == 0 or rect.height == 0:
+        return set()
+    return {
+        (row, col)
+        for row in range(rect.top // SQUARE_SIZE, (rect.bottom - 1) // SQUARE_SIZE + 1)
+        for col in range(rect.left // SQUARE_SIZE, (rect.right - 1) // SQUARE_SIZE + 1)
+    }
 
 class GUI:
     def __init__(self, screen: pygame.Surface, board: Board):
         self.screen = screen
         self.board = board
         self.font = pygame.font.SysFont("Arial", 24)
+        self.debug_font = pygame.font.SysFont("Arial", 14)
         self.animating_piece = None
         self.animation_start = None
         self.animation_end = None
         self.animation_progress = 0
         self.ANIMATION_DURATION = 500  # Animation duration in milliseconds
+        self.board_surface = render_board_surface()
+        self.piece_sprites = {(color, king): render_piece_sprite(color, king) for color in ("white", "black") for king in (False, True)}
+        self._text_cache: Dict[Tuple[int, str, Tuple[int, ...]], pygame.Surface] = {}
+        self._layer_cache: Dict[str, Tuple[object, pygame.Surface, pygame.Rect]] = {}
+        # What render() last put on screen, to redraw only what changed
+        self._drawn_squares: Dict[Tuple[int, int], tuple] = {}
+        self._drawn_layers: List[Tuple[int, Tuple[int, int, int, int]]] = []
+        self.full_redraw = True
 
-    def draw_board(self):
-        self.screen.fill(LIGHT_SQUARE)
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if (row + col) % 2 != 0:
-                    if is_in_warp_zone(row, col):
-                        # Draw warp zone tile (blue with black border)
-                        pygame.draw.rect(
-                            self.screen,
-                            WARP_ZONE_COLOR,
-                            (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
-                        )
-                        pygame.draw.rect(
-                            self.screen,
-                            WARP_ZONE_BORDER,
-                            (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
-                            2,  # Border thickness
-                        )
-                    else:
-                        pygame.draw.rect(
-                            self.screen,
-                            DARK_SQUARE,
-                            (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
-                        )
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                piece = self.board.get_piece(row, col)
-                if piece != 0 and (self.animating_piece is None or piece != self.animating_piece):
-                    self.draw_piece(piece)
-        if self.animating_piece:
-            self.draw_animating_piece()
-
-    def draw_piece(self, piece: Piece):
-        radius = SQUARE_SIZE // 2 - 10
-        x = piece.col * SQUARE_SIZE + SQUARE_SIZE // 2
-        y = piece.row * SQUARE_SIZE + SQUARE_SIZE // 2
-        color = (255, 255, 255) if piece.color == "white" else (255, 0, 0)
-        pygame.draw.circle(self.screen, color, (x, y), radius)
-        if piece.king:
-            pygame.draw.circle(self.screen, (255, 215, 0), (x, y), radius // 2)
-
-    def draw_animating_piece(self):
-        if not self.animating_piece:
-            return
-        radius = SQUARE_SIZE // 2 - 10
-        start_x = self.animation_start[1] * SQUARE_SIZE + SQUARE_SIZE // 2
-        start_y = self.animation_start[0] * SQUARE_SIZE + SQUARE_SIZE // 2
-        end_x = self.animation_end[1] * SQUARE_SIZE + SQUARE_SIZE // 2
-        end_y = self.animation_end[0] * SQUARE_SIZE + SQUARE_SIZE // 2
+    def invalidate(self):
+        """Redraw everything on the next render(), e.g. after the window was uncovered."""
+        self.full_redraw = True
+
+    def render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+        """font.render with a cache, so unchanged text is not rasterised every frame."""
+        key = (id(font), text, tuple(color))
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surface = self._text_cache[key] = font.render(text, True, color)
+        return surface
+
+    def _animation_rect(self) -> pygame.Rect:
+        start_x = self.animation_start[1] * SQUARE_SIZE
+        start_y = self.animation_start[0] * SQUARE_SIZE
+        end_x = self.animation_end[1] * SQUARE_SIZE
+        end_y = self.animation_end[0] * SQUARE_SIZE
         # Linear interpolation for smooth movement
         x = start_x + (end_x - start_x) * self.animation_progress
         y = start_y + (end_y - start_y) * self.animation_progress
-        color = (255, 255, 255) if self.animating_piece.color == "white" else (255, 0, 0)
-        pygame.draw.circle(self.screen, color, (x, y), radius)
-        if self.animating_piece.king:
-            pygame.draw.circle(self.screen, (255, 215, 0), (x, y), radius // 2)
+        return pygame.Rect(round(x), round(y), SQUARE_SIZE, SQUARE_SIZE)
 
     def start_animation(self, piece: Piece, start_pos: Tuple[int, int], end_pos: Tuple[int, int]):
         self.animating_piece = piece
@@ -95,29 +131,115 @@ class GUI:
             return False
         return True
 
-    def draw_message(self, message: str, color: Tuple[int, int, int] = (139, 0, 0)):
-        text = self.font.render(message, True, color)
-        text_rect = text.get_rect()
-        padding = 10
-        text_rect.topright = (WINDOW_SIZE - padding, padding)
-        background_rect = text_rect.inflate(padding * 2, padding * 2)
-        pygame.draw.rect(self.screen, (255, 255, 0), background_rect)
-        self.screen.blit(text, text_rect)
+    def _message_layer(self, message: str, color: Tuple[int, int, int]) -> Tuple[pygame.Surface, pygame.Rect]:
+        key = (message, color)
+        cached = self._layer_cache.get("message")
+        if cached is None or cached[0] != key:
+            text = self.render_text(self.font, message, color)
+            text_rect = text.get_rect()
+            padding = 10
+            text_rect.topright = (WINDOW_SIZE - padding, padding)
+            background_rect = text_rect.inflate(padding * 2, padding * 2)
+            surface = pygame.Surface(background_rect.size)
+            surface.fill(MESSAGE_BACKGROUND)
+            surface.blit(text, (padding, padding))
+            cached = self._layer_cache["message"] = (key, surface, background_rect)
+        return cached[1], cached[2]
+
+    def _debug_layer(self, stats: Optional[SearchStats]) -> Tuple[pygame.Surface, pygame.Rect]:
+        if stats is None:
+            lines = ["No search yet"]
+        else:
+            pv = " ".join(f"{fr},{fc}-{tr},{tc}" for (fr, fc), (tr, tc) in stats.pv[:DEBUG_PV_MOVES])
+            score = "-" if stats.score is None else f"{stats.score:g}"
+            pondered = f"  pondered {stats.resumed_depth}" if stats.resumed_depth else ""
+            lines = [
+                f"Depth {stats.depth} (sel {stats.seldepth})  score {score}{pondered}",
+                f"{stats.nodes} nodes  {stats.nodes_per_second:.0f} n/s  {stats.elapsed_ms:.0f} ms",
+                f"Cutoffs {stats.cutoffs} ({stats.first_move_cutoff_rate:.0%} first)  TT hits {stats.tt_hits}",
+                f"PV {pv}",
+            ]
+        key = tuple(lines)
+        cached = self._layer_cache.get("debug")
+        if cached is None or cached[0] != key:
+            rendered = [self.render_text(self.debug_font, line, DEBUG_OVERLAY_TEXT) for line in lines]
+            padding = 6
+            width = max(text.get_width() for text in rendered) + padding * 2
+            height = sum(text.get_height() for text in rendered) + padding * 2
+            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            overlay.fill(DEBUG_OVERLAY_BACKGROUND)
+            y = padding
+            for text in rendered:
+                overlay.blit(text, (padding, y))
+                y += text.get_height()
+            cached = self._layer_cache["debug"] = (key, overlay, pygame.Rect(padding, padding, width, height))
+        return cached[1], cached[2]
+
+    def _square_state(self, row: int, col: int, highlighted: FrozenSet[Tuple[int, int]]) -> tuple:
+        piece = self.board.get_piece(row, col)
+        if piece == 0 or (self.animating_piece is not None and piece == self.animating_piece):
+            return None, (row, col) in highlighted
+        return (piece.color, piece.king), (row, col) in highlighted
+
+    def _draw_square(self, row: int, col: int, state: tuple):
+        rect = square_rect(row, col)
+        self.screen.blit(self.board_surface, rect, rect)
+        sprite, highlighted = state
+        if sprite is not None:
+            self.screen.blit(self.piece_sprites[sprite], rect)
+        if highlighted:
+            pygame.draw.rect(self.screen, HIGHLIGHT_COLOR, rect, 3)
+
+    def render(self, highlighted: Iterable[Tuple[int, int]] = (), message: str = "", debug_stats: Optional[SearchStats] = None, show_debug: bool = False) -> List[pygame.Rect]:
+        """Draw the board with its overlays, repainting only what changed since the last call.
+
+        Returns the changed screen rects, to pass to pygame.display.update.
+        Squares are compared with what was drawn last time; the animating
+        piece, the message box and the debug overlay are layers on top, and
+        squares they covered or now cover are repainted when they move.
+        """
+        highlighted = frozenset(highlighted)
+        layers = []
+        if self.animating_piece:
+            layers.append((self.piece_sprites[(self.animating_piece.color, self.animating_piece.king)], self._animation_rect()))
+        if message:
+            layers.append(self._message_layer(message, (139, 0, 0)))
+        if show_debug:
+            layers.append(self._debug_layer(debug_stats))
+        drawn_layers = [(id(surface), tuple(rect)) for surface, rect in layers]
+
+        if self.full_redraw:
+            self.screen.fill((0, 0, 0))
+            self._drawn_squares = {}
+        states = {
+            (row, col): self._square_state(row, col, highlighted)
+            for row in range(BOARD_SIZE)
+            for col in range(BOARD_SIZE)
+        }
+        stale = {square for square, state in states.items() if self._drawn_squares.get(square) != state}
+        if drawn_layers != self._drawn_layers:
+            for _, rect in self._drawn_layers:
+                stale |= squares_under(pygame.Rect(rect))
+        if stale or drawn_layers != self._drawn_layers:
+            # Layers are blended on top, so everything under them is repainted before they are re-blitted
+            for _, rect in layers:
+                stale |= squares_under(rect)
+
+        dirty: List[pygame.Rect] = []
+        for row, col in sorted(stale):
+            self._draw_square(row, col, states[(row, col)])
+            self._drawn_squares[(row, col)] = states[(row, col)]
+            dirty.append(square_rect(row, col))
+        if dirty:
+            for surface, rect in layers:
+                self.screen.blit(surface, rect)
+        self._drawn_layers = drawn_layers
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        return dirty
 
 def get_tile_at_mouse_pos(mouse_pos: Tuple[int, int]) -> Tuple[int, int]:
     row = mouse_pos[1] // SQUARE_SIZE
     col = mouse_pos[0] // SQUARE_SIZE
     return row, col
-
-def highlight_valid_moves(screen: pygame.Surface, board: Board, selected_piece: Optional[Tuple[int, int]]):
-    if not selected_piece:
-        return
-    row, col = selected_piece
-    valid_moves = get_valid_moves(board, row, col)
-    for move_row, move_col in valid_moves:
-        pygame.draw.rect(
-            screen,
-            (0, 255, 0),
-            (move_col * SQUARE_SIZE, move_row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE),
-            3,
-        )
@@ -0,0 +1,60 @@
+import time
+
+from src.game.ai_worker import BackgroundSearch
+from src.game.board import Board, execute_move, get_all_valid_moves_for_player
+from src.game.stats import SearchStats
+from src.game.transposition import TranspositionTable, position_key
+
+TIMEOUT = 10
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_cancel_stops_a_running_ponder():
+    search = BackgroundSearch()
+    try:
+        future = search.ponder(Board(), "black", tt=TranspositionTable(1))
+        wait_until(lambda: search._ponder_results)
+        assert search.pondering and not future.done()
+        search.cancel()
+        assert future.result(timeout=TIMEOUT) is None
+        assert not search.pondering and not search.thinking
+        assert search._ponder_results == {}
+    finally:
+        search.shutdown()
+
+
+def test_ponder_hit_resumes_the_search():
+    search = BackgroundSearch()
+    board = Board()
+    tt = TranspositionTable(4)
+    try:
+        ponder_future = search.ponder(board, "black", tt=tt)
+        piece, (new_row, new_col) = get_all_valid_moves_for_player(board, "white")[0]
+        execute_move(board, piece, new_row, new_col)
+        key = position_key(board, "black")
+        # Wait until the reply played has been pondered past the first round
+        wait_until(lambda: key in search._ponder_results and search._ponder_results[key][0] >= 2)
+        pondered_depth, _, pondered_move = search._ponder_results[key]
+
+        stats = SearchStats()
+        move = search.start(board, "black", tt=tt, time_limit_ms=50, stats=stats).result(timeout=TIMEOUT)
+        assert ponder_future.done()
+        assert stats.resumed_depth >= pondered_depth
+        assert stats.depth >= stats.resumed_depth
+        assert move is not None and board.get_piece(*move[0]).color == "black"
+
+        # A hit is only resumed when start() shares the pondering table
+        search.ponder(board, "white", tt=tt)
+        execute_move(board, board.get_piece(*move[0]), *move[1])
+        wait_until(lambda: position_key(board, "white") in search._ponder_results)
+        stats = SearchStats()
+        assert search.start(board, "white", time_limit_ms=50, stats=stats).result(timeout=TIMEOUT) is not None
+        assert stats.resumed_depth == 0
+    finally:
+        search.shutdown()
@@ -0,0 +1,76 @@
+import math
+import random
+
+import pytest
+
+from src.game.analysis import analyse, analyse_position
+from src.game.bitboard import BitBoard
+from src.game.board import CaptureSequence, _search_child, choose_ai_move, execute_move, get_all_valid_moves_for_player, get_search_moves
+from src.game.position import format_position
+
+
+def random_position(seed: int):
+    rng = random.Random(seed)
+    board = BitBoard()
+    color = "white"
+    for _ in range(rng.randrange(0, 60)):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    return board, color
+
+
+def root_scores(board, color, depth, allow_multi_jump):
+    """Full-window score of every root move, keyed by the squares the piece visits."""
+    scores = {}
+    for piece, move in get_search_moves(board, color, allow_multi_jump):
+        path = ((piece.row, piece.col),) + (move.path if isinstance(move, CaptureSequence) else (tuple(move),))
+        scores[path] = _search_child(board, piece, move, depth, True, color, -math.inf, math.inf, allow_multi_jump)
+    return scores
+
+
+@pytest.mark.parametrize("allow_multi_jump", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_single_line_matches_choose_ai_move(seed, allow_multi_jump):
+    board, color = random_position(seed)
+    for depth in (1, 2, 3):
+        scores = root_scores(board, color, depth, allow_multi_jump)
+        if not scores:
+            pytest.skip("no moves")
+        best = max(scores.values())
+        (line,) = analyse(board, color, multi_pv=1, depth=depth, allow_multi_jump=allow_multi_jump).lines
+        piece, move = choose_ai_move(board, color, depth, allow_multi_jump)
+        assert line.score == best
+        # The same move, or one that scores as well
+        chosen = [score for path, score in scores.items() if path[:2] == ((piece.row, piece.col), tuple(move))]
+        assert line.move == ((piece.row, piece.col), tuple(move)) or max(chosen) == best
+
+
+@pytest.mark.parametrize("allow_multi_jump", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_lines_are_the_best_moves_sorted_and_distinct(seed, allow_multi_jump):
+    board, color = random_position(seed)
+    before = format_position(board, color, allow_multi_jump)
+    scores = root_scores(board, color, 3, allow_multi_jump)
+    for multi_pv in (2, 4, len(scores) + 1):
+        analysis = analyse(board, color, multi_pv=multi_pv, depth=3, allow_multi_jump=allow_multi_jump)
+        assert analysis.depth == 3
+        lines = analysis.lines
+        assert len(lines) == min(multi_pv, len(scores))
+        assert len({tuple(line.path) for line in lines}) == len(lines)
+        assert [line.score for line in lines] == sorted((line.score for line in lines), reverse=True)
+        assert [line.score for line in lines] == sorted(scores.values(), reverse=True)[:len(lines)]
+        assert all(scores[tuple(line.path)] == line.score for line in lines)
+        assert all(line.pv[0] == line.move for line in lines)
+    assert format_position(board, color, allow_multi_jump) == before
+
+
+def test_analyse_position_reads_the_text_format():
+    board, color = random_position(3)
+    text = format_position(board, color, False)
+    analysis = analyse_position(text, multi_pv=3, depth=2)
+    assert analysis.position == text and analysis.color_to_move == color
+    assert [line.score for line in analysis.lines] == [line.score for line in analyse(board, color, 3, 2).lines]
@@ -0,0 +1,74 @@
+import math
+import random
+
+import pytest
+
+from src.game.batch_eval import BatchEvaluator, encode_boards
+from src.game.bitboard import BitBoard, decode_position, encode_position
+from src.game.board import MATERIAL_WEIGHTS, POSITIONAL_WEIGHTS, Board, Piece, evaluate_board, execute_move, get_all_valid_moves_for_player, make_move, minimax_with_alpha_beta, unmake_move
+from src.game.tables import BOARD_SIZE
+
+WEIGHTS = [MATERIAL_WEIGHTS, POSITIONAL_WEIGHTS]
+
+
+def random_positions(seed: int, count: int = 40):
+    """Positions from one seeded random game, with the side to move at each."""
+    rng = random.Random(seed)
+    board = BitBoard()
+    color = "white"
+    positions = []
+    for _ in range(count):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        positions.append((encode_position(board), color))
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    return positions
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+@pytest.mark.parametrize("seed", range(10))
+def test_batch_matches_scalar(weights, seed):
+    positions = [position for position, _ in random_positions(seed)]
+    evaluator = BatchEvaluator(weights)
+    for player_color in ("white", "black"):
+        scores = evaluator.evaluate_positions(positions, player_color)
+        assert list(scores) == [evaluate_board(decode_position(position), player_color, weights) for position in positions]
+
+
+def test_encode_boards_matches_backends():
+    board = Board()
+    bitboard = BitBoard()
+    assert (encode_boards([board]) == encode_boards([bitboard])).all()
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("seed", range(5))
+def test_evaluate_moves_matches_make_move(board_class, seed):
+    evaluator = BatchEvaluator(POSITIONAL_WEIGHTS)
+    for position, color in random_positions(seed, 20):
+        board = decode_position(position)
+        if board_class is Board:
+            board = Board.from_pieces([
+                Piece(row, col, piece.color, piece.king)
+                for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+                for piece in [board.get_piece(row, col)] if piece != 0
+            ])
+        moves = get_all_valid_moves_for_player(board, color)
+        expected = []
+        for piece, (new_row, new_col) in moves:
+            undo = make_move(board, piece, new_row, new_col)
+            expected.append(evaluate_board(board, "white", POSITIONAL_WEIGHTS))
+            unmake_move(board, undo)
+        assert list(evaluator.evaluate_moves(board, moves, color, "white")) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batched_search_matches_scalar_search(seed):
+    for position, color in random_positions(seed, 30)[::6]:
+        board = decode_position(position)
+        scalar = minimax_with_alpha_beta(board, 2, True, color, -math.inf, math.inf, evaluator=BatchEvaluator(POSITIONAL_WEIGHTS, batch_leaves=False))[0]
+        batched = minimax_with_alpha_beta(board, 2, True, color, -math.inf, math.inf, evaluator=BatchEvaluator(POSITIONAL_WEIGHTS, batch_leaves=True))[0]
+        assert batched == scalar
@@ -0,0 +1,72 @@
+import io
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, execute_move, get_all_valid_moves_for_player
+from src.game.book import MAX_WEIGHT, load_book, write_book
+from src.game.transposition import position_key
+from tools.build_book import build_book, main as build_book_main
+
+BUILD_ARGS = ["--plies", "2", "--depth", "2", "--margin", "2", "--max-moves", "3", "--workers", "1"]
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("book") / "opening_book.bin")
+    build_book_main(BUILD_ARGS + ["--output", path])
+    with load_book(path) as book:
+        yield book, build_book(2, 2, 2, 3, 1, log=io.StringIO())
+
+
+def test_built_book_reloads_every_position(built):
+    book, positions = built
+    assert len(book) == sum(len(moves) for moves in positions.values())
+    for key, moves in positions.items():
+        entries = book.probe(key)
+        assert dict(entries) == moves
+        assert [weight for _, weight in entries] == sorted(moves.values(), reverse=True)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_lookup_matches_the_position_key(built, board_class):
+    book, positions = built
+    board = board_class()
+    moves = positions[position_key(board, "white")]
+    piece, to_pos = book.choose(board, "white")
+    assert moves[((piece.row, piece.col), to_pos)] == max(moves.values())
+    # The same squares with the other side to move, or with multi-jump, are other positions
+    assert book.choose(board, "black") is None
+    assert book.choose(board, "white", allow_multi_jump=True) is None
+    # One book move deep is still in the book; a position off the book tree is not
+    execute_move(board, piece, *to_pos)
+    assert book.choose(board, "black") is not None
+    rng = random.Random(0)
+    for color in ("black", "white", "black"):
+        piece, (new_row, new_col) = rng.choice(get_all_valid_moves_for_player(board, color))
+        execute_move(board, piece, new_row, new_col)
+    assert position_key(board, "white") not in positions
+    assert book.choose(board, "white") is None
+
+
+def test_choose_respects_the_weights(tmp_path):
+    board = BitBoard()
+    moves = [((piece.row, piece.col), to_pos) for piece, to_pos in get_all_valid_moves_for_player(board, "white")]
+    heavy, light, unlisted = moves[:3]
+    path = str(tmp_path / "weighted.bin")
+    write_book(path, {position_key(board, "white"): {heavy: 3, light: 1, unlisted: 0, ((0, 1), (1, 0)): MAX_WEIGHT + 1}})
+    with load_book(path) as book:
+        # The zero weight is dropped, the weight past MAX_WEIGHT clamped, and the illegal move skipped by choose
+        assert book.probe(position_key(board, "white")) == [(((0, 1), (1, 0)), MAX_WEIGHT), (heavy, 3), (light, 1)]
+        piece, to_pos = book.choose(board, "white")
+        assert ((piece.row, piece.col), to_pos) == heavy
+        rng = random.Random(1)
+        draws = [book.choose(board, "white", rng=rng) for _ in range(4000)]
+        picks = [((piece.row, piece.col), to_pos) for piece, to_pos in draws]
+        assert set(picks) == {heavy, light}
+        assert picks.count(heavy) / len(picks) == pytest.approx(0.75, abs=0.03)
+
+
+def test_missing_book_is_none(tmp_path):
+    assert load_book(str(tmp_path / "missing.bin")) is None
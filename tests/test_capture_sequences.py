@@ -0,0 +1,57 @@
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, CaptureSequence, Piece, capture_sequences, execute_move, get_search_moves, play_search_move, unmake_move
+from src.game.tables import WARP_SQUARES
+
+BACKENDS = [Board, BitBoard]
+
+
+def sequence_keys(sequences):
+    return sorted((sequence.path, tuple(sorted(sequence.captured))) for sequence in sequences)
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_transposed_paths_are_one_sequence(board_class):
+    # The king can go round the four black men either way and ends back on its own square, having taken all four
+    king = Piece(9, 2, "white", True)
+    board = board_class.from_pieces([king] + [Piece(row, col, "black", False) for row, col in [(8, 1), (6, 1), (6, 3), (8, 3)]])
+    sequences = capture_sequences(board, board.get_piece(9, 2))
+    assert len(sequences) == 1
+    assert sequences[0].path[-1] == (9, 2)
+    assert sorted(sequences[0].captured) == [(6, 1), (6, 3), (8, 1), (8, 3)]
+    assert sequences[0].path in [((7, 0), (5, 2), (7, 4), (9, 2)), ((7, 4), (5, 2), (7, 0), (9, 2))]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_no_capture_of_a_piece_on_a_warp_square(board_class):
+    # After taking 7,4 the man stands behind the black man on warp square 5,4, with 4,3 empty
+    assert (5, 4) in WARP_SQUARES
+    board = board_class.from_pieces([Piece(8, 3, "white", False), Piece(7, 4, "black", False), Piece(5, 4, "black", False)])
+    moves = get_search_moves(board, "white", allow_multi_jump=True)
+    assert [(piece.row, piece.col) for piece, _ in moves] == [(8, 3)]
+    assert sequence_keys(move for _, move in moves) == [(((6, 5),), ((7, 4),))]
+    # Nor is it a first hop
+    board = board_class.from_pieces([Piece(6, 5, "white", False), Piece(5, 4, "black", False)])
+    assert all(not isinstance(move, CaptureSequence) for _, move in get_search_moves(board, "white", allow_multi_jump=True))
+    assert capture_sequences(board, board.get_piece(6, 5)) == []
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_promotion_ends_the_sequence(board_class):
+    # The man promotes on 0,3 after two captures; as a king it could go on over 1,4
+    pieces = [Piece(4, 3, "white", False), Piece(3, 2, "black", False), Piece(1, 2, "black", False), Piece(1, 4, "black", False)]
+    board = board_class.from_pieces(pieces)
+    man = board.get_piece(4, 3)
+    assert sequence_keys(capture_sequences(board, man)) == [(((2, 1), (0, 3)), ((1, 2), (3, 2)))]
+
+    undo_stack = play_search_move(board, man, capture_sequences(board, man)[0])
+    assert board.get_piece(0, 3).king and board.get_piece(1, 4) != 0
+    for undo in reversed(undo_stack):
+        unmake_move(board, undo)
+
+    # The game stops the chain at the same point
+    first = execute_move(board, man, 2, 1, allow_multi_jump=True)
+    assert first.can_jump_again and not first.promoted
+    second = execute_move(board, board.get_piece(2, 1), 0, 3, allow_multi_jump=True)
+    assert second.promoted and not second.can_jump_again
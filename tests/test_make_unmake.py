@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, get_all_valid_moves_for_player, make_move, unmake_move
+from src.game.tables import BOARD_SIZE
+from src.game.transposition import compute_zobrist
+
+
+def snapshot(board: Board):
+    grid = tuple(
+        (piece.color, piece.king) if piece != 0 else None
+        for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+        for piece in [board.get_piece(row, col)]
+    )
+    return grid, board.material("white"), board.material("black"), board.zobrist
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("seed", range(20))
+def test_unmake_restores_board_exactly(board_class, seed):
+    rng = random.Random(seed)
+    board = board_class()
+    color = "white"
+    for _ in range(150):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        before = snapshot(board)
+        # Every legal move is made and taken back before one of them is played
+        for piece, (new_row, new_col) in moves:
+            undo = make_move(board, piece, new_row, new_col)
+            assert board.zobrist == compute_zobrist(board)
+            unmake_move(board, undo)
+            assert snapshot(board) == before
+        piece, (new_row, new_col) = rng.choice(moves)
+        make_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_totals_match_recount(seed):
+    rng = random.Random(seed)
+    board = Board()
+    color = "white"
+    for _ in range(100):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        make_move(board, piece, new_row, new_col)
+        counts = (dict(board.piece_counts), dict(board.king_counts), dict(board.warp_counts))
+        board.recount()
+        assert (board.piece_counts, board.king_counts, board.warp_counts) == counts
+        color = "black" if color == "white" else "white"
@@ -0,0 +1,19 @@
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board
+from tools.bench import POSITIONS, search_nodes
+
+
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+@pytest.mark.parametrize("depth", range(1, 5))
+def test_ordering_never_adds_nodes(name, depth):
+    ordered, ordered_score, _ = search_nodes(BitBoard, name, depth)
+    unordered, unordered_score, _ = search_nodes(BitBoard, name, depth, ordering=False)
+    assert ordered <= unordered
+    assert ordered_score == unordered_score
+
+
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+def test_ordering_saves_nodes_at_depth_4(name):
+    assert search_nodes(Board, name, 4)[0] < search_nodes(Board, name, 4, ordering=False)[0]
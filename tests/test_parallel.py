@@ -0,0 +1,85 @@
+import math
+import multiprocessing
+import random
+
+import pytest
+
+from src.game import parallel
+from src.game.bitboard import BitBoard, encode_position
+from src.game.board import execute_move, get_all_valid_moves_for_player, get_search_moves, minimax_with_alpha_beta
+from src.game.ordering import MoveOrderer
+from src.game.position import parse_position
+
+
+@pytest.fixture(scope="module")
+def searcher():
+    searcher = parallel.ParallelSearcher(2)
+    yield searcher
+    searcher.shutdown()
+
+
+def random_position(seed: int):
+    rng = random.Random(seed)
+    board = BitBoard()
+    color = "white"
+    for _ in range(rng.randrange(0, 60)):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    return board, color
+
+
+def serial(board, color, depth, allow_multi_jump=False):
+    return minimax_with_alpha_beta(board, depth, True, color, -math.inf, math.inf, allow_multi_jump, tt=None, orderer=MoveOrderer())
+
+
+def move_key(best_move):
+    piece, move = best_move
+    return (piece.row, piece.col), tuple(move)
+
+
+@pytest.mark.parametrize("allow_multi_jump", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_parallel_matches_serial(searcher, seed, allow_multi_jump):
+    board, color = random_position(seed)
+    if not get_search_moves(board, color, allow_multi_jump):
+        pytest.skip("game over")
+    for depth in (1, 2, 3):
+        expected_score, expected_move = serial(board, color, depth, allow_multi_jump)
+        score, best_move = searcher.search(board, color, depth, allow_multi_jump)
+        assert score == expected_score
+        if expected_move is not None:
+            assert move_key(best_move) == move_key(expected_move)
+
+
+@pytest.mark.parametrize("text", ["W:W46:B5", "W:W28:B23,K5"])
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_single_move_and_depth_zero_are_scored(searcher, text, depth):
+    board, color, _ = parse_position(text)
+    score, best_move = searcher.search(board, color, depth)
+    assert score == serial(board, color, depth)[0]
+    assert best_move is not None
+
+
+def test_raised_bound_stops_a_running_job(monkeypatch):
+    board = BitBoard()
+    piece, move = get_search_moves(board, "white")[0]
+    shared = multiprocessing.Value("d", -math.inf)
+    parallel._init_worker(shared)
+    searched = []
+    real_child = parallel._negamax_child
+
+    def child(*args):
+        searched.append(args[2])
+        # Another worker finishes with a score this move cannot reach
+        shared.value = 100.0
+        return real_child(*args)
+
+    monkeypatch.setattr(parallel, "_negamax_child", child)
+    index, score, alpha = parallel._search_root_move(encode_position(board), "white", 0, (piece.row, piece.col), move, 3, False)
+    assert len(searched) == 1
+    assert score <= alpha
+    assert shared.value == 100.0
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from src.game.bitboard import SQUARE_BIT, BitBoard, count_position_moves, generate_position_moves
+from src.game.board import Board, Piece, execute_move, get_all_valid_moves_for_player
+from tools.bench import PERFT_INITIAL, PERFT_POSITION_DEPTH, PERFT_POSITIONS, build_position, divide, perft, perft_integer
+
+BACKENDS = [Board, BitBoard]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("depth", range(1, 5))
+def test_perft_initial(board_class, depth):
+    board, side = build_position("opening", board_class)
+    assert perft(board, side, depth) == PERFT_INITIAL[depth - 1]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("name", sorted(PERFT_POSITIONS))
+def test_perft_positions(board_class, name):
+    board, side = build_position(name, board_class)
+    assert perft(board, side, PERFT_POSITION_DEPTH) == PERFT_POSITIONS[name]
+
+
+@pytest.mark.parametrize("name", sorted(PERFT_POSITIONS))
+def test_integer_perft_matches(name):
+    board, side = build_position(name, BitBoard)
+    assert perft_integer(board, side, PERFT_POSITION_DEPTH) == PERFT_POSITIONS[name]
+
+
+@pytest.mark.parametrize("depth", range(1, 6))
+def test_integer_perft_initial(depth):
+    assert perft_integer(BitBoard(), "white", depth) == PERFT_INITIAL[depth - 1]
+
+
+def test_divide_sums_to_perft():
+    board, side = build_position("midgame", Board)
+    counts = divide(board, side, 3)
+    assert len(counts) == len(get_all_valid_moves_for_player(board, side))
+    assert sum(counts.values()) == perft(board, side, 3)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitboard_generator_matches_board(seed):
+    rng = random.Random(seed)
+    board = Board()
+    color = "white"
+    for _ in range(120):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        bitboard = BitBoard.from_pieces([Piece(piece.row, piece.col, piece.color, piece.king) for row in board.grid for piece in row if piece != 0])
+        position = (bitboard.white, bitboard.black, bitboard.kings)
+        expected = sorted((SQUARE_BIT[piece.row][piece.col], SQUARE_BIT[new_row][new_col]) for piece, (new_row, new_col) in moves)
+        assert generate_position_moves(position, color == "black") == expected
+        assert count_position_moves(position, color == "black") == len(moves)
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, execute_move, get_all_valid_moves_for_player
+from src.game.position import format_position, parse_position, square_at, square_number
+from src.game.tables import BOARD_SIZE
+
+
+def pieces(board: Board):
+    return sorted(
+        (row, col, piece.color, piece.king)
+        for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+        for piece in [board.get_piece(row, col)] if piece != 0
+    )
+
+
+def test_square_numbers():
+    assert square_at(1) == (0, 1)
+    assert square_at(5) == (0, 9)
+    assert square_at(6) == (1, 0)
+    assert square_at(50) == (9, 8)
+    assert all(square_at(square_number(*square_at(number))) == square_at(number) for number in range(1, 51))
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("seed", range(20))
+def test_format_parse_round_trip(board_class, seed):
+    rng = random.Random(seed)
+    board = board_class()
+    color = "white"
+    for _ in range(rng.randrange(0, 80)):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    allow_multi_jump = bool(seed % 2)
+    text = format_position(board, color, allow_multi_jump)
+    parsed, parsed_color, parsed_multi_jump = parse_position(text, board_class)
+    assert (pieces(parsed), parsed_color, parsed_multi_jump) == (pieces(board), color, allow_multi_jump)
+    assert parsed.zobrist == board.zobrist
+    assert format_position(parsed, parsed_color, parsed_multi_jump) == text
+
+
+def test_parse_accepts_any_field_order_and_spaces():
+    board, color, allow_multi_jump = parse_position("b : M : B19,K23 : W31, 32")
+    assert (color, allow_multi_jump) == ("black", True)
+    assert pieces(board) == sorted([(3, 6, "black", False), (4, 5, "black", True), (6, 1, "white", False), (6, 3, "white", False)])
+
+
+@pytest.mark.parametrize("text", [
+    "W:W3:B20",     # white man on row 0
+    "B:W31:B48",    # black man on row 9
+])
+def test_parse_rejects_men_on_their_promotion_row(text):
+    with pytest.raises(ValueError, match="promotion row"):
+        parse_position(text)
+
+
+def test_parse_accepts_kings_and_opponents_on_a_promotion_row():
+    board, _, _ = parse_position("W:WK3,47:BK46,4")
+    assert pieces(board) == sorted([(0, 5, "white", True), (9, 2, "white", False), (9, 0, "black", True), (0, 7, "black", False)])
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "X:W31:B20",
+    "W:W31:Q20",
+    "W:W31:B2x",
+    "W:W51:B20",
+    "W:W31:B31",
+])
+def test_parse_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_position(text)
@@ -0,0 +1,147 @@
+import math
+import random
+
+import pytest
+
+from src.game import board as board_module
+from src.game.batch_eval import BatchEvaluator
+from src.game.bitboard import BitBoard
+from src.game.board import POSITIONAL_WEIGHTS, MoveRecord, evaluate_board, execute_move, get_all_valid_moves_for_player, get_search_moves, make_ai_move, minimax_with_alpha_beta, play_search_move, quiescence_search, unmake_move
+from src.game.ordering import MoveOrderer
+from src.game.stats import SearchStats
+
+
+def alpha_beta(board, depth, color, alpha, beta, allow_multi_jump):
+    """Plain fail-soft alpha-beta with every move searched on the full window, as the search was before PVS."""
+    if depth == 0:
+        return evaluate_board(board, color), None
+    moves = get_search_moves(board, color, allow_multi_jump)
+    if not moves:
+        return -math.inf, None
+    opponent = "white" if color == "black" else "black"
+    best_score, best_move = -math.inf, None
+    for piece, move in moves:
+        undo_stack = play_search_move(board, piece, move)
+        try:
+            score = -alpha_beta(board, depth - 1, opponent, -beta, -alpha, allow_multi_jump)[0]
+        finally:
+            for undo in reversed(undo_stack):
+                unmake_move(board, undo)
+        if score > best_score:
+            best_score, best_move = score, (piece, move)
+        alpha = max(alpha, best_score)
+        if beta <= alpha:
+            break
+    return best_score, best_move
+
+
+def random_position(seed: int):
+    rng = random.Random(seed)
+    board = BitBoard()
+    color = "white"
+    for _ in range(rng.randrange(0, 50)):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    return board, color
+
+
+def move_key(best_move):
+    if best_move is None:
+        return None
+    piece, move = best_move
+    return (piece.row, piece.col), tuple(move)
+
+
+@pytest.mark.parametrize("allow_multi_jump", [False, True])
+@pytest.mark.parametrize("seed", range(15))
+def test_pvs_matches_plain_alpha_beta(seed, allow_multi_jump):
+    board, color = random_position(seed)
+    for depth in (1, 2, 3):
+        expected_score, expected_move = alpha_beta(board, depth, color, -math.inf, math.inf, allow_multi_jump)
+        # Same move order as the reference, so ties go to the same move
+        score, best_move = minimax_with_alpha_beta(board, depth, True, color, -math.inf, math.inf, allow_multi_jump, quiescence=False)
+        assert score == expected_score
+        assert move_key(best_move) == move_key(expected_move)
+        # With move ordering the score is still exact
+        score, _ = minimax_with_alpha_beta(board, depth, True, color, -math.inf, math.inf, allow_multi_jump, orderer=MoveOrderer(), quiescence=False)
+        assert score == expected_score
+
+
+def capture_positions(count: int):
+    """Positions from seeded random games where the side to move has a capture pending."""
+    positions = []
+    seed = 0
+    while len(positions) < count:
+        rng = random.Random(seed)
+        seed += 1
+        board = BitBoard()
+        color = "white"
+        for _ in range(rng.randrange(10, 70)):
+            moves = get_all_valid_moves_for_player(board, color)
+            if not moves:
+                break
+            piece, (new_row, new_col) = rng.choice(moves)
+            execute_move(board, piece, new_row, new_col)
+            color = "black" if color == "white" else "white"
+        if board.has_captures(color):
+            positions.append((board, color))
+    return positions
+
+
+@pytest.mark.parametrize("allow_multi_jump", [False, True])
+@pytest.mark.parametrize("positional", [False, True])
+def test_delta_pruning_keeps_the_score(monkeypatch, allow_multi_jump, positional):
+    evaluator = BatchEvaluator(POSITIONAL_WEIGHTS) if positional else None
+    prunes = 0
+    for board, color in capture_positions(40):
+        def scores():
+            stats = SearchStats()
+            exact = quiescence_search(board, True, color, -math.inf, math.inf, allow_multi_jump, stats=stats, evaluator=evaluator)
+            # Windows below, around and far above the score; the last one prunes most captures
+            windowed = [quiescence_search(board, True, color, exact + low, exact + high, allow_multi_jump, stats=stats, evaluator=evaluator)
+                        for low, high in [(-6, -0.5), (-1, 1), (6, 12)]]
+            searched = minimax_with_alpha_beta(board, 2, True, color, -math.inf, math.inf, allow_multi_jump, stats=stats, evaluator=evaluator)[0]
+            return exact, windowed, searched, stats.delta_prunes
+
+        exact, windowed, searched, board_prunes = scores()
+        prunes += board_prunes
+        monkeypatch.setattr(board_module, "DELTA_MARGIN", math.inf)
+        unpruned_exact, unpruned_windowed, unpruned_searched, _ = scores()
+        monkeypatch.undo()
+        assert exact == unpruned_exact
+        assert searched == unpruned_searched
+        # Outside the window only the side of it is defined
+        below, inside, above = windowed
+        unpruned_below, unpruned_inside, unpruned_above = unpruned_windowed
+        assert below >= exact - 0.5 and unpruned_below >= exact - 0.5
+        assert inside == unpruned_inside == exact
+        assert above <= exact + 6 and unpruned_above <= exact + 6
+    assert prunes
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pvs_within_a_window(seed):
+    board, color = random_position(seed)
+    expected, _ = alpha_beta(board, 3, color, -math.inf, math.inf, False)
+    if not math.isfinite(expected):
+        pytest.skip("decided position")
+    # Fail-high and fail-low results are bounds on the score on the right side of the window
+    assert minimax_with_alpha_beta(board, 3, True, color, expected - 3, expected - 1, quiescence=False)[0] >= expected - 1
+    assert minimax_with_alpha_beta(board, 3, True, color, expected + 1, expected + 3, quiescence=False)[0] <= expected + 1
+    assert minimax_with_alpha_beta(board, 3, True, color, expected - 1, expected + 1, quiescence=False)[0] == expected
+
+
+
+@pytest.mark.parametrize("time_limit_ms", [None, 50])
+def test_make_ai_move_plays_and_returns_a_move_record(time_limit_ms):
+    board = BitBoard()
+    before = board.zobrist
+    record = make_ai_move(board, "white", 2, time_limit_ms=time_limit_ms)
+    assert isinstance(record, MoveRecord)
+    assert not hasattr(record, "__dict__")
+    assert board.zobrist != before
+    assert board.get_piece(*record.to_pos) != 0
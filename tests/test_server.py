@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from src.game import server
+from src.game.bitboard import BitBoard, encode_position
+from src.game.server import GameServer
+from src.game.transposition import TranspositionTable
+from tools.loadgen import Client
+
+
+def run_with_server(tmp_path, scenario):
+    """Run scenario(connect) against a one-worker server on a Unix socket."""
+    async def main():
+        game_server = GameServer(workers=1, max_queue=4)
+        unix_path = str(tmp_path / "server.sock")
+        await game_server.start(unix_path=unix_path)
+        clients = []
+
+        async def connect():
+            client = await Client.connect("", 0, unix_path)
+            clients.append(client)
+            return client
+
+        try:
+            return await scenario(connect)
+        finally:
+            for client in clients:
+                await client.close()
+            await game_server.close()
+
+    return asyncio.run(main())
+
+
+def test_open_move_search_and_close(tmp_path):
+    async def scenario(connect):
+        client = await connect()
+        # The human plays white: nothing to search yet
+        opened = await client.request(op="new", human="white", depth=2, seed=1, id=7)
+        assert opened["ok"] and opened["id"] == 7 and opened["ai_moves"] == []
+        session = opened["session"]
+        assert opened["state"]["turn"] == "white"
+
+        from_pos, to_pos = opened["state"]["legal_moves"][0]
+        moved = await client.request(op="move", session=session, **{"from": from_pos, "to": to_pos})
+        assert moved["ok"]
+        assert (moved["move"]["from"], moved["move"]["to"]) == (from_pos, to_pos)
+        # One AI move, or two after a warp-square bonus move
+        assert moved["ai_moves"] and moved["state"]["turn"] == "white" and moved["state"]["plies"] == 1 + len(moved["ai_moves"])
+
+        illegal = await client.request(op="move", session=session, **{"from": from_pos, "to": to_pos})
+        assert not illegal["ok"]
+
+        # The AI plays white and searches as soon as the session opens
+        ai_first = await client.request(op="new", human="black", depth=2, seed=2)
+        assert ai_first["ok"] and ai_first["ai_moves"] and ai_first["state"]["turn"] == "black"
+        searched = await client.request(op="ai", session=ai_first["session"])
+        assert searched["ok"] and searched["ai_moves"] == []
+
+        stats = (await client.request(op="stats"))["stats"]
+        assert stats["sessions"] == 2 and stats["searches"] == len(moved["ai_moves"]) + len(ai_first["ai_moves"])
+
+        for session_id in (session, ai_first["session"]):
+            assert (await client.request(op="close", session=session_id))["ok"]
+            gone = await client.request(op="state", session=session_id)
+            assert not gone["ok"] and "No session" in gone["error"]
+        assert not (await client.request(op="close", session=session))["ok"]
+        assert (await client.request(op="stats"))["stats"]["sessions"] == 0
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_close_waits_for_a_running_search(tmp_path):
+    async def scenario(connect):
+        player, closer, late = await connect(), await connect(), await connect()
+        opened = await player.request(op="new", human="white", depth=6, time_ms=300, seed=3)
+        session = opened["session"]
+        from_pos, to_pos = opened["state"]["legal_moves"][0]
+        finished = {}
+
+        async def timed(name, client, **request):
+            reply = await client.request(**request)
+            finished[name] = time.perf_counter()
+            return reply
+
+        move = asyncio.create_task(timed("move", player, op="move", session=session, **{"from": from_pos, "to": to_pos}))
+        await asyncio.sleep(0.1)
+        close = asyncio.create_task(timed("close", closer, op="close", session=session))
+        await asyncio.sleep(0.01)
+        # Looked up before the close, but waits behind it for the session
+        queued = asyncio.create_task(late.request(op="ai", session=session))
+        moved, closed, after = await asyncio.gather(move, close, queued)
+        assert moved["ok"] and moved["ai_moves"]
+        assert closed["ok"] and finished["close"] >= finished["move"]
+        assert not after["ok"] and "No session" in after["error"]
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_worker_table_holds_one_session(monkeypatch):
+    tt = TranspositionTable(1)
+    clears = []
+    monkeypatch.setattr(tt, "clear", lambda: clears.append(True))
+    monkeypatch.setattr(server, "_worker_tt", tt)
+    monkeypatch.setattr(server, "_worker_tt_session", None)
+    position = encode_position(BitBoard())
+    for session_id in ("1", "1", "2", "1"):
+        move, nodes, _ = server._search_job(session_id, position, "white", 2, False, None)
+        assert move is not None and nodes > 0
+    assert len(clears) == 3
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from src.game import state as state_module
+from src.game.bitboard import BitBoard
+from src.game.board import Board, Piece, make_move, unmake_move
+from src.game.state import GameState
+from src.game.status import StatusCache
+from src.game.tables import WARP_SQUARES
+
+BACKENDS = [Board, BitBoard]
+
+
+def new_state(monkeypatch, board_class, pieces, human_colors, multi_jump):
+    """White to move on a board holding pieces, with the multi-jump roll fixed."""
+    monkeypatch.setattr(state_module, "MULTI_JUMP_CHANCE", 1.0 if multi_jump else 0.0)
+    return GameState(board_class.from_pieces(pieces), random.Random(0), human_colors)
+
+
+def play(state, from_pos, to_pos):
+    return state.apply(state.board.get_piece(*from_pos), *to_pos)
+
+
+def warp_pieces():
+    # White can step onto warp square 5,4 and from there onto warp square 4,5
+    assert {(5, 4), (4, 5)} <= WARP_SQUARES
+    return [Piece(6, 3, "white", False), Piece(8, 1, "white", False), Piece(1, 0, "black", False)]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_human_bonus_move_is_made_with_the_same_piece(monkeypatch, board_class):
+    state = new_state(monkeypatch, board_class, warp_pieces(), ("white",), multi_jump=False)
+    record = play(state, (6, 3), (5, 4))
+    assert record.bonus_move and state.bonus_move_active and state.current_turn == "white"
+    assert {(piece.row, piece.col) for piece, _ in state.legal_moves()} == {(5, 4)}
+    with pytest.raises(ValueError, match="warp square"):
+        play(state, (8, 1), (7, 0))
+    # Landing on a warp square again earns a further bonus move
+    assert play(state, (5, 4), (4, 5)).bonus_move
+    assert state.current_turn == "white" and state.last_moved_piece_pos == (4, 5)
+    play(state, (4, 5), (3, 4))
+    assert state.current_turn == "black" and not state.bonus_move_active
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("multi_jump", [False, True])
+def test_ai_bonus_move_may_use_any_piece_without_multi_jump(monkeypatch, board_class, multi_jump):
+    state = new_state(monkeypatch, board_class, warp_pieces(), ("black",), multi_jump)
+    assert state.multi_jump_active == multi_jump
+    play(state, (6, 3), (5, 4))
+    assert state.bonus_move_active and state.current_turn == "white"
+    assert {(piece.row, piece.col) for piece, _ in state.legal_moves()} == {(5, 4), (8, 1)}
+    assert not state.search_allows_multi_jump
+    play(state, (8, 1), (7, 0))
+    assert state.current_turn == "black" and not state.bonus_move_active
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_ai_bonus_move_is_single(monkeypatch, board_class):
+    state = new_state(monkeypatch, board_class, warp_pieces(), ("black",), multi_jump=False)
+    play(state, (6, 3), (5, 4))
+    # Onto a warp square again, but the AI gets one bonus move only
+    play(state, (5, 4), (4, 5))
+    assert state.current_turn == "black" and not state.bonus_move_active
+
+
+def capture_pieces():
+    # 7,2 takes 6,1 and could go on over 4,1; 7,6 has a capture of its own
+    return [Piece(7, 2, "white", False), Piece(7, 6, "white", False), Piece(6, 1, "black", False), Piece(4, 1, "black", False), Piece(6, 7, "black", False), Piece(0, 9, "black", False)]
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_human_keeps_capturing_with_the_same_piece(monkeypatch, board_class):
+    state = new_state(monkeypatch, board_class, capture_pieces(), ("white",), multi_jump=True)
+    record = play(state, (7, 2), (5, 0))
+    assert record.can_jump_again and state.current_turn == "white"
+    play(state, (5, 0), (3, 2))
+    assert state.current_turn == "black"
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_human_turn_ends_when_the_capturing_piece_is_done(monkeypatch, board_class):
+    pieces = [piece for piece in capture_pieces() if (piece.row, piece.col) != (4, 1)]
+    state = new_state(monkeypatch, board_class, pieces, ("white",), multi_jump=True)
+    play(state, (7, 2), (5, 0))
+    # 7,6 could still capture, but only the capturing piece may go on
+    assert state.current_turn == "black"
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_ai_keeps_capturing_with_any_piece(monkeypatch, board_class):
+    pieces = [piece for piece in capture_pieces() if (piece.row, piece.col) != (4, 1)]
+    state = new_state(monkeypatch, board_class, pieces, ("black",), multi_jump=True)
+    play(state, (7, 2), (5, 0))
+    assert state.current_turn == "white"
+    play(state, (7, 6), (5, 8))
+    assert state.current_turn == "black"
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("human_colors", [("white",), ("black",)])
+def test_no_further_capture_without_multi_jump(monkeypatch, board_class, human_colors):
+    state = new_state(monkeypatch, board_class, capture_pieces(), human_colors, multi_jump=False)
+    assert not play(state, (7, 2), (5, 0)).can_jump_again
+    assert state.current_turn == "black"
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_status_cache_follows_the_board_version(board_class):
+    board = board_class.from_pieces(capture_pieces())
+    cache = StatusCache(board)
+    moves = cache.legal_moves("white")
+    assert cache.legal_moves("white") is moves
+    assert cache.piece_count("black") == 4 and cache.result("white") is None
+
+    undo = make_move(board, board.get_piece(7, 2), 5, 0)
+    assert cache.legal_moves("white") is not moves
+    assert cache.piece_count("black") == 3
+    assert [(piece.row, piece.col) for piece, _ in cache.legal_moves("white")].count((5, 0)) == 1
+
+    # The position is back, but under a new version the answers are recomputed
+    version = board.version
+    unmake_move(board, undo)
+    assert board.version != version
+    assert cache.piece_count("black") == 4
+    assert [move for _, move in cache.legal_moves("white")] == [move for _, move in moves]
+
+    # A new board clears the cache too
+    cache.board = board_class.from_pieces([Piece(7, 2, "white", False)])
+    assert cache.piece_count("black") == 0 and cache.result("white") == "white"
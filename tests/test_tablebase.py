@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from src.game.bitboard import encode_position
+from src.game.board import Board, Piece, get_all_valid_moves_for_player, make_move, unmake_move
+from src.game.tables import BOARD_SIZE, PROMOTION_ROW, WARP_SQUARES
+from src.game.tablebase import LOSS, distance, generate_tablebase, is_loss, load_tablebase, position_index, solve_table, successors
+from tools.build_tablebase import main as build_tablebase
+
+DARK_SQUARES = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE) if (row + col) % 2]
+WARP_DARK_SQUARES = [square for square in DARK_SQUARES if square in WARP_SQUARES]
+BRUTE_FORCE_PLIES = 6
+
+
+def brute_force(board: Board, color: str, plies: int, memo: dict):
+    """Table value of the position if it is decided within plies plies, else None; a draw is only proven when neither side can move."""
+    key = (encode_position(board), color, plies)
+    if key in memo:
+        return memo[key]
+    opponent = "black" if color == "white" else "white"
+    moves = get_all_valid_moves_for_player(board, color)
+    if not moves:
+        result = LOSS if get_all_valid_moves_for_player(board, opponent) else 0
+    elif plies == 0:
+        result = None
+    else:
+        fastest_win, slowest_loss, all_lose = None, 0, True
+        for piece, (new_row, new_col) in moves:
+            undo = make_move(board, piece, new_row, new_col)
+            try:
+                if not board.material(opponent)[0]:
+                    child = LOSS  # their last piece was captured
+                else:
+                    child = brute_force(board, opponent, plies - 1, memo)
+            finally:
+                unmake_move(board, undo)
+            if child is not None and is_loss(child):
+                fastest_win = distance(child) + 1 if fastest_win is None else min(fastest_win, distance(child) + 1)
+            elif child is not None and child > 0:
+                slowest_loss = max(slowest_loss, child + 1)
+            else:
+                all_lose = False
+        if fastest_win is not None:
+            result = fastest_win
+        elif all_lose:
+            result = LOSS + slowest_loss
+        else:
+            result = None
+    memo[key] = result
+    return result
+
+
+def random_board(rng: random.Random, white_men: int, white_kings: int, black_men: int, black_kings: int, warp: bool) -> Board:
+    """A legal placement of the given material; with warp, the first piece stands on a warp square."""
+    while True:
+        squares = rng.sample(DARK_SQUARES, white_men + white_kings + black_men + black_kings)
+        if warp and squares[0] not in WARP_DARK_SQUARES:
+            squares[0] = rng.choice([square for square in WARP_DARK_SQUARES if square not in squares])
+        kinds = [("white", False)] * white_men + [("white", True)] * white_kings + [("black", False)] * black_men + [("black", True)] * black_kings
+        rng.shuffle(kinds)
+        pieces = [Piece(row, col, color, king) for (row, col), (color, king) in zip(squares, kinds)]
+        if all(piece.king or piece.row != PROMOTION_ROW[piece.color] for piece in pieces):
+            return Board.from_pieces(pieces)
+
+
+def check_against_brute_force(value: int, board: Board, color: str, memo: dict, plies: int = BRUTE_FORCE_PLIES):
+    expected = brute_force(board, color, plies, memo)
+    if value != 0 and distance(value) <= plies:
+        assert expected == value
+    else:
+        # Draws and longer results must not be decided within the horizon, barring a position where nobody can move
+        assert expected is None or (value == 0 and expected == 0)
+
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "endgame.tb")
+    build_tablebase(["--pieces", "2", "--output", path])
+    with load_tablebase(path) as tablebase:
+        yield tablebase
+
+
+@pytest.mark.parametrize("signature", [(0, 1, 0, 1), (0, 1, 1, 0), (1, 0, 0, 1), (1, 0, 1, 0)])
+@pytest.mark.parametrize("warp", [False, True])
+def test_two_piece_file_matches_brute_force(tablebase, signature, warp):
+    rng = random.Random(hash(signature) ^ warp)
+    memo = {}
+    for _ in range(40):
+        board = random_board(rng, *signature, warp)
+        for color in ("white", "black"):
+            check_against_brute_force(tablebase.probe(board, color), board, color, memo)
+
+
+def test_three_piece_table_matches_brute_force():
+    tables = generate_tablebase(2)
+    signature = (0, 2, 0, 1)
+    table = solve_table(signature, tables)
+    rng = random.Random(3)
+    memo = {}
+    decided = 0
+    for index in range(40):
+        board = random_board(rng, *signature, warp=index % 2 == 0)
+        for color in ("white", "black"):
+            value = table[position_index(encode_position(board), color == "black")]
+            check_against_brute_force(value, board, color, memo, plies=4)
+            decided += value != 0 and distance(value) <= 4
+    assert decided
+
+
+@pytest.mark.parametrize("defender", [(5, 4), (4, 5)])
+def test_piece_on_a_warp_square_cannot_be_captured(tablebase, defender):
+    # A black king next to the white man with an empty square behind it: a capture anywhere else
+    board = Board.from_pieces([Piece(*defender, "white", False), Piece(defender[0] + 1, defender[1] + 1, "black", True)])
+    position = encode_position(board)
+    assert all(child[0] for child in successors(position, True))
+    check_against_brute_force(tablebase.probe(board, "black"), board, "black", {})
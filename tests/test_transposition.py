@@ -0,0 +1,44 @@
+import math
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import execute_move, get_all_valid_moves_for_player, minimax_with_alpha_beta
+from src.game.transposition import BLACK_TO_MOVE_KEY, TranspositionTable, compute_zobrist, position_key
+
+
+def random_position(seed: int):
+    rng = random.Random(seed)
+    board = BitBoard()
+    color = "white"
+    for _ in range(rng.randrange(6, 40)):
+        moves = get_all_valid_moves_for_player(board, color)
+        if not moves:
+            break
+        piece, (new_row, new_col) = rng.choice(moves)
+        execute_move(board, piece, new_row, new_col)
+        color = "black" if color == "white" else "white"
+    return board, color
+
+
+def test_position_key_depends_on_side_to_move():
+    board = BitBoard()
+    assert position_key(board, "white") == compute_zobrist(board)
+    assert position_key(board, "white") ^ position_key(board, "black") == BLACK_TO_MOVE_KEY
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_table_serves_both_colours(seed):
+    board, color = random_position(seed)
+    if not get_all_valid_moves_for_player(board, color):
+        pytest.skip("game over")
+    opponent = "black" if color == "white" else "white"
+    expected, _ = minimax_with_alpha_beta(board, 2, True, color, -math.inf, math.inf, quiescence=False)
+    # Windows well away from the score leave loose lower and upper bounds, written by color's search
+    for alpha, beta in ((expected - 20, expected - 2.5), (expected - 20, expected - 1.5), (expected + 1.5, expected + 20), (expected + 2.5, expected + 20)):
+        tt = TranspositionTable(1)
+        minimax_with_alpha_beta(board, 2, True, color, alpha, beta, tt=tt, quiescence=False)
+        # Read back by the other colour's search, below the root (ply 1) where stored bounds are used
+        score, _ = minimax_with_alpha_beta(board, 2, False, opponent, -math.inf, math.inf, tt=tt, ply=1, quiescence=False)
+        assert score == -expected
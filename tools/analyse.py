@@ -0,0 +1,86 @@
+"""Batch multi-PV analysis of positions, streamed as JSON lines.
+
+    python -m tools.analyse positions.txt --multi-pv 3 --depth 6 --workers 8 --output analysis.jsonl
+    echo "W:W31,32,33,K45:B1,2,19,K10" | python -m tools.analyse - --time-ms 500
+
+The input has one position per line in the text format of
+src/game/position.py; blank lines and lines starting with # are skipped.
+Each output line is Analysis.as_dict() for one position, written in input
+order as soon as it is ready, or {"position": ..., "error": ...} for a line
+that cannot be parsed.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+from typing import Dict, Iterator, Optional
+
+from src.game.analysis import analyse_position
+from src.game.batch_eval import BatchEvaluator
+from src.game.board import POSITIONAL_WEIGHTS
+from src.game.tablebase import load_tablebase
+from src.game.transposition import TranspositionTable
+
+_tablebase = None
+
+
+def _init_worker(tablebase_path: Optional[str]):
+    global _tablebase
+    _tablebase = load_tablebase(tablebase_path) if tablebase_path else None
+
+
+def analyse_line(job) -> Dict:
+    text, multi_pv, depth, time_ms, weights, quiescence, tt_mb = job
+    evaluator = BatchEvaluator(POSITIONAL_WEIGHTS, False) if weights == "positional" else None
+    try:
+        analysis = analyse_position(text, multi_pv, depth, time_ms, tt=TranspositionTable(tt_mb), tablebase=_tablebase, evaluator=evaluator, quiescence=quiescence)
+    except ValueError as e:
+        return {"position": text, "error": str(e)}
+    return analysis.as_dict()
+
+
+def read_positions(source) -> Iterator[str]:
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse positions and stream their best moves, scores and principal variations as JSON lines.")
+    parser.add_argument("input", help="file with one position per line, or - for stdin")
+    parser.add_argument("--multi-pv", type=int, default=3, help="number of best moves to report per position")
+    parser.add_argument("--depth", type=int, default=None, help="search depth (default 4; with --time-ms, a cap on the deepening)")
+    parser.add_argument("--time-ms", type=float, default=None, help="time per position for iterative deepening")
+    parser.add_argument("--weights", choices=("material", "positional"), default="material")
+    parser.add_argument("--no-quiescence", dest="quiescence", action="store_false")
+    parser.add_argument("--tt-mb", type=float, default=16, help="transposition table size per position")
+    parser.add_argument("--tablebase", help="endgame tablebase file")
+    parser.add_argument("--workers", type=int, default=1, help="positions analysed in parallel")
+    parser.add_argument("--output", default="-", help="JSONL file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    jobs = ((text, args.multi_pv, args.depth, args.time_ms, args.weights, args.quiescence, args.tt_mb) for text in read_positions(source))
+    try:
+        if args.workers > 1:
+            with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(args.tablebase,)) as pool:
+                for record in pool.imap(analyse_line, jobs):
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+        else:
+            _init_worker(args.tablebase)
+            for record in map(analyse_line, jobs):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
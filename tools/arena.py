@@ -0,0 +1,339 @@
+"""Engine-vs-engine matches with sequential (SPRT) early stopping.
+
+    python -m tools.arena --engine-a depth=3 --engine-b depth=3,weights=positional --games 2000 --workers 8
+    python -m tools.arena --engine-a time_ms=100 --engine-b time_ms=100,quiescence=0 --openings book --book opening_book.bin
+
+An engine is a comma-separated list of key=value settings (see ENGINE_DEFAULTS):
+depth, time_ms (iterative deepening instead of a fixed depth), weights
+(material or positional), any EvalWeights field (piece, king, warp,
+advancement, centre, back_row) to override one weight, batch (NumPy leaf
+batches), quiescence, tt_mb (0 starts every move with an empty table), and
+book / tablebase files used while playing.
+
+Games come in pairs: both games of a pair start from the same opening and
+rules seed with the colours swapped. Openings are random legal moves, or
+moves drawn from an opening book by weight (--openings book), for
+--opening-plies plies; the engines play from there.
+
+After every game the log-likelihood ratio of the results (wins, draws and
+losses of engine A) is updated with the normal approximation of the
+generalised SPRT, testing H0: elo = --elo0 against H1: elo = --elo1. The
+match stops when it crosses a bound set by --alpha and --beta, or after
+--games games. The Elo difference is reported with a 95% confidence
+interval from the mean score and its standard error.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.game.batch_eval import BatchEvaluator
+from src.game.board import MATERIAL_WEIGHTS, POSITIONAL_WEIGHTS, EvalWeights, SearchLimits, choose_ai_move
+from src.game.book import load_book
+from src.game.state import GameState
+from src.game.tablebase import load_tablebase
+from src.game.transposition import TranspositionTable
+
+DEFAULT_MAX_PLIES = 300
+WEIGHT_FIELDS = ("piece", "king", "warp", "advancement", "centre", "back_row")
+ENGINE_DEFAULTS = {
+    "depth": 3,
+    "time_ms": None,
+    "weights": "material",
+    "batch": False,
+    "quiescence": True,
+    "tt_mb": 4.0,
+    "book": None,
+    "tablebase": None,
+}
+WEIGHTS = {"material": MATERIAL_WEIGHTS, "positional": POSITIONAL_WEIGHTS}
+CONFIDENCE_Z = 1.959964  # Two-sided 95%
+
+
+def _parse_bool(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True
+    if value.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+def parse_engine(spec: str) -> Dict:
+    """Engine settings from "key=value,key=value", on top of ENGINE_DEFAULTS."""
+    engine = dict(ENGINE_DEFAULTS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected key=value, got {item!r}")
+        if key == "depth":
+            engine[key] = int(value)
+        elif key in ("time_ms", "tt_mb") or key in WEIGHT_FIELDS:
+            engine[key] = float(value)
+        elif key in ("batch", "quiescence"):
+            engine[key] = _parse_bool(value)
+        elif key == "weights":
+            if value not in WEIGHTS:
+                raise ValueError(f"weights must be one of {', '.join(WEIGHTS)}")
+            engine[key] = value
+        elif key in ("book", "tablebase"):
+            engine[key] = value
+        else:
+            raise ValueError(f"unknown engine setting {key!r}")
+    return engine
+
+
+def describe_engine(engine: Dict) -> str:
+    return ",".join(f"{key}={value}" for key, value in engine.items() if ENGINE_DEFAULTS.get(key, object()) != value) or "defaults"
+
+
+def _evaluator(engine: Dict) -> Optional[BatchEvaluator]:
+    base = WEIGHTS[engine["weights"]]
+    overrides = {field: engine[field] for field in WEIGHT_FIELDS if field in engine}
+    if base is MATERIAL_WEIGHTS and not overrides and not engine["batch"]:
+        return None
+    weights = EvalWeights(**{field: overrides.get(field, getattr(base, field)) for field in WEIGHT_FIELDS})
+    return BatchEvaluator(weights, engine["batch"])
+
+
+# Books and tablebases opened in this worker process, by path
+_open_files: Dict[Tuple[str, str], object] = {}
+
+
+def _open(kind: str, path: Optional[str]):
+    if path is None:
+        return None
+    if (kind, path) not in _open_files:
+        _open_files[(kind, path)] = load_book(path) if kind == "book" else load_tablebase(path)
+    return _open_files[(kind, path)]
+
+
+def play_opening(state: GameState, pair: int, seed: int, plies: int, book_path: Optional[str]) -> List:
+    """Play the opening of a pair on state; the same pair always gets the same moves."""
+    rng = random.Random(seed * 1000003 + pair)
+    book = _open("book", book_path)
+    moves = []
+    for _ in range(plies):
+        if state.result() is not None:
+            break
+        board, color = state.board, state.current_turn
+        move = book.choose(board, color, state.search_allows_multi_jump, rng) if book is not None else None
+        if move is None:
+            move = rng.choice(state.legal_moves())
+        piece, (new_row, new_col) = move
+        moves.append([[piece.row, piece.col], [new_row, new_col]])
+        state.apply(piece, new_row, new_col)
+    return moves
+
+
+def play_game(pair: int, swap: bool, seed: int, engines: Dict[str, Dict], opening_plies: int, opening_book: Optional[str], max_plies: int = DEFAULT_MAX_PLIES) -> Dict:
+    """Play one game of a pair; engine A is White unless swap. Returns its summary."""
+    state = GameState(rng=random.Random(seed + pair), max_plies=max_plies)
+    opening = play_opening(state, pair, seed, opening_plies, opening_book)
+    sides = {"white": "b" if swap else "a", "black": "a" if swap else "b"}
+    players = {}
+    for name, engine in engines.items():
+        players[name] = {
+            "engine": engine,
+            "tt": TranspositionTable(engine["tt_mb"]) if engine["tt_mb"] > 0 else None,
+            "evaluator": _evaluator(engine),
+            "book": _open("book", engine["book"]),
+            "tablebase": _open("tablebase", engine["tablebase"]),
+            "moves": 0,
+            "nodes": 0,
+            "ms": 0.0,
+        }
+    while state.result() is None:
+        player = players[sides[state.current_turn]]
+        engine = player["engine"]
+        limits = SearchLimits(engine["time_ms"])
+        move_start = time.perf_counter()
+        best_move = choose_ai_move(state.board, state.current_turn, engine["depth"], state.search_allows_multi_jump, player["tt"], engine["time_ms"],
+                                   limits=limits, book=player["book"], tablebase=player["tablebase"], evaluator=player["evaluator"], quiescence=engine["quiescence"])
+        player["ms"] += (time.perf_counter() - move_start) * 1000
+        player["nodes"] += limits.nodes
+        player["moves"] += 1
+        if best_move is None:
+            state.timeout()
+            continue
+        piece, (new_row, new_col) = best_move
+        state.apply(piece, new_row, new_col)
+    winner = state.result()
+    a_color = "black" if swap else "white"
+    record = {
+        "pair": pair,
+        "a_color": a_color,
+        "winner": winner,
+        "score_a": 0.5 if winner == "draw" else float(winner == a_color),
+        "plies": state.plies,
+        "opening": opening,
+    }
+    for name, player in players.items():
+        record[f"{name}_moves"] = player["moves"]
+        record[f"{name}_nodes"] = player["nodes"]
+        record[f"{name}_ms"] = round(player["ms"], 3)
+    return record
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return 0.0 - 400 * math.log10(1 / score - 1)
+
+
+def elo_to_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def _score_stats(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """Mean score per game and its per-game variance."""
+    games = wins + draws + losses
+    mean = (wins + draws / 2) / games
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games
+    return mean, variance
+
+
+def elo_estimate(wins: int, draws: int, losses: int) -> Tuple[float, float, float]:
+    """(elo, lower, upper): the Elo difference and its 95% confidence interval."""
+    if wins + draws + losses == 0:
+        return 0.0, -math.inf, math.inf
+    mean, variance = _score_stats(wins, draws, losses)
+    margin = CONFIDENCE_Z * math.sqrt(variance / (wins + draws + losses))
+    return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """Log-likelihood ratio of H1 (elo1) against H0 (elo0), normal approximation."""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+    mean, variance = _score_stats(wins, draws, losses)
+    if variance == 0:
+        return 0.0
+    score0, score1 = elo_to_score(elo0), elo_to_score(elo1)
+    return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> Tuple[float, float]:
+    """(lower, upper) LLR bounds: H0 is accepted below lower, H1 above upper."""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+class MatchTally:
+    def __init__(self):
+        self.wins = self.draws = self.losses = 0
+        self.moves = {"a": 0, "b": 0}
+        self.nodes = {"a": 0, "b": 0}
+        self.ms = {"a": 0.0, "b": 0.0}
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def add(self, record: Dict):
+        if record["score_a"] == 1:
+            self.wins += 1
+        elif record["score_a"] == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        for name in ("a", "b"):
+            self.moves[name] += record[f"{name}_moves"]
+            self.nodes[name] += record[f"{name}_nodes"]
+            self.ms[name] += record[f"{name}_ms"]
+
+    def engine_summary(self, name: str) -> Dict:
+        return {
+            "moves": self.moves[name],
+            "nodes_per_second": round(self.nodes[name] / (self.ms[name] / 1000)) if self.ms[name] > 0 else 0,
+            "avg_move_ms": round(self.ms[name] / self.moves[name], 3) if self.moves[name] else 0.0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play two engine configurations against each other and test the difference with an SPRT.")
+    parser.add_argument("--engine-a", type=parse_engine, default=parse_engine(""), help="settings of the engine under test, e.g. depth=4,weights=positional")
+    parser.add_argument("--engine-b", type=parse_engine, default=parse_engine(""), help="settings of the baseline engine")
+    parser.add_argument("--games", type=int, default=1000, help="maximum games; rounded up to whole colour-swapped pairs")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--openings", choices=("random", "book"), default="random")
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--book", help="opening book for --openings book")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="adjudicate a draw after this many plies")
+    parser.add_argument("--elo0", type=float, default=0.0, help="SPRT H0 Elo difference")
+    parser.add_argument("--elo1", type=float, default=20.0, help="SPRT H1 Elo difference")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--no-sprt", dest="sprt", action="store_false", help="play all --games games")
+    parser.add_argument("--output", help="JSONL file for the game records")
+    args = parser.parse_args(argv)
+    if args.openings == "book" and not args.book:
+        parser.error("--openings book needs --book")
+
+    engines = {"a": args.engine_a, "b": args.engine_b}
+    opening_book = args.book if args.openings == "book" else None
+    pairs = (args.games + 1) // 2
+    jobs = [(pair, swap, args.seed, engines, args.opening_plies, opening_book, args.max_plies) for pair in range(pairs) for swap in (False, True)]
+    lower, upper = sprt_bounds(args.alpha, args.beta)
+    tally = MatchTally()
+    decision = None
+    llr = 0.0
+    print(f"A: {describe_engine(args.engine_a)}\nB: {describe_engine(args.engine_b)}", file=sys.stderr)
+    out = open(args.output, "w") if args.output else None
+    started = time.perf_counter()
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for record in pool.imap_unordered(_play_game_args, jobs):
+                tally.add(record)
+                if out is not None:
+                    out.write(json.dumps(record) + "\n")
+                llr = sprt_llr(tally.wins, tally.draws, tally.losses, args.elo0, args.elo1)
+                if tally.games % 10 == 0:
+                    elo, _, _ = elo_estimate(tally.wins, tally.draws, tally.losses)
+                    print(f"{tally.games} games  +{tally.wins} ={tally.draws} -{tally.losses}  elo {elo:+.1f}  llr {llr:.2f} [{lower:.2f}, {upper:.2f}]", file=sys.stderr)
+                if args.sprt and llr <= lower:
+                    decision = "H0"
+                    break
+                if args.sprt and llr >= upper:
+                    decision = "H1"
+                    break
+            # Leaving the with block terminates games still being played
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    elo, elo_low, elo_high = elo_estimate(tally.wins, tally.draws, tally.losses)
+    summary = {
+        "games": tally.games,
+        "wins": tally.wins,
+        "draws": tally.draws,
+        "losses": tally.losses,
+        "elo": round(elo, 1),
+        "elo_95": [round(elo_low, 1), round(elo_high, 1)],
+        "llr": round(llr, 3),
+        "llr_bounds": [round(lower, 3), round(upper, 3)],
+        "decision": decision,
+        "engine_a": {**args.engine_a, **tally.engine_summary("a")},
+        "engine_b": {**args.engine_b, **tally.engine_summary("b")},
+        "seconds": round(elapsed, 1),
+    }
+    verdict = {"H1": f"A is stronger (elo >= {args.elo1:g} accepted)", "H0": f"no gain (elo <= {args.elo0:g} accepted)", None: "inconclusive"}[decision]
+    print(f"{tally.games} games in {elapsed:.1f}s: +{tally.wins} ={tally.draws} -{tally.losses}  "
+          f"elo {elo:+.1f} (95% {elo_low:+.1f} to {elo_high:+.1f})  llr {llr:.2f}  {verdict}")
+    for name in ("a", "b"):
+        engine = tally.engine_summary(name)
+        print(f"engine {name.upper()}: {engine['nodes_per_second']} nodes/s, {engine['avg_move_ms']:.1f} ms/move over {engine['moves']} moves")
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""Move-generation and search benchmarks with regression baselines.
+
+    python -m tools.bench --output bench.json
+    python -m tools.bench --compare bench.json --threshold 0.1
+
+perft counts the leaf positions of the move tree to a fixed depth, one move
+per ply with the side to move alternating (no multi-jump chains or warp bonus
+moves, which depend on the game loop). The counts from the initial position
+are checked against PERFT_INITIAL (and the curated positions against
+PERFT_POSITIONS), so any move-generator rewrite that changes
+them fails the run. perft plays the moves through the game API,
+get_all_valid_moves_for_player, execute_move and unmake_move, on either
+backend. --perft-mode integer instead runs it on the bitboard's (white,
+black, kings) integers with generate_position_moves and play, which measures
+the move generator without the Piece objects.
+
+The search benchmark runs fixed-depth minimax_with_alpha_beta on a set of
+curated positions and records nodes, time and nodes per second per depth,
+with a MoveOrderer unless --no-ordering is given. --ordering-report DEPTH
+prints the node counts with and without ordering side by side.
+--compare reports every nodes-per-second figure that dropped by more than
+--threshold against a stored result file and exits with status 1.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.game.bitboard import BitBoard, count_position_moves, generate_position_moves, play
+from src.game.batch_eval import BatchEvaluator
+from src.game.board import POSITIONAL_WEIGHTS, Board, Piece, SearchLimits, execute_move, get_all_valid_moves_for_player, minimax_with_alpha_beta, unmake_move
+from src.game.ordering import MoveOrderer
+
+# Leaf counts from the initial position with White to move, depth 1..N.
+PERFT_INITIAL = [9, 81, 779, 7223, 71451, 683309]
+
+# name -> (side to move, white men, white kings, black men, black kings)
+POSITIONS = {
+    "opening": None,
+    "midgame": ("white",
+                [(6, 1), (6, 3), (6, 5), (6, 9), (7, 0), (7, 4), (7, 8), (8, 3), (8, 7), (9, 6)], [],
+                [(2, 1), (2, 3), (2, 7), (3, 0), (3, 4), (3, 6), (3, 8), (1, 2), (1, 6), (0, 9)], []),
+    "warp_zone": ("white",
+                  [(5, 4), (6, 3), (6, 7), (7, 2), (7, 6), (8, 5)], [],
+                  [(4, 5), (3, 2), (3, 6), (2, 3), (4, 1), (2, 7)], []),
+    "forced_captures": ("white",
+                        [(5, 2), (5, 6), (6, 5), (7, 4), (8, 1)], [],
+                        [(4, 3), (4, 7), (3, 2), (2, 5), (1, 0)], []),
+    "kings_endgame": ("black",
+                      [(8, 1)], [(5, 2), (7, 6)],
+                      [(1, 4)], [(2, 5), (4, 7)]),
+    "promotion_race": ("black",
+                       [(2, 1), (1, 4)], [(4, 7)],
+                       [(7, 2), (8, 5)], [(6, 9)]),
+}
+
+# Leaf counts for each curated position at PERFT_POSITION_DEPTH.
+PERFT_POSITION_DEPTH = 4
+PERFT_POSITIONS = {
+    "opening": 7223,
+    "midgame": 15109,
+    "warp_zone": 2737,
+    "forced_captures": 1195,
+    "kings_endgame": 6414,
+    "promotion_race": 2012,
+}
+
+BACKENDS = {"bitboard": BitBoard, "list": Board}
+WEIGHTS = {"material": None, "positional": POSITIONAL_WEIGHTS}
+
+# Entries that took less than this in the baseline are too noisy to compare
+# one by one; they still count towards the totals.
+MIN_COMPARE_MS = 20
+
+
+def build_position(name: str, board_class=BitBoard):
+    spec = POSITIONS[name]
+    if spec is None:
+        return board_class(), "white"
+    side, white_men, white_kings, black_men, black_kings = spec
+    pieces = [Piece(row, col, "white") for row, col in white_men]
+    pieces += [Piece(row, col, "white", True) for row, col in white_kings]
+    pieces += [Piece(row, col, "black") for row, col in black_men]
+    pieces += [Piece(row, col, "black", True) for row, col in black_kings]
+    return board_class.from_pieces(pieces), side
+
+
+def perft_position(position: Tuple[int, int, int], black_to_move: bool, depth: int) -> int:
+    """perft on a BitBoard's (white, black, kings) triple, counting the last ply with popcounts."""
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return count_position_moves(position, black_to_move)
+    return sum(
+        perft_position(play(position, black_to_move, from_bit, to_bit), not black_to_move, depth - 1)
+        for from_bit, to_bit in generate_position_moves(position, black_to_move)
+    )
+
+
+def perft_integer(board: BitBoard, player_color: str, depth: int) -> int:
+    return perft_position((board.white, board.black, board.kings), player_color == "black", depth)
+
+
+def perft(board: Board, player_color: str, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = get_all_valid_moves_for_player(board, player_color)
+    if depth == 1:
+        return len(moves)
+    opponent = "black" if player_color == "white" else "white"
+    nodes = 0
+    for piece, (new_row, new_col) in moves:
+        record = execute_move(board, piece, new_row, new_col)
+        nodes += perft(board, opponent, depth - 1)
+        unmake_move(board, record.undo)
+    return nodes
+
+
+# --perft-mode -> perft function; integer needs the bitboard backend
+PERFT_MODES = {"api": perft, "integer": perft_integer}
+
+
+def divide(board: Board, player_color: str, depth: int) -> Dict[str, int]:
+    """perft split by root move, for tracking down a move-generator difference."""
+    opponent = "black" if player_color == "white" else "white"
+    counts = {}
+    for piece, (new_row, new_col) in get_all_valid_moves_for_player(board, player_color):
+        label = f"({piece.row},{piece.col})-({new_row},{new_col})"
+        record = execute_move(board, piece, new_row, new_col)
+        counts[label] = perft(board, opponent, depth - 1)
+        unmake_move(board, record.undo)
+    return counts
+
+
+def _best_of(repeat: int, run):
+    best_ms, result = math.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best_ms = min(best_ms, (time.perf_counter() - start) * 1000)
+    return result, best_ms
+
+
+def _nps(nodes: int, ms: float) -> float:
+    return round(nodes / (ms / 1000), 1) if ms > 0 else 0.0
+
+
+def run_perft(board_class, max_depth: int, repeat: int, mode: str = "api") -> List[Dict]:
+    perft_function = PERFT_MODES[mode]
+    jobs = [("opening", depth, PERFT_INITIAL[depth - 1] if depth <= len(PERFT_INITIAL) else None) for depth in range(1, max_depth + 1)]
+    jobs += [(name, PERFT_POSITION_DEPTH, expected) for name, expected in PERFT_POSITIONS.items() if name != "opening"]
+    results = []
+    for name, depth, expected in jobs:
+        board, side = build_position(name, board_class)
+        nodes, ms = _best_of(repeat, lambda: perft_function(board, side, depth))
+        results.append({
+            "position": name,
+            "depth": depth,
+            "nodes": nodes,
+            "expected": expected,
+            "ok": expected is None or nodes == expected,
+            "ms": round(ms, 3),
+            "nps": _nps(nodes, ms),
+        })
+    return results
+
+
+def search_nodes(board_class, name: str, depth: int, ordering: bool = True, evaluator: Optional[BatchEvaluator] = None, quiescence: bool = True) -> Tuple[int, float, Optional[tuple]]:
+    """(nodes, score, best move) of one fixed-depth search, with or without a MoveOrderer."""
+    board, side = build_position(name, board_class)
+    limits = SearchLimits()
+    score, best_move = minimax_with_alpha_beta(board, depth, True, side, -math.inf, math.inf, limits=limits, orderer=MoveOrderer() if ordering else None, evaluator=evaluator, quiescence=quiescence)
+    return limits.nodes, score, best_move
+
+
+def ordering_report(board_class, depth: int, positions: List[str]) -> List[Dict]:
+    """Search nodes with and without move ordering per position, the reduction MoveOrderer gives."""
+    results = []
+    for name in positions:
+        ordered, _, _ = search_nodes(board_class, name, depth)
+        unordered, _, _ = search_nodes(board_class, name, depth, ordering=False)
+        results.append({"position": name, "depth": depth, "ordered_nodes": ordered, "unordered_nodes": unordered})
+    return results
+
+
+def run_search(board_class, max_depth: int, repeat: int, positions: List[str], evaluator: Optional[BatchEvaluator] = None, quiescence: bool = True, ordering: bool = True) -> List[Dict]:
+    results = []
+    for name in positions:
+        for depth in range(1, max_depth + 1):
+            board, side = build_position(name, board_class)
+            limits = SearchLimits()
+
+            def search():
+                limits.nodes = 0
+                return minimax_with_alpha_beta(board, depth, True, side, -math.inf, math.inf, limits=limits, orderer=MoveOrderer() if ordering else None, evaluator=evaluator, quiescence=quiescence)
+
+            (score, best_move), ms = _best_of(repeat, search)
+            results.append({
+                "position": name,
+                "depth": depth,
+                "nodes": limits.nodes,
+                "score": score if math.isfinite(score) else str(score),
+                "best_move": [[best_move[0].row, best_move[0].col], list(best_move[1])] if best_move else None,
+                "ms": round(ms, 3),
+                "nps": _nps(limits.nodes, ms),
+            })
+    return results
+
+
+def run_benchmarks(backend: str = "bitboard", perft_depth: int = 5, search_depth: int = 5, repeat: int = 3, positions: Optional[List[str]] = None, weights: str = "material", batch: bool = False, quiescence: bool = True, perft_mode: str = "api", ordering: bool = True) -> Dict:
+    board_class = BACKENDS[backend]
+    perft_results = run_perft(board_class, perft_depth, repeat, perft_mode)
+    evaluator = BatchEvaluator(WEIGHTS[weights], batch) if weights != "material" or batch else None
+    search_results = run_search(board_class, search_depth, repeat, positions or list(POSITIONS), evaluator, quiescence, ordering)
+    return {
+        "meta": {
+            "backend": backend,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "perft_mode": perft_mode,
+            "ordering": ordering,
+            "weights": weights,
+            "batch": batch,
+            "quiescence": quiescence,
+        },
+        "perft": perft_results,
+        "search": search_results,
+        "totals": {
+            "perft_nps": _nps(sum(r["nodes"] for r in perft_results), sum(r["ms"] for r in perft_results)),
+            "search_nps": _nps(sum(r["nodes"] for r in search_results), sum(r["ms"] for r in search_results)),
+        },
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regressions of current against baseline, as human-readable lines."""
+    regressions = []
+    # perft speeds of different modes measure different code, so only the counts are compared then
+    same_perft_mode = baseline.get("meta", {}).get("perft_mode", "api") == current["meta"]["perft_mode"]
+    old_perft = {(r["position"], r["depth"]): r for r in baseline.get("perft", [])}
+    for result in current["perft"]:
+        old = old_perft.get((result["position"], result["depth"]))
+        if old is None:
+            continue
+        if old["nodes"] != result["nodes"]:
+            regressions.append(f"perft {result['position']} depth {result['depth']}: {result['nodes']} nodes, baseline {old['nodes']}")
+        elif same_perft_mode and old["ms"] >= MIN_COMPARE_MS and result["nps"] < old["nps"] * (1 - threshold):
+            regressions.append(f"perft {result['position']} depth {result['depth']}: {result['nps']:.0f} nps, baseline {old['nps']:.0f}")
+    old_search = {(r["position"], r["depth"]): r for r in baseline.get("search", [])}
+    for result in current["search"]:
+        old = old_search.get((result["position"], result["depth"]))
+        if old is not None and old["ms"] >= MIN_COMPARE_MS and result["nps"] < old["nps"] * (1 - threshold):
+            regressions.append(f"search {result['position']} depth {result['depth']}: {result['nps']:.0f} nps, baseline {old['nps']:.0f}")
+    for total in ("perft_nps", "search_nps") if same_perft_mode else ("search_nps",):
+        old = baseline.get("totals", {}).get(total)
+        if old and current["totals"][total] < old * (1 - threshold):
+            regressions.append(f"{total}: {current['totals'][total]:.0f}, baseline {old:.0f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark move generation (perft) and search.")
+    parser.add_argument("--backend", choices=tuple(BACKENDS), default="bitboard")
+    parser.add_argument("--perft-depth", type=int, default=5)
+    parser.add_argument("--perft-mode", choices=tuple(PERFT_MODES), default="api", help="api: through execute_move/unmake_move; integer: bitboard integers only")
+    parser.add_argument("--search-depth", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--weights", choices=tuple(WEIGHTS), default="material", help="evaluation weights for the search benchmark")
+    parser.add_argument("--batch", action="store_true", help="evaluate last-ply leaves in NumPy batches")
+    parser.add_argument("--no-quiescence", dest="quiescence", action="store_false", help="evaluate depth-0 nodes without the capture search")
+    parser.add_argument("--no-ordering", dest="ordering", action="store_false", help="search without MoveOrderer")
+    parser.add_argument("--ordering-report", type=int, metavar="DEPTH", help="print search nodes with and without move ordering per position and exit")
+    parser.add_argument("--positions", nargs="*", choices=tuple(POSITIONS), help="search positions (default: all)")
+    parser.add_argument("--divide", type=int, metavar="DEPTH", help="print perft per root move from the initial position and exit")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to check for throughput regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed nodes-per-second drop against the baseline")
+    args = parser.parse_args(argv)
+    if args.perft_mode == "integer" and args.backend != "bitboard":
+        parser.error("--perft-mode integer needs --backend bitboard")
+
+    if args.divide is not None:
+        counts = divide(BACKENDS[args.backend](), "white", args.divide)
+        for label, nodes in counts.items():
+            print(f"{label}: {nodes}")
+        print(f"total: {sum(counts.values())}")
+        return 0
+
+    if args.ordering_report is not None:
+        for result in ordering_report(BACKENDS[args.backend], args.ordering_report, args.positions or list(POSITIONS)):
+            reduction = 1 - result["ordered_nodes"] / result["unordered_nodes"]
+            print(f"ordering {result['position']:<16} depth {result['depth']}: {result['ordered_nodes']:>8} nodes ordered {result['unordered_nodes']:>8} unordered {reduction:>6.0%} fewer")
+        return 0
+
+    results = run_benchmarks(args.backend, args.perft_depth, args.search_depth, args.repeat, args.positions, args.weights, args.batch, args.quiescence, args.perft_mode, args.ordering)
+    for result in results["perft"]:
+        status = "" if result["ok"] else f"  MISMATCH (expected {result['expected']})"
+        print(f"perft {result['position']:<16} depth {result['depth']}: {result['nodes']:>9} nodes {result['ms']:>10.1f} ms {result['nps']:>12.0f} nps{status}")
+    for result in results["search"]:
+        print(f"search {result['position']:<16} depth {result['depth']}: {result['nodes']:>8} nodes {result['ms']:>10.1f} ms {result['nps']:>12.0f} nps")
+    print(f"perft {results['totals']['perft_nps']:.0f} nps, search {results['totals']['search_nps']:.0f} nps")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    status = 0
+    if not all(result["ok"] for result in results["perft"]):
+        print("perft counts do not match the expected values", file=sys.stderr)
+        status = 1
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
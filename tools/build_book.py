@@ -0,0 +1,108 @@
+"""Build the opening book by deep searches from the initial position.
+
+    python -m tools.build_book --plies 8 --depth 7 --workers 8 --output opening_book.bin
+
+Every position in the book tree is searched to --depth with each root move
+scored separately. Moves within --margin of the best score (at most
+--max-moves of them) go into the book and the tree continues from each of
+them, for both sides, until --plies moves have been played. A move's weight
+is 1000 minus 100 per point it scores below the best move.
+
+Book positions are keyed without the multi-jump flag; a turn with multi-jump
+active falls back to the normal search.
+"""
+import argparse
+import math
+import multiprocessing
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from src.game.bitboard import BitBoard, decode_position, encode_position
+from src.game.board import _search_child, get_all_valid_moves_for_player, make_move
+from src.game.book import MAX_WEIGHT, OpeningBook, write_book
+from src.game.ordering import MoveOrderer
+from src.game.transposition import TranspositionTable, position_key
+
+BEST_WEIGHT = 1000
+WEIGHT_PER_POINT = 100
+
+Position = Tuple[Tuple[int, int, int], str]
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def score_root_moves(job: Tuple[Position, int]) -> Tuple[Position, List[Tuple[float, Move]]]:
+    """Score every move of a position at the given depth, best first."""
+    (position, color), depth = job
+    board = decode_position(position)
+    tt = TranspositionTable(8)
+    orderer = MoveOrderer()
+    scored = []
+    for piece, (new_row, new_col) in get_all_valid_moves_for_player(board, color):
+        from_pos = (piece.row, piece.col)
+        score = _search_child(board, piece, (new_row, new_col), depth, True, color, -math.inf, math.inf, False, tt, 0, None, orderer)
+        scored.append((score, (from_pos, (new_row, new_col))))
+    scored.sort(key=lambda item: -item[0])
+    return (position, color), scored
+
+
+def book_moves(scored: List[Tuple[float, Move]], margin: float, max_moves: int) -> Dict[Move, int]:
+    if not scored:
+        return {}
+    best = scored[0][0]
+    moves = {}
+    for score, move in scored[:max_moves]:
+        if score == best:
+            moves[move] = BEST_WEIGHT
+        elif math.isfinite(score) and math.isfinite(best) and best - score <= margin:
+            moves[move] = max(1, min(MAX_WEIGHT, round(BEST_WEIGHT - WEIGHT_PER_POINT * (best - score))))
+    return moves
+
+
+def build_book(plies: int, depth: int, margin: float = 0.0, max_moves: int = 3, workers: int = 1, log=sys.stderr) -> Dict[int, Dict[Move, int]]:
+    """{position key: {move: weight}} for the book tree from the initial position."""
+    positions: Dict[int, Dict[Move, int]] = {}
+    frontier: List[Position] = [(encode_position(BitBoard()), "white")]
+    seen = {position_key(BitBoard(), "white")}
+    with multiprocessing.Pool(workers) as pool:
+        for ply in range(plies):
+            started = time.perf_counter()
+            next_frontier = []
+            for (position, color), scored in pool.imap(score_root_moves, [(item, depth) for item in frontier]):
+                board = decode_position(position)
+                moves = book_moves(scored, margin, max_moves)
+                if not moves:
+                    continue
+                positions[position_key(board, color)] = moves
+                opponent = "black" if color == "white" else "white"
+                for (from_row, from_col), (new_row, new_col) in moves:
+                    child = decode_position(position)
+                    make_move(child, child.get_piece(from_row, from_col), new_row, new_col)
+                    key = position_key(child, opponent)
+                    if key not in seen:
+                        seen.add(key)
+                        next_frontier.append((encode_position(child), opponent))
+            print(f"ply {ply + 1}: {len(frontier)} positions searched in {time.perf_counter() - started:.1f}s, "
+                  f"{len(positions)} in book", file=log)
+            frontier = next_frontier
+    return positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the opening book from deep searches of the initial position.")
+    parser.add_argument("--plies", type=int, default=6, help="book depth in moves from the initial position")
+    parser.add_argument("--depth", type=int, default=6, help="search depth for each book position")
+    parser.add_argument("--margin", type=float, default=0.0, help="keep moves scoring this close to the best")
+    parser.add_argument("--max-moves", type=int, default=3, help="most moves kept per position")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", default="opening_book.bin")
+    args = parser.parse_args(argv)
+
+    positions = build_book(args.plies, args.depth, args.margin, args.max_moves, args.workers)
+    write_book(args.output, positions)
+    with OpeningBook(args.output) as book:
+        print(f"wrote {len(positions)} positions, {len(book)} moves to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
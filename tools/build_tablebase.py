@@ -0,0 +1,36 @@
+"""Generate the endgame tablebase file.
+
+    python -m tools.build_tablebase --pieces 3 --output endgame.tb
+
+Three pieces take about a minute and 3 MB; every extra piece multiplies the
+table size by 50.
+"""
+import argparse
+import sys
+import time
+
+from src.game.tablebase import distance, generate_tablebase, is_loss, is_win, write_tablebase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve every position with up to --pieces pieces and write the tablebase.")
+    parser.add_argument("--pieces", type=int, default=3)
+    parser.add_argument("--output", default="endgame.tb")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def log(signature, table):
+        wins = sum(1 for value in table if is_win(value))
+        losses = sum(1 for value in table if is_loss(value))
+        longest = max(distance(value) for value in table)
+        print(f"{signature}: {wins} wins, {losses} losses, longest {longest} plies "
+              f"({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    tables = generate_tablebase(args.pieces, log)
+    write_tablebase(args.output, args.pieces, tables)
+    print(f"wrote {len(tables)} tables to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
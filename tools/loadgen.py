@@ -0,0 +1,167 @@
+"""Load generator for the game server: move latency as concurrency grows.
+
+    python -m tools.loadgen --spawn --concurrency 1 4 16 64 --moves 20
+    python -m tools.loadgen --port 8765 --concurrency 8 --duration 30 --output load.json
+
+Each simulated client opens its own connection and plays random legal moves
+as White, starting a new game whenever one ends. The latency of a move is the
+time from sending it to receiving the reply, which includes the AI's answer.
+Moves refused with "busy" are retried after a short pause and counted; the
+retries are not part of the latency. After every concurrency level the
+server's stats (search queue wait and search time) are read and reset.
+
+--spawn runs a server in this process on a free port instead of connecting
+to one.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from src.game.server import DEFAULT_PORT, GameServer, percentile
+
+BUSY_RETRY_SECONDS = 0.02
+
+
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int, unix_path: Optional[str]) -> "Client":
+        if unix_path is not None:
+            return cls(*await asyncio.open_unix_connection(unix_path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, **request) -> Dict:
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _new_game(client: Client, args, rng: random.Random) -> Dict:
+    while True:
+        reply = await client.request(op="new", depth=args.depth, time_ms=args.time_ms, seed=rng.randrange(2 ** 32))
+        if reply["ok"]:
+            return reply
+        if reply["error"] != "busy":
+            raise RuntimeError(reply["error"])
+        await asyncio.sleep(BUSY_RETRY_SECONDS)
+
+
+async def run_client(args, seed: int, move_count: int, deadline: Optional[float], latencies: List[float], counts: Dict[str, int]):
+    rng = random.Random(seed)
+    client = await Client.connect(args.host, args.port, args.unix)
+    try:
+        reply = await _new_game(client, args, rng)
+        session, state = reply["session"], reply["state"]
+        moves = 0
+        while moves < move_count if deadline is None else time.perf_counter() < deadline:
+            if state["result"] is not None or not state["legal_moves"]:
+                await client.request(op="close", session=session)
+                counts["games"] += 1
+                reply = await _new_game(client, args, rng)
+                session, state = reply["session"], reply["state"]
+                continue
+            from_square, to_square = rng.choice(state["legal_moves"])
+            start = time.perf_counter()
+            reply = await client.request(op="move", session=session, **{"from": from_square, "to": to_square})
+            if not reply["ok"]:
+                if reply["error"] != "busy":
+                    raise RuntimeError(reply["error"])
+                counts["busy"] += 1
+                await asyncio.sleep(BUSY_RETRY_SECONDS)
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            moves += 1
+            state = reply["state"]
+        await client.request(op="close", session=session)
+    finally:
+        await client.close()
+
+
+async def run_level(args, concurrency: int, move_count: int, duration: Optional[float]) -> Dict:
+    latencies: List[float] = []
+    counts = {"busy": 0, "games": 0}
+    deadline = None if duration is None else time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(args, args.seed + concurrency * 100000 + index, move_count, deadline, latencies, counts) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stats_client = await Client.connect(args.host, args.port, args.unix)
+    try:
+        server_stats = (await stats_client.request(op="stats", reset=True))["stats"]
+    finally:
+        await stats_client.close()
+    return {
+        "concurrency": concurrency,
+        "moves": len(latencies),
+        "games_finished": counts["games"],
+        "busy": counts["busy"],
+        "seconds": round(elapsed, 3),
+        "moves_per_second": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {f"p{pct}": round(percentile(latencies, pct), 3) for pct in (50, 90, 99)} | {"max": round(max(latencies, default=0.0), 3)},
+        "server": server_stats,
+    }
+
+
+async def run(args) -> List[Dict]:
+    server = None
+    if args.spawn:
+        server = GameServer(args.workers, args.max_queue)
+        listener = await server.start(args.host, 0)
+        args.port = listener.sockets[0].getsockname()[1]
+        args.unix = None
+        # Reset the stats after the workers' first searches, which include process start-up
+        await run_level(args, server.workers, 1, None)
+    try:
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(args, concurrency, args.moves, args.duration)
+            latency = result["latency_ms"]
+            print(f"concurrency {concurrency:>4}: {result['moves']:>6} moves {result['moves_per_second']:>8.1f} moves/s  "
+                  f"latency p50 {latency['p50']:>8.1f} p90 {latency['p90']:>8.1f} p99 {latency['p99']:>8.1f} max {latency['max']:>8.1f} ms  "
+                  f"queue wait p95 {result['server']['queue_wait_ms']['p95']:>8.1f} ms  busy {result['busy']}")
+            results.append(result)
+        return results
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure game-server move latency at increasing concurrency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--spawn", action="store_true", help="run a server in this process instead of connecting to one")
+    parser.add_argument("--workers", type=int, default=None, help="search workers of the spawned server")
+    parser.add_argument("--max-queue", type=int, default=None, help="queue bound of the spawned server")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--moves", type=int, default=20, help="moves per client at each level")
+    parser.add_argument("--duration", type=float, default=None, help="seconds per level instead of a move count")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--time-ms", type=float, default=None, help="per-move search time of the sessions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Run the game server (src/game/server.py) until interrupted.
+
+    python -m tools.serve --port 8765 --workers 8
+    python -m tools.serve --unix /tmp/checkers.sock
+"""
+import argparse
+import asyncio
+import sys
+
+from src.game.server import DEFAULT_PORT, GameServer
+
+
+async def serve(args):
+    server = GameServer(args.workers, args.max_queue, args.max_sessions, args.max_time_ms, args.idle_timeout, args.tt_mb, args.book, args.tablebase)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"serving on {where} with {server.workers} search workers", file=sys.stderr)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve concurrent games against the AI over a JSON-lines protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="search worker processes (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=None, help="searches allowed to wait for a worker before requests are refused (default: 4 per worker)")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--max-time-ms", type=float, default=1000, help="cap on a session's per-move search time")
+    parser.add_argument("--idle-timeout", type=float, default=600, help="seconds before an unused session is dropped")
+    parser.add_argument("--tt-mb", type=float, default=4, help="transposition table size per worker")
+    parser.add_argument("--book", help="opening book file for the workers")
+    parser.add_argument("--tablebase", help="endgame tablebase file for the workers")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
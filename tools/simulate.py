@@ -0,0 +1,104 @@
+"""Batch AI-vs-AI self-play without a window.
+
+Plays games with GameState across worker processes and streams one JSON line
+per finished game:
+
+    python -m tools.simulate --games 1000 --workers 8 --depth 3 --seed 1 --output games.jsonl
+
+Game i uses random.Random(seed + i) for the rules RNG, so a run can be
+replayed exactly with the same arguments (fixed-depth searches are
+deterministic; time-limited ones depend on machine speed).
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from typing import Dict, Optional
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board, SearchLimits, choose_ai_move
+from src.game.state import GameState
+from src.game.transposition import TranspositionTable
+
+DEFAULT_MAX_PLIES = 300
+
+
+def play_game(game_index: int, seed: int, depth: int = 3, time_limit_ms: Optional[float] = None, max_plies: int = DEFAULT_MAX_PLIES, backend: str = "bitboard", tt_mb: float = 4) -> Dict:
+    """Play one AI-vs-AI game and return its summary."""
+    board = BitBoard() if backend == "bitboard" else Board()
+    state = GameState(board, random.Random(seed + game_index), max_plies=max_plies)
+    tables = {"white": TranspositionTable(tt_mb), "black": TranspositionTable(tt_mb)}
+    move_times = {"white": [], "black": []}
+    nodes = {"white": 0, "black": 0}
+    started = time.perf_counter()
+    while state.result() is None:
+        color = state.current_turn
+        limits = SearchLimits(time_limit_ms)
+        move_start = time.perf_counter()
+        best_move = choose_ai_move(state.board, color, depth, state.search_allows_multi_jump, tables[color], time_limit_ms, limits=limits)
+        move_times[color].append((time.perf_counter() - move_start) * 1000)
+        nodes[color] += limits.nodes
+        if best_move is None:
+            state.timeout()
+            continue
+        piece, (new_row, new_col) = best_move
+        state.apply(piece, new_row, new_col)
+    all_times = move_times["white"] + move_times["black"]
+    return {
+        "game": game_index,
+        "seed": seed + game_index,
+        "winner": state.result(),
+        "plies": state.plies,
+        "ply_limit_reached": state.plies >= max_plies,
+        "white_pieces": state.board.material("white")[0],
+        "black_pieces": state.board.material("black")[0],
+        "avg_move_ms": round(sum(all_times) / len(all_times), 3) if all_times else 0.0,
+        "max_move_ms": round(max(all_times), 3) if all_times else 0.0,
+        "white_avg_move_ms": round(sum(move_times["white"]) / len(move_times["white"]), 3) if move_times["white"] else 0.0,
+        "black_avg_move_ms": round(sum(move_times["black"]) / len(move_times["black"]), 3) if move_times["black"] else 0.0,
+        "white_nodes": nodes["white"],
+        "black_nodes": nodes["black"],
+        "nodes": nodes["white"] + nodes["black"],
+        "game_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run AI-vs-AI games without a window and stream results as JSON lines.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=3, help="fixed search depth (ignored with --time-ms)")
+    parser.add_argument("--time-ms", type=float, default=None, help="per-move time budget for iterative deepening")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="adjudicate a draw after this many plies")
+    parser.add_argument("--backend", choices=("bitboard", "list"), default="bitboard")
+    parser.add_argument("--tt-mb", type=float, default=4, help="transposition table size per side")
+    parser.add_argument("--output", default="-", help="JSONL file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    jobs = [(index, args.seed, args.depth, args.time_ms, args.max_plies, args.backend, args.tt_mb) for index in range(args.games)]
+    tally = {"white": 0, "black": 0, "draw": 0}
+    started = time.perf_counter()
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for record in pool.imap_unordered(_play_game_args, jobs):
+                tally[record["winner"]] += 1
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"{args.games} games in {elapsed:.1f}s ({args.games / elapsed:.2f} games/s): "
+          f"white {tally['white']}, black {tally['black']}, draw {tally['draw']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()